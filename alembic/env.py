@@ -10,8 +10,6 @@ from sqlalchemy import engine_from_config, pool
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.config import settings  # noqa: E402
-from app.core.database import Base  # noqa: E402
-from app.models import *  # noqa: F401,F403,E402
 
 config = context.config
 
@@ -20,7 +18,28 @@ config.set_main_option("sqlalchemy.url", settings.SYNC_DATABASE_URL)
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-target_metadata = Base.metadata
+
+def _needs_metadata() -> bool:
+    """
+    Only autogenerate / check compare against the models; plain upgrades
+    and downgrades don't need to import them.
+    """
+    opts = config.cmd_opts
+    if opts is None:
+        return True
+    if getattr(opts, "autogenerate", False):
+        return True
+    cmd = getattr(opts, "cmd", None)
+    return bool(cmd) and getattr(cmd[0], "__name__", "") == "check"
+
+
+if _needs_metadata():
+    from app.core.database import Base  # noqa: E402
+    from app.models import *  # noqa: F401,F403,E402
+
+    target_metadata = Base.metadata
+else:
+    target_metadata = None
 
 
 def run_migrations_offline() -> None:
@@ -36,6 +55,25 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _apply_session_guards(connection) -> None:
+    """
+    Session-wide lock/statement timeouts (override with -x lock_timeout=...).
+    Migrations can tighten them per step with online_migrations.lock_guard.
+    """
+    from app.core.online_migrations import validate_timeout
+
+    x_args = context.get_x_argument(as_dictionary=True)
+    for name, default in (
+        ("lock_timeout", settings.MIGRATION_LOCK_TIMEOUT),
+        ("statement_timeout", settings.MIGRATION_STATEMENT_TIMEOUT),
+    ):
+        value = x_args.get(name, default)
+        if value:
+            connection.exec_driver_sql(f"SET {name} = '{validate_timeout(value)}'")
+    # commit so Alembic starts from a clean connection and owns the transactions
+    connection.commit()
+
+
 def run_migrations_online() -> None:
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
@@ -43,11 +81,32 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
+    from app.core.online_migrations import is_dry_run
+
     with connectable.connect() as connection:  # type: ignore[arg-type]
+        _apply_session_guards(connection)
+
+        if is_dry_run():
+            # an outer transaction makes Alembic treat it as external: every
+            # step, including the version table update, is rolled back
+            with connection.begin() as trans:
+                context.configure(
+                    connection=connection,
+                    target_metadata=target_metadata,
+                    compare_type=True,
+                )
+                context.run_migrations()
+                trans.rollback()
+            return
+
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            # one transaction per revision, so autocommit blocks
+            # (CREATE INDEX CONCURRENTLY, batched backfills) only commit
+            # the revision they belong to
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""add_habit_checkin_log
+
+Revision ID: 7c1e5a9d2b40
+Revises: 45dafc4cc32c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2b40'
+down_revision: Union[str, None] = '45dafc4cc32c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "habitcheckin",
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("check_in_date", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["habit_id"], ["habit.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("habit_id", "check_in_date"),
+    )
+    op.create_index("ix_habitcheckin_user_date", "habitcheckin", ["user_id", "check_in_date"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habitcheckin_user_date", table_name="habitcheckin")
+    op.drop_table("habitcheckin")
@@ -0,0 +1,38 @@
+"""drop_redundant_pk_indexes
+
+Revision ID: b3f81d6e0a27
+Revises: 7c1e5a9d2b40
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f81d6e0a27'
+down_revision: Union[str, None] = '7c1e5a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ix_<table>_id duplicated the primary key B-tree (Column(..., primary_key=True, index=True))
+TABLES = (
+    "artifactdefinition",
+    "user",
+    "habit",
+    "lunarenergyaccount",
+    "userartifact",
+    "plant",
+)
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        drop_index_concurrently(f"ix_{table}_id", table_name=table)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        create_index_concurrently(f"ix_{table}_id", table, ["id"])
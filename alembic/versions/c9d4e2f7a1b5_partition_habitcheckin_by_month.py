@@ -0,0 +1,89 @@
+"""partition_habitcheckin_by_month
+
+Revision ID: c9d4e2f7a1b5
+Revises: b3f81d6e0a27
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+from app.core.online_migrations import add_check_constraint, lock_guard
+from app.core.partitioning import add_months, month_start, partition_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d4e2f7a1b5'
+down_revision: Union[str, None] = 'b3f81d6e0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are not copied: the old table is attached as the
+    # partition covering everything before next month. A CHECK constraint,
+    # validated up front while writes continue, lets ATTACH skip the
+    # full-table scan, and the existing primary key, index and foreign keys
+    # are reused by the new parent.
+    boundary = add_months(month_start(date.today()), 1)
+    add_check_constraint("habitcheckin", "habitcheckin_legacy_bound", f"check_in_date < '{boundary.isoformat()}'")
+
+    with lock_guard("5s"):
+        op.execute("ALTER TABLE habitcheckin RENAME TO habitcheckin_legacy")
+        op.execute("ALTER TABLE habitcheckin_legacy RENAME CONSTRAINT habitcheckin_pkey TO habitcheckin_legacy_pkey")
+        op.execute("ALTER INDEX ix_habitcheckin_user_date RENAME TO habitcheckin_legacy_user_date_idx")
+        op.execute(
+            """
+            CREATE TABLE habitcheckin (
+                habit_id integer NOT NULL REFERENCES habit (id) ON DELETE CASCADE,
+                check_in_date date NOT NULL,
+                user_id integer NOT NULL REFERENCES "user" (id) ON DELETE CASCADE,
+                CONSTRAINT habitcheckin_pkey PRIMARY KEY (habit_id, check_in_date)
+            ) PARTITION BY RANGE (check_in_date)
+            """
+        )
+        op.execute("CREATE INDEX ix_habitcheckin_user_date ON habitcheckin (user_id, check_in_date)")
+        op.execute(
+            "ALTER TABLE habitcheckin ATTACH PARTITION habitcheckin_legacy "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+        )
+
+    month = boundary
+    for _ in range(settings.PARTITION_PREMAKE_MONTHS):
+        upper = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {partition_name('habitcheckin', month)} PARTITION OF habitcheckin "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    # catches check-ins for months nobody created a partition for yet;
+    # partition maintenance moves them out when it creates that month
+    op.execute("CREATE TABLE habitcheckin_default PARTITION OF habitcheckin DEFAULT")
+
+
+def downgrade() -> None:
+    with lock_guard("5s"):
+        op.execute("ALTER TABLE habitcheckin RENAME TO habitcheckin_partitioned")
+        op.execute(
+            "ALTER TABLE habitcheckin_partitioned RENAME CONSTRAINT habitcheckin_pkey TO habitcheckin_partitioned_pkey"
+        )
+        op.execute("ALTER INDEX ix_habitcheckin_user_date RENAME TO habitcheckin_partitioned_user_date_idx")
+        op.execute(
+            """
+            CREATE TABLE habitcheckin (
+                habit_id integer NOT NULL REFERENCES habit (id) ON DELETE CASCADE,
+                check_in_date date NOT NULL,
+                user_id integer NOT NULL REFERENCES "user" (id) ON DELETE CASCADE,
+                CONSTRAINT habitcheckin_pkey PRIMARY KEY (habit_id, check_in_date)
+            )
+            """
+        )
+        op.execute(
+            "INSERT INTO habitcheckin (habit_id, check_in_date, user_id) "
+            "SELECT habit_id, check_in_date, user_id FROM habitcheckin_partitioned"
+        )
+        op.execute("DROP TABLE habitcheckin_partitioned CASCADE")
+        op.execute("CREATE INDEX ix_habitcheckin_user_date ON habitcheckin (user_id, check_in_date)")
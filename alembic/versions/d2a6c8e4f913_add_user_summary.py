@@ -0,0 +1,40 @@
+"""add_user_summary
+
+Revision ID: d2a6c8e4f913
+Revises: c9d4e2f7a1b5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6c8e4f913'
+down_revision: Union[str, None] = 'c9d4e2f7a1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are materialized lazily on first read / change; backfill with
+    # `python -m app.services.summary_service` (batched reconciliation).
+    op.create_table(
+        "user_summary",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("active_habits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("plant_stages", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("artifact_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("energy_balance", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_streak", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_summary")
@@ -0,0 +1,32 @@
+"""add_data_versions
+
+Revision ID: e5b7a3c9d184
+Revises: d2a6c8e4f913
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7a3c9d184'
+down_revision: Union[str, None] = 'd2a6c8e4f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Constant defaults: metadata-only on PostgreSQL 11+, no table rewrite.
+    # Existing rows start at version 0, which matches every user's counter.
+    op.add_column("user", sa.Column("data_version", sa.BigInteger(), nullable=False, server_default="0"))
+    op.add_column("habit", sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"))
+    op.add_column("plant", sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("plant", "version")
+    op.drop_column("habit", "version")
+    op.drop_column("user", "data_version")
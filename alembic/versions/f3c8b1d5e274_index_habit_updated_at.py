@@ -0,0 +1,26 @@
+"""index_habit_updated_at
+
+Revision ID: f3c8b1d5e274
+Revises: e5b7a3c9d184
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8b1d5e274'
+down_revision: Union[str, None] = 'e5b7a3c9d184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the reminder scheduler's periodic sync reads habits by updated_at range
+    create_index_concurrently("ix_habit_updated_at", "habit", ["updated_at"])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_habit_updated_at", table_name="habit")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from . import artifacts, auth, garden, habits, lunar
+from . import artifacts, auth, export, garden, habits, leaderboard, live, lunar
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -10,3 +10,6 @@ api_router.include_router(habits.router, prefix="/habits", tags=["habits"])
 api_router.include_router(artifacts.router, prefix="/artifacts", tags=["artifacts"])
 api_router.include_router(lunar.router, prefix="/lunar", tags=["lunar"])
 api_router.include_router(garden.router, prefix="/garden", tags=["garden"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
+api_router.include_router(live.router, prefix="/live", tags=["live"])
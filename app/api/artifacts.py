@@ -1,16 +1,43 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+import math
+import time
+from typing import Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import etag_matches, make_etag
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.config import settings
+from app.core.security import decode_access_token, get_current_user
+from app.core.serialization import adapter_response
 from app.models.user import User
-from app.schemas.artifact import ArtifactDiscoverResponse, UserArtifactOut
-from app.services.artifact_service import discover_artifact, get_user_artifacts
+from app.schemas.artifact import (
+    ArtifactCatalogOut,
+    ArtifactDiscoverResponse,
+    UserArtifactCompactAdapter,
+    UserArtifactCompactOut,
+    UserArtifactOut,
+    UserArtifactOutList,
+    UserArtifactRefOut,
+)
+from app.services.artifact_service import (
+    check_discovery_quota,
+    discover_artifact,
+    get_artifact_catalog,
+    get_user_artifacts,
+    load_artifact_catalog,
+)
 
 router = APIRouter()
 
+# the unversioned URL is revalidated often; hashed URLs never change
+CATALOG_MAX_AGE = 60
+IMMUTABLE = "public, max-age=31536000, immutable"
+# an unknown hash re-reads the definitions at most this often per worker
+CATALOG_RELOAD_MIN_INTERVAL = 1.0
+
 
 def _get_token_from_header(authorization: str | None = Header(default=None)) -> str:
     if not authorization or not authorization.startswith("Bearer "):
@@ -18,18 +45,97 @@ def _get_token_from_header(authorization: str | None = Header(default=None)) ->
     return authorization.removeprefix("Bearer ").strip()
 
 
-@router.get("/list", response_model=list[UserArtifactOut], summary="List user artifacts")
+async def _discovery_rate_limit(token: str = Depends(_get_token_from_header)) -> None:
+    """
+    Runs before the session/user dependencies: the user id comes from the JWT
+    itself, so throttled requests are answered without a database round-trip.
+    """
+    if not settings.DISCOVERY_RATE_LIMIT_ENABLED:
+        return
+    retry_after = await check_discovery_quota(decode_access_token(token))
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Discovery quota exhausted for this moon phase",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+@router.get("/catalog", response_model=ArtifactCatalogOut, summary="All artifact definitions")
+async def artifact_catalog(
+    request: Request,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    bundle = (await get_artifact_catalog(db)).bundle
+    etag = make_etag(bundle.hash)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}",
+        "Content-Location": str(request.url_for("artifact_catalog_bundle", content_hash=bundle.hash)),
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=bundle.body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/catalog/{content_hash}",
+    response_model=ArtifactCatalogOut,
+    summary="Artifact catalog bundle by content hash (immutable)",
+)
+async def artifact_catalog_bundle(
+    content_hash: str,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    catalog = await get_artifact_catalog(db)
+    if content_hash != catalog.bundle.hash and time.monotonic() - catalog.loaded_at > CATALOG_RELOAD_MIN_INTERVAL:
+        # workers reload on their own TTL; the hash may come from a fresher one
+        catalog = await load_artifact_catalog(db)
+    bundle = catalog.bundle
+    if content_hash != bundle.hash:
+        # never redirect: workers on different snapshots would bounce the
+        # client between hashes. Serve what this worker has, uncached; the
+        # body's own "hash" tells the client which version it got.
+        return Response(
+            content=bundle.body,
+            media_type="application/json",
+            headers={"ETag": make_etag(bundle.hash), "Cache-Control": "no-store"},
+        )
+    return Response(
+        content=bundle.body,
+        media_type="application/json",
+        headers={"ETag": make_etag(bundle.hash), "Cache-Control": IMMUTABLE},
+    )
+
+
+@router.get(
+    "/list",
+    response_model=Union[list[UserArtifactOut], UserArtifactCompactOut],
+    summary="List user artifacts",
+)
 async def list_artifacts(
+    compact: bool = Query(False, description="Definition ids only; resolve them with /artifacts/catalog"),
     db: AsyncSession = Depends(get_db),
-#    token: str = Depends(_get_token_from_header),
-#    user: User = Depends(get_current_user),
-) -> list[UserArtifactOut]:
-    items = await get_user_artifacts(db, user.id)
-    return [UserArtifactOut.model_validate(i) for i in items]
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> Response:
+    if not compact:
+        items = await get_user_artifacts(db, user.id)
+        return adapter_response(UserArtifactOutList, UserArtifactOutList.validate_python(items, from_attributes=True))
+
+    items = await get_user_artifacts(db, user.id, with_definitions=False)
+    catalog = await get_artifact_catalog(db)
+    content = {
+        "catalog": catalog.bundle.hash,
+        "items": [UserArtifactRefOut.model_validate(i) for i in items],
+    }
+    return adapter_response(UserArtifactCompactAdapter, content)
 
 
 @router.post("/discover", response_model=ArtifactDiscoverResponse, summary="Discover random artifact")
 async def discover_artifact_endpoint(
+    _: None = Depends(_discovery_rate_limit),
     db: AsyncSession = Depends(get_db),
     token: str = Depends(_get_token_from_header),
     user: User = Depends(get_current_user),
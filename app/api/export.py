@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.export_service import gzip_stream, iter_all_users_export, iter_user_export
+
+router = APIRouter()
+
+
+def _get_token_from_header(authorization: str | None = Header(default=None)) -> str:
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Bearer token")
+    return authorization.removeprefix("Bearer ").strip()
+
+
+def _export_response(chunks, filename: str, gzip: bool) -> StreamingResponse:
+    if gzip:
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson.gz"'},
+        )
+    return StreamingResponse(
+        chunks,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
+
+
+@router.get("/me", summary="Stream full garden history of current user as NDJSON")
+async def export_me(
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    return _export_response(iter_user_export(user.id), f"moonlit-garden-{user.id}", gzip)
+
+
+@router.get("/all", summary="Stream all users as NDJSON (admin only)")
+async def export_all(
+    gzip: bool = True,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    if not settings.TELEGRAM_ADMIN_CHAT_ID or user.telegram_id != settings.TELEGRAM_ADMIN_CHAT_ID:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return _export_response(iter_all_users_export(), "moonlit-garden-all", gzip)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import etag_matches, make_etag, not_modified, version_headers
 from app.core.database import get_db
+from app.core.serialization import adapter_response
 from app.core.security import get_current_user
 from app.models.user import User
-from app.services.garden_service import get_garden_state
+from app.schemas.garden import GardenDeltaAdapter, GardenDeltaOut, GardenStateAdapter, GardenStateOut
+from app.schemas.summary import UserSummaryOut
+from app.services.garden_service import current_moon, get_garden_state
+from app.services.summary_service import get_user_summary
 
 router = APIRouter()
 
@@ -17,10 +24,34 @@ def _get_token_from_header(authorization: str | None = Header(default=None)) ->
     return authorization.removeprefix("Bearer ").strip()
 
 
-@router.get("/state", summary="Get current garden state for user")
+@router.get(
+    "/state",
+    response_model=Union[GardenStateOut, GardenDeltaOut],
+    summary="Get current garden state for user",
+)
 async def garden_state(
+    since: int | None = Query(None, ge=0, description="Only plants changed after this data version"),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> Response:
+    version = user.data_version
+    moon = current_moon()
+    # the moon block changes without any write of the user's
+    etag = make_etag(version, moon.phase)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, version)
+
+    state = await get_garden_state(db, user.id, version, since, moon)
+    adapter = GardenStateAdapter if since is None else GardenDeltaAdapter
+    return adapter_response(adapter, state, headers=version_headers(etag, version))
+
+
+@router.get("/summary", response_model=UserSummaryOut, summary="Garden / profile header counters")
+async def garden_summary(
     db: AsyncSession = Depends(get_db),
-#    token: str = Depends(_get_token_from_header),
-#    user: User = Depends(get_current_user),
-):
-    return await get_garden_state(db, user.id)
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> UserSummaryOut:
+    return UserSummaryOut.model_validate(await get_user_summary(db, user.id))
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Union
 
-from fastapi import APIRouter, Depends, HTTPException, Header, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import etag_matches, make_etag, not_modified, version_headers
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.serialization import adapter_response
 from app.core.security import get_current_user
+from app.models.habit import Habit
 from app.models.user import User
-from app.schemas.habit import HabitCreate, HabitOut, HabitUpdate, HabitCheckInResponse
+from app.schemas.habit import (
+    HabitCheckInResponse,
+    HabitCreate,
+    HabitDeltaAdapter,
+    HabitDeltaOut,
+    HabitHistoryOut,
+    HabitOut,
+    HabitOutList,
+    HabitUpdate,
+    HeatmapOut,
+)
+from app.services.checkin_history_service import get_habit_history, get_user_heatmap, recompute_streaks
 from app.services.habit_service import (
     check_in_habit,
     create_habit_for_user,
     delete_habit,
     get_habit_by_id,
+    get_user_habit_ids,
     get_user_habits,
     update_habit,
 )
@@ -27,14 +44,36 @@ def _get_token_from_header(authorization: str | None = Header(default=None)) ->
     return authorization.removeprefix("Bearer ").strip()
 
 
-@router.get("/", response_model=list[HabitOut], summary="List user habits")
+@router.get("/", response_model=Union[list[HabitOut], HabitDeltaOut], summary="List user habits")
 async def list_habits(
+    since: int | None = Query(None, ge=0, description="Only habits changed after this data version"),
+    if_none_match: str | None = Header(default=None),
     db: AsyncSession = Depends(get_db),
     token: str = Depends(_get_token_from_header),
     user: User = Depends(get_current_user),
-) -> list[HabitOut]:
-    habits = await get_user_habits(db, user.id)
-    return [HabitOut.model_validate(h) for h in habits]
+) -> Response:
+    version = user.data_version
+    etag = make_etag(version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, version)
+
+    habits = HabitOutList.validate_python(await get_user_habits(db, user.id, since), from_attributes=True)
+    headers = version_headers(etag, version)
+    if since is None:
+        return adapter_response(HabitOutList, habits, headers=headers)
+    delta = {"version": version, "habits": habits, "ids": await get_user_habit_ids(db, user.id)}
+    return adapter_response(HabitDeltaAdapter, delta, headers=headers)
+
+
+@router.get("/heatmap", response_model=HeatmapOut, summary="Check-ins per day for a year")
+async def habits_heatmap(
+    year: int | None = Query(None, ge=2000, le=2100),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> HeatmapOut:
+    year = year or date.today().year
+    return HeatmapOut(year=year, days=await get_user_heatmap(db, user.id, year))
 
 
 @router.post("/", response_model=HabitOut, status_code=status.HTTP_201_CREATED, summary="Create habit")
@@ -93,3 +132,39 @@ async def checkin_habit_endpoint(
     today = date.today()
     result = await check_in_habit(db, habit, today)
     return result
+
+
+@router.get("/{habit_id}/history", response_model=HabitHistoryOut, summary="Check-in dates of a habit for a year")
+async def habit_history_endpoint(
+    habit_id: int,
+    year: int | None = Query(None, ge=2000, le=2100),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> HabitHistoryOut:
+    habit = await get_habit_by_id(db, user.id, habit_id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    year = year or date.today().year
+    return HabitHistoryOut(habit_id=habit.id, year=year, dates=await get_habit_history(db, habit.id, year))
+
+
+@router.post(
+    "/{habit_id}/recompute_streaks",
+    response_model=HabitOut,
+    summary="Rebuild streaks from history (admin only)",
+)
+async def recompute_streaks_endpoint(
+    habit_id: int,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> HabitOut:
+    if not settings.TELEGRAM_ADMIN_CHAT_ID or user.telegram_id != settings.TELEGRAM_ADMIN_CHAT_ID:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    # repairs any user's habit
+    habit = await db.get(Habit, habit_id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    habit = await recompute_streaks(db, habit, date.today())
+    return HabitOut.model_validate(habit)
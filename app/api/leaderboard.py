@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas.leaderboard import LeaderboardEntryOut, LeaderboardOut
+from app.services.leaderboard_service import Board, get_leaderboard
+
+router = APIRouter()
+
+
+def _get_token_from_header(authorization: str | None = Header(default=None)) -> str:
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Bearer token")
+    return authorization.removeprefix("Bearer ").strip()
+
+
+@router.get("/{board}", response_model=LeaderboardOut, summary="Top users and own rank")
+async def get_board(
+    board: Board,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(_get_token_from_header),
+    user: User = Depends(get_current_user),
+) -> LeaderboardOut:
+    backend = get_leaderboard()
+    top = await backend.top(board, limit)
+
+    ids = [member for member, _ in top]
+    result = await db.execute(select(User.id, User.username, User.first_name).where(User.id.in_(ids)))
+    names = {row.id: row for row in result}
+
+    entries = [
+        LeaderboardEntryOut(
+            rank=i + 1,
+            user_id=member,
+            username=names[member].username if member in names else None,
+            first_name=names[member].first_name if member in names else None,
+            score=score,
+        )
+        for i, (member, score) in enumerate(top)
+    ]
+
+    me = None
+    my_rank = await backend.rank(board, user.id)
+    if my_rank is not None:
+        me = LeaderboardEntryOut(
+            rank=my_rank,
+            user_id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            score=await backend.score(board, user.id) or 0,
+        )
+    return LeaderboardOut(board=board, top=entries, me=me)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.live import RESYNC, Subscription, TooManyConnections, get_live_hub
+from app.core.security import decode_access_token
+
+router = APIRouter()
+
+
+def _user_id_from(authorization: str | None, token: str | None) -> int:
+    """
+    EventSource and browser WebSockets cannot set headers, so the token may
+    also come as `?token=`. Decoding the JWT is enough; no database read.
+    """
+    if authorization and authorization.startswith("Bearer "):
+        token = authorization.removeprefix("Bearer ").strip()
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Bearer token")
+    return decode_access_token(token)
+
+
+async def _subscribe(user_id: int) -> Subscription:
+    try:
+        return await get_live_hub().subscribe(user_id)
+    except TooManyConnections:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many live connections")
+
+
+async def _sse_stream(request: Request, sub: Subscription) -> AsyncIterator[bytes]:
+    hub = get_live_hub()
+    try:
+        # tell the client to load the full state once; deltas follow
+        yield b"event: resync\ndata: " + RESYNC + b"\n\n"
+        while not await request.is_disconnected():
+            message = await sub.get(settings.LIVE_HEARTBEAT_SECONDS)
+            if message is None:
+                yield b": ping\n\n"
+            else:
+                yield b"data: " + message + b"\n\n"
+    finally:
+        await hub.unsubscribe(sub)
+
+
+@router.get("/sse", summary="Server-sent events with garden / energy deltas")
+async def live_sse(
+    request: Request,
+    token: str | None = Query(None),
+    authorization: str | None = Header(default=None),
+) -> StreamingResponse:
+    sub = await _subscribe(_user_id_from(authorization, token))
+    return StreamingResponse(
+        _sse_stream(request, sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def live_ws(
+    websocket: WebSocket,
+    token: str | None = Query(None),
+    authorization: str | None = Header(default=None),
+) -> None:
+    try:
+        user_id = _user_id_from(authorization, token)
+        sub = await _subscribe(user_id)
+    except HTTPException as exc:
+        await websocket.close(code=4401 if exc.status_code == 401 else 4429)
+        return
+
+    hub = get_live_hub()
+    await websocket.accept()
+    try:
+        await websocket.send_text(RESYNC.decode())
+        while True:
+            message = await sub.get(settings.LIVE_HEARTBEAT_SECONDS)
+            await websocket.send_text(message.decode() if message is not None else '{"type":"ping"}')
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        # the heartbeat send is what notices a dead client
+        pass
+    finally:
+        await hub.unsubscribe(sub)
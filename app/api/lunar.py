@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -18,6 +18,9 @@ from app.services.lunar_service import (
 
 router = APIRouter()
 
+# phases are resolved per UTC hour; a few minutes of staleness is invisible
+TODAY_MAX_AGE = 300
+
 
 def _get_token_from_header(authorization: str | None = Header(default=None)) -> str:
     if not authorization or not authorization.startswith("Bearer "):
@@ -26,7 +29,9 @@ def _get_token_from_header(authorization: str | None = Header(default=None)) ->
 
 
 @router.get("/today", response_model=LunarPhaseOut, summary="Get today's moon phase and theme")
-async def get_today_phase() -> LunarPhaseOut:
+async def get_today_phase(response: Response) -> LunarPhaseOut:
+    # same body for everyone: shared caches and the compressed-body cache may keep it
+    response.headers["Cache-Control"] = f"public, max-age={TODAY_MAX_AGE}"
     now = datetime.utcnow()
     info = get_moon_phase_info(now)
     return LunarPhaseOut(
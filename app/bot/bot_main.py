@@ -4,20 +4,66 @@ import asyncio
 import logging
 
 from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
 
-from app.bot.handlers import register_handlers
 from app.core.config import settings
 
 
+def create_bot() -> Bot:
+    session = None
+    if settings.TELEGRAM_API_BASE_URL:
+        from aiogram.client.session.aiohttp import AiohttpSession
+        from aiogram.client.telegram import TelegramAPIServer
+
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_BASE_URL))
+    return Bot(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        session=session,
+        default=DefaultBotProperties(parse_mode="HTML"),
+    )
+
+
+def create_dispatcher() -> Dispatcher:
+    from app.bot.handlers import register_handlers
+
+    dp = Dispatcher()
+    register_handlers(dp)
+    return dp
+
+
 async def main() -> None:
     logging.basicConfig(level=logging.INFO)
-    bot = Bot(token=settings.TELEGRAM_BOT_TOKEN, parse_mode="HTML")
-    dp = Dispatcher()
 
-    register_handlers(dp)
+    if settings.TELEGRAM_BOT_MODE == "webhook":
+        import uvicorn
+
+        from app.bot.webhook import create_webhook_app
+
+        logging.info("Starting Moonlit Garden bot in webhook mode...")
+        config = uvicorn.Config(create_webhook_app(), host=settings.APP_HOST, port=settings.APP_PORT)
+        await uvicorn.Server(config).serve()
+        return
+
+    bot = create_bot()
+    dp = create_dispatcher()
+
+    # keep a reference: the loop only holds tasks weakly
+    reminders_task: asyncio.Task[None] | None = None
+    if settings.REMINDERS_ENABLED:
+        from app.bot.reminders import start_reminders
+
+        reminders_task = start_reminders(bot)
+
+    from app.core.jobs import shutdown_job_queue
 
     logging.info("Starting Moonlit Garden bot...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if reminders_task is not None:
+            reminders_task.cancel()
+            await asyncio.gather(reminders_task, return_exceptions=True)
+        await shutdown_job_queue()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest, TelegramRetryAfter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.rate_limit import AsyncTokenBucket, PerKeyInterval
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# (user id, telegram chat id)
+Recipient = tuple[int, int]
+
+
+@dataclass
+class BroadcastStats:
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.monotonic()
+        return max(end - self.started_at, 1e-9)
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.elapsed
+
+
+class FileCheckpointStore:
+    """
+    Remembers the last fully processed user id per broadcast in a JSON file.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, broadcast_id: str) -> Path:
+        return self.directory / f"{broadcast_id}.json"
+
+    def load(self, broadcast_id: str) -> int:
+        path = self._path(broadcast_id)
+        if not path.exists():
+            return 0
+        return int(json.loads(path.read_text())["last_user_id"])
+
+    def save(self, broadcast_id: str, last_user_id: int) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(broadcast_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps({"last_user_id": last_user_id}))
+        tmp.replace(self._path(broadcast_id))
+
+
+async def iter_recipient_batches(
+    after_user_id: int = 0,
+    batch_size: int = 500,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[Sequence[Recipient]]:
+    """
+    Keyset-paginated (id, telegram_id) batches ordered by user id.
+    """
+    last_id = after_user_id
+    while True:
+        async with session_factory() as db:
+            result = await db.execute(
+                select(User.id, User.telegram_id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+            batch = [(row.id, row.telegram_id) for row in result]
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+class Broadcaster:
+    """
+    Sends one text to many chats within Telegram flood limits.
+
+    A global token bucket caps messages/sec, a per-chat interval keeps single
+    chats under their own limit, and a 429 pauses the whole bucket for
+    `retry_after` before the message is retried.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        global_rate: float | None = None,
+        per_chat_interval: float | None = None,
+        max_retries: int | None = None,
+        concurrency: int = 32,
+    ) -> None:
+        self.bot = bot
+        self.bucket = AsyncTokenBucket(global_rate or settings.BROADCAST_GLOBAL_RATE)
+        self.per_chat = PerKeyInterval(
+            per_chat_interval if per_chat_interval is not None else settings.BROADCAST_PER_CHAT_INTERVAL
+        )
+        self.max_retries = max_retries if max_retries is not None else settings.BROADCAST_MAX_RETRIES
+        self.concurrency = concurrency
+        self.stats = BroadcastStats()
+
+    async def _send(self, chat_id: int, text: str) -> None:
+        for attempt in range(self.max_retries + 1):
+            await self.per_chat.wait(chat_id)
+            await self.bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id, text)
+                self.stats.sent += 1
+                return
+            except TelegramRetryAfter as exc:
+                self.stats.retried += 1
+                self.bucket.pause(exc.retry_after)
+                logger.warning("Flood limit hit, pausing %ss (attempt %s)", exc.retry_after, attempt + 1)
+            except (TelegramForbiddenError, TelegramBadRequest) as exc:
+                # blocked the bot / chat not found: retrying won't help
+                logger.info("Skipping chat %s: %s", chat_id, exc.message)
+                break
+        self.stats.failed += 1
+
+    async def send_batch(self, recipients: Sequence[Recipient], text: str) -> None:
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for _, chat_id in recipients:
+            queue.put_nowait(chat_id)
+
+        async def worker() -> None:
+            while not queue.empty():
+                chat_id = queue.get_nowait()
+                try:
+                    await self._send(chat_id, text)
+                except Exception:
+                    # e.g. a network error: count it like a rejected chat so
+                    # one recipient cannot abort the batch (and its checkpoint)
+                    logger.exception("Failed to send broadcast to chat %s", chat_id)
+                    self.stats.failed += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(recipients)))))
+
+    async def run(
+        self,
+        broadcast_id: str,
+        text: str,
+        checkpoints: Optional[FileCheckpointStore] = None,
+        batches: Optional[AsyncIterator[Sequence[Recipient]]] = None,
+    ) -> BroadcastStats:
+        """
+        Send `text` to every recipient, resuming after the last checkpoint.
+
+        A batch is checkpointed only once fully processed, so a crash resends
+        at most one batch.
+        """
+        checkpoints = checkpoints or FileCheckpointStore(settings.BROADCAST_CHECKPOINT_DIR)
+        start_after = checkpoints.load(broadcast_id)
+        if batches is None:
+            batches = iter_recipient_batches(start_after, settings.BROADCAST_BATCH_SIZE)
+
+        self.stats = BroadcastStats(started_at=time.monotonic())
+        async for batch in batches:
+            await self.send_batch(batch, text)
+            checkpoints.save(broadcast_id, batch[-1][0])
+            logger.info(
+                "Broadcast %s: up to user %s, sent=%s failed=%s retried=%s (%.1f msg/s)",
+                broadcast_id,
+                batch[-1][0],
+                self.stats.sent,
+                self.stats.failed,
+                self.stats.retried,
+                self.stats.rate,
+            )
+        self.stats.finished_at = time.monotonic()
+        return self.stats
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Broadcast a message to every bot user.")
+    parser.add_argument("broadcast_id", help="Stable id used for checkpointing, e.g. full-moon-2026-10-25")
+    parser.add_argument("text")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from app.bot.bot_main import create_bot
+
+    bot = create_bot()
+    try:
+        stats = await Broadcaster(bot).run(args.broadcast_id, args.text)
+    finally:
+        await bot.session.close()
+    logging.info(
+        "Done: sent=%s failed=%s retried=%s in %.1fs (%.1f msg/s)",
+        stats.sent,
+        stats.failed,
+        stats.retried,
+        stats.elapsed,
+        stats.rate,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+from datetime import date
+
 from aiogram import Dispatcher, F
 from aiogram.filters import CommandStart, Command
-from aiogram.types import Message
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.bot.keyboards import main_menu_kb
+from app.bot.keyboards import CheckInCallback, habits_checkin_kb, main_menu_kb
+from app.bot.middlewares import DbSessionMiddleware
 from app.core.config import settings
+from app.services.habit_service import (
+    check_in_habit,
+    get_active_habits_for_telegram_user,
+    get_habit_for_telegram_user,
+)
 
 
 async def cmd_start(message: Message) -> None:
@@ -22,6 +31,7 @@ async def cmd_help(message: Message) -> None:
         "Это магический трекер привычек.\n\n"
         "• Открывай WebApp, чтобы управлять садом\n"
         "• Отмечай привычки, выращивай растения и грибы\n"
+        "• /habits — отметить привычки прямо в чате\n"
         "• Собирай артефакты и используй лунную энергию ✨",
         reply_markup=main_menu_kb(),
     )
@@ -37,7 +47,43 @@ async def admin_ping(message: Message) -> None:
         await message.answer("Администратор не настроен.")
 
 
+async def cmd_habits(message: Message, db: AsyncSession) -> None:
+    if not message.from_user:
+        return
+    habits = await get_active_habits_for_telegram_user(db, message.from_user.id)
+    if not habits:
+        await message.answer("У тебя пока нет привычек. Создай их в WebApp 🌱", reply_markup=main_menu_kb())
+        return
+    await message.answer("Отметь выполненные привычки:", reply_markup=habits_checkin_kb(habits))
+
+
+async def on_checkin(callback: CallbackQuery, callback_data: CheckInCallback, db: AsyncSession) -> None:
+    """
+    Check in straight from an inline button; the result is shown as a toast
+    via answerCallbackQuery, so the whole interaction is a single Bot API call.
+    """
+    habit = await get_habit_for_telegram_user(db, callback.from_user.id, callback_data.habit_id)
+    if not habit:
+        await callback.answer("Привычка не найдена.", show_alert=True)
+        return
+
+    today = date.today()
+    if habit.last_check_in_date == today:
+        await callback.answer(f"«{habit.name}» уже отмечена сегодня 🌿")
+        return
+
+    result = await check_in_habit(db, habit, today)
+    await callback.answer(
+        f"«{habit.name}» отмечена! Серия: {result.current_streak} 🔥, "
+        f"стадия растения: {result.plant_growth_stage}"
+    )
+
+
 def register_handlers(dp: Dispatcher) -> None:
+    dp.update.outer_middleware(DbSessionMiddleware())
+
     dp.message.register(cmd_start, CommandStart())
     dp.message.register(cmd_help, Command("help"))
     dp.message.register(admin_ping, Command("ping"))
+    dp.message.register(cmd_habits, Command("habits"))
+    dp.callback_query.register(on_checkin, CheckInCallback.filter())
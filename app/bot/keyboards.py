@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+from typing import Sequence
+
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 
 from app.core.config import settings
+from app.models.habit import Habit
+
+
+class CheckInCallback(CallbackData, prefix="ci"):
+    habit_id: int
 
 
 def main_menu_kb() -> InlineKeyboardMarkup:
@@ -19,3 +27,18 @@ def main_menu_kb() -> InlineKeyboardMarkup:
         web_app=WebAppInfo(url=url),
     )
     return InlineKeyboardMarkup(inline_keyboard=[[webapp_button]])
+
+
+def checkin_button(habit_id: int, name: str) -> InlineKeyboardButton:
+    return InlineKeyboardButton(
+        text=f"✅ {name}",
+        callback_data=CheckInCallback(habit_id=habit_id).pack(),
+    )
+
+
+def habits_checkin_kb(habits: Sequence[Habit]) -> InlineKeyboardMarkup:
+    """
+    One check-in button per habit, so a habit can be ticked without opening the WebApp.
+    """
+    rows = [[checkin_button(h.id, h.name)] for h in habits]
+    return InlineKeyboardMarkup(inline_keyboard=rows)
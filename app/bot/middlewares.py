@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.core.database import AsyncSessionLocal
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    Provide handlers with an async DB session as the `db` argument.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with AsyncSessionLocal() as session:
+            data["db"] = session
+            return await handler(event, data)
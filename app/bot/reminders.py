@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import html
+import logging
+from datetime import datetime, timezone
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+from sqlalchemy import text
+
+from app.bot.keyboards import checkin_button
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_engine
+from app.core.rate_limit import AsyncTokenBucket
+from app.services.reminder_service import HABITS_CHANGED_CHANNEL, DueReminder, ReminderScheduler
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock held by the one process that sends reminders
+REMINDER_LOCK_KEY = 0x6D6F6F6E72656D31
+
+
+def _reminder_text(reminder: DueReminder) -> str:
+    text = f"🌙 Пора позаботиться о привычке <b>{html.escape(reminder.habit_name)}</b>."
+    if reminder.current_streak:
+        text += f"\nСерия: {reminder.current_streak} 🔥 — не дай растению завянуть!"
+    return text
+
+
+async def _send_batch(bot: Bot, bucket: AsyncTokenBucket, reminders: list[DueReminder]) -> None:
+    async def send(reminder: DueReminder) -> None:
+        await bucket.acquire()
+        try:
+            await bot.send_message(
+                reminder.chat_id,
+                _reminder_text(reminder),
+                reply_markup=InlineKeyboardMarkup(
+                    inline_keyboard=[[checkin_button(reminder.habit_id, reminder.habit_name)]]
+                ),
+            )
+        except Exception:
+            logger.exception("Failed to send reminder for habit %s", reminder.habit_id)
+
+    await asyncio.gather(*(send(r) for r in reminders))
+
+
+async def run_reminders(bot: Bot, scheduler: ReminderScheduler | None = None) -> None:
+    """
+    Fire due reminders in batches; sleep until the next due instant or sync tick.
+    """
+    scheduler = scheduler or ReminderScheduler()
+    bucket = AsyncTokenBucket(settings.BROADCAST_GLOBAL_RATE)
+
+    async with AsyncSessionLocal() as db:
+        await scheduler.load_all(db, datetime.now(timezone.utc))
+    logger.info("Reminder scheduler loaded %s habits", len(scheduler))
+
+    last_sync = datetime.now(timezone.utc)
+    while True:
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            interval_elapsed = (now - last_sync).total_seconds() >= settings.REMINDER_SYNC_INTERVAL_SECONDS
+            if interval_elapsed or scheduler.has_dirty:
+                await scheduler.sync(db, now)
+                last_sync = now
+            reminders = await scheduler.collect_due(db, now, settings.REMINDER_BATCH_SIZE)
+
+        if reminders:
+            await _send_batch(bot, bucket, reminders)
+            continue  # there may be more due entries right away
+
+        next_at = scheduler.next_at()
+        sleep_for = settings.REMINDER_SYNC_INTERVAL_SECONDS
+        if next_at is not None:
+            sleep_for = min(sleep_for, max((next_at - now).total_seconds(), 0.0))
+        scheduler.wakeup.clear()
+        try:
+            await asyncio.wait_for(scheduler.wakeup.wait(), timeout=sleep_for)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_reminders_as_leader(bot: Bot) -> None:
+    """
+    Every web worker starts this, but only the holder of a session-level
+    advisory lock runs the scheduler; the others retry every sync interval
+    and take over when the holder's connection goes away.
+
+    The lock connection also LISTENs on HABITS_CHANGED_CHANNEL, so habit
+    changes committed by any process reach the scheduler right away.
+    """
+    retry = settings.REMINDER_SYNC_INTERVAL_SECONDS
+    while True:
+        try:
+            async with get_engine().connect() as conn:
+                acquired = (
+                    await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": REMINDER_LOCK_KEY})
+                ).scalar_one()
+                await conn.commit()
+                if not acquired:
+                    await asyncio.sleep(retry)
+                    continue
+                logger.info("This process sends habit reminders")
+                scheduler = ReminderScheduler()
+
+                def on_habits_changed(_conn, _pid, _channel, payload: str) -> None:
+                    for habit_id in payload.split(","):
+                        scheduler.mark_dirty(int(habit_id))
+
+                driver = (await conn.get_raw_connection()).driver_connection
+                await driver.add_listener(HABITS_CHANGED_CHANNEL, on_habits_changed)
+                task = asyncio.create_task(run_reminders(bot, scheduler), name="habit-reminders-loop")
+                try:
+                    while not task.done():
+                        await asyncio.wait({task}, timeout=retry)
+                        # the lock lives as long as this connection; stop if it broke
+                        await conn.execute(text("SELECT 1"))
+                        await conn.commit()
+                    task.result()
+                finally:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    # the connection goes back to the pool, which keeps session locks
+                    try:
+                        await driver.remove_listener(HABITS_CHANGED_CHANNEL, on_habits_changed)
+                        await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REMINDER_LOCK_KEY})
+                        await conn.commit()
+                    except Exception:
+                        await conn.invalidate()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Reminder leader lost its lock or failed; retrying")
+            await asyncio.sleep(retry)
+
+
+def start_reminders(bot: Bot) -> asyncio.Task[None]:
+    return asyncio.create_task(run_reminders_as_leader(bot), name="habit-reminders")
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Request, Response, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryUpdateDeduplicator:
+    """
+    Bounded TTL set of recently seen update ids (single replica).
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int = 100_000) -> None:
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self._seen: OrderedDict[int, float] = OrderedDict()
+
+    async def claim(self, update_id: int) -> bool:
+        now = time.monotonic()
+        while self._seen:
+            oldest_id, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.ttl and len(self._seen) < self.max_size:
+                break
+            del self._seen[oldest_id]
+        if update_id in self._seen:
+            return False
+        self._seen[update_id] = now
+        return True
+
+
+class RedisUpdateDeduplicator:
+    """
+    `SET NX EX` based claim, shared by every replica behind the webhook.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int) -> None:
+        from redis.asyncio import Redis
+
+        self.ttl = ttl_seconds
+        self._redis = Redis.from_url(redis_url)
+
+    async def claim(self, update_id: int) -> bool:
+        return bool(await self._redis.set(f"tg:update:{update_id}", 1, nx=True, ex=self.ttl))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class WebhookProcessor:
+    """
+    Accepts raw updates, drops duplicates and feeds the dispatcher in background
+    tasks, with at most `max_concurrency` updates in flight.
+    """
+
+    def __init__(self, bot: Bot, dp: Dispatcher, deduplicator: Any, max_concurrency: int) -> None:
+        self.bot = bot
+        self.dp = dp
+        self.deduplicator = deduplicator
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.duplicates = 0
+
+    async def submit(self, payload: dict[str, Any]) -> bool:
+        """
+        Returns False if the update was already seen.
+
+        Waits for a free slot when saturated so Telegram backs off instead
+        of us piling up unbounded tasks.
+        """
+        update_id = payload.get("update_id")
+        if update_id is not None and not await self.deduplicator.claim(update_id):
+            self.duplicates += 1
+            return False
+
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._process(payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _process(self, payload: dict[str, Any]) -> None:
+        try:
+            update = Update.model_validate(payload, context={"bot": self.bot})
+            await self.dp.feed_update(self.bot, update)
+        except Exception:
+            logger.exception("Failed to process update %s", payload.get("update_id"))
+        finally:
+            self._semaphore.release()
+
+    async def drain(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def create_deduplicator() -> Any:
+    if settings.TELEGRAM_WEBHOOK_DEDUP_BACKEND == "redis":
+        return RedisUpdateDeduplicator(settings.REDIS_URL, settings.TELEGRAM_WEBHOOK_DEDUP_TTL_SECONDS)
+    return MemoryUpdateDeduplicator(settings.TELEGRAM_WEBHOOK_DEDUP_TTL_SECONDS)
+
+
+def build_webhook_router(processor: WebhookProcessor, secret: str) -> APIRouter:
+    router = APIRouter()
+
+    @router.post(settings.TELEGRAM_WEBHOOK_PATH, include_in_schema=False)
+    async def telegram_webhook(
+        request: Request,
+        x_telegram_bot_api_secret_token: str | None = Header(default=None),
+    ) -> Response:
+        if not hmac.compare_digest(x_telegram_bot_api_secret_token or "", secret):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid secret token")
+        await processor.submit(await request.json())
+        return Response(status_code=status.HTTP_200_OK)
+
+    return router
+
+
+def mount_webhook(
+    app: FastAPI,
+    bot: Bot | None = None,
+    dp: Dispatcher | None = None,
+    register: bool = True,
+    secret: str | None = None,
+) -> WebhookProcessor:
+    """
+    Mount the aiogram dispatcher as a route of `app`.
+
+    With `register=True` the webhook is (re)registered with Telegram on
+    startup; every replica sets the same URL, so this is idempotent.
+
+    The route is public, so a secret token is required: Telegram echoes it
+    in X-Telegram-Bot-Api-Secret-Token and anything else is rejected.
+    """
+    from app.bot.bot_main import create_bot, create_dispatcher
+
+    # a per-process generated secret would not work: replicas overwrite each other's set_webhook
+    secret = secret or settings.TELEGRAM_WEBHOOK_SECRET
+    if not secret:
+        raise RuntimeError("Webhook mode requires TELEGRAM_WEBHOOK_SECRET")
+
+    bot = bot or create_bot()
+    dp = dp or create_dispatcher()
+    processor = WebhookProcessor(
+        bot,
+        dp,
+        create_deduplicator(),
+        settings.TELEGRAM_WEBHOOK_MAX_CONCURRENCY,
+    )
+    app.include_router(build_webhook_router(processor, secret))
+
+    reminders_task: list[asyncio.Task[None]] = []
+
+    async def on_startup() -> None:
+        if settings.REMINDERS_ENABLED and register:
+            from app.bot.reminders import start_reminders
+
+            reminders_task.append(start_reminders(bot))
+        if register and settings.TELEGRAM_WEBHOOK_URL:
+            await bot.set_webhook(
+                settings.TELEGRAM_WEBHOOK_URL.rstrip("/") + settings.TELEGRAM_WEBHOOK_PATH,
+                secret_token=secret,
+                allowed_updates=dp.resolve_used_update_types(),
+                max_connections=min(settings.TELEGRAM_WEBHOOK_MAX_CONCURRENCY, 100),
+            )
+
+    async def on_shutdown() -> None:
+        for task in reminders_task:
+            task.cancel()
+        await processor.drain()
+        if isinstance(processor.deduplicator, RedisUpdateDeduplicator):
+            await processor.deduplicator.close()
+        await bot.session.close()
+
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
+    return processor
+
+
+def create_webhook_app() -> FastAPI:
+    """
+    Separate ASGI app serving only the bot webhook.
+    """
+    from app.core.jobs import shutdown_job_queue
+
+    app = FastAPI(title=f"{settings.APP_NAME} bot webhook", docs_url=None, redoc_url=None)
+    mount_webhook(app)
+    app.add_event_handler("shutdown", shutdown_job_queue)
+    return app
@@ -0,0 +1,309 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+gzip is always available; brotli ("br") and zstd are used when the
+`brotli` / `zstandard` packages are installed. Responses below
+COMPRESSION_MIN_SIZE, non-text content types, Server-Sent Events and
+responses that already carry a Content-Encoding are passed through.
+
+Responses marked `Cache-Control: public` (moon phase, artifact catalog)
+are compressed once at the highest level and kept in a small LRU keyed
+by encoding and body digest. Every worker then serves the same bytes
+without compressing them again.
+"""
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Optional, Protocol
+
+from .config import settings
+
+COMPRESSIBLE_TYPES = (
+    b"application/json",
+    b"application/x-ndjson",
+    b"application/javascript",
+    b"image/svg+xml",
+    b"text/",
+)
+NEVER_COMPRESS_TYPES = (b"text/event-stream",)
+
+# level used for cached (compress-once) bodies
+CACHE_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int) -> None:
+        import brotli
+
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int) -> None:
+        import zstandard
+
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+_CODECS: dict[str, Callable[[int], StreamCompressor]] = {"gzip": _Gzip, "br": _Brotli, "zstd": _Zstd}
+
+
+@lru_cache(maxsize=1)
+def available_encodings() -> tuple[str, ...]:
+    """
+    COMPRESSION_ENCODINGS (server preference order) minus missing libraries.
+    """
+    found = []
+    for name in settings.COMPRESSION_ENCODINGS:
+        if name not in _CODECS:
+            continue
+        try:
+            _CODECS[name](1)
+        except ImportError:
+            continue
+        found.append(name)
+    return tuple(found)
+
+
+def default_level(encoding: str) -> int:
+    return {
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    }[encoding]
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    codec = _CODECS[encoding](default_level(encoding) if level is None else level)
+    return codec.compress(body) + codec.finish()
+
+
+def choose_encoding(accept_encoding: str, offered: tuple[str, ...]) -> Optional[str]:
+    """
+    First of `offered` (server order) the client accepts with q > 0.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in offered:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class CompressedCache:
+    """
+    LRU of compressed bodies keyed by (encoding, body digest).
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._items: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+            return data
+        data = compress(body, encoding, CACHE_LEVELS[encoding])
+        self._items[key] = data
+        if len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+        return data
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> bytes:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return b""
+
+
+def _compressible(status: int, headers: list[tuple[bytes, bytes]]) -> bool:
+    if status < 200 or status in (204, 206, 304):
+        return False
+    if _header(headers, b"content-encoding"):
+        return False
+    if b"no-transform" in _header(headers, b"cache-control"):
+        return False
+    content_type = _header(headers, b"content-type").lower()
+    if content_type.startswith(NEVER_COMPRESS_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _rewrite_headers(
+    headers: list[tuple[bytes, bytes]],
+    encoding: Optional[str],
+    length: Optional[int],
+) -> list[tuple[bytes, bytes]]:
+    out = []
+    vary = None
+    for key, value in headers:
+        lower = key.lower()
+        if lower == b"vary":
+            vary = value
+            continue
+        if encoding is not None:
+            if lower == b"content-length":
+                continue
+            if lower == b"etag" and not value.startswith(b"W/"):
+                # the compressed bytes differ; a weak tag still matches If-None-Match
+                value = b"W/" + value
+        out.append((key, value))
+    if vary is None:
+        out.append((b"vary", b"Accept-Encoding"))
+    elif b"accept-encoding" not in vary.lower():
+        out.append((b"vary", vary + b", Accept-Encoding"))
+    else:
+        out.append((b"vary", vary))
+    if encoding is not None:
+        out.append((b"content-encoding", encoding.encode("ascii")))
+        if length is not None:
+            out.append((b"content-length", str(length).encode("ascii")))
+    return out
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI. Body chunks are buffered until they reach `min_size` or the
+    response ends; only then is the encoding decided. Past the threshold,
+    streamed responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_size: Optional[int] = None,
+        encodings: Optional[tuple[str, ...]] = None,
+        cache_size: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.encodings = available_encodings() if encodings is None else encodings
+        size = settings.COMPRESSION_CACHE_SIZE if cache_size is None else cache_size
+        self.cache = CompressedCache(size) if size > 0 else None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept, self.encodings) if accept else None
+
+        start: Optional[dict] = None
+        compressible = False
+        compressor: Optional[StreamCompressor] = None
+        pending: list[bytes] = []
+        pending_size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal start, compressible, compressor, pending_size
+            if message["type"] == "http.response.start":
+                start = message
+                headers = list(message.get("headers", []))
+                compressible = _compressible(message["status"], headers)
+                if not compressible:
+                    await send(message)
+                    start = None
+                return
+            if message["type"] != "http.response.body" or start is None and compressor is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if compressor is not None:
+                # streaming, headers already sent
+                data = compressor.compress(body)
+                if not more:
+                    data += compressor.finish()
+                if data or not more:
+                    await send({"type": "http.response.body", "body": data, "more_body": more})
+                return
+
+            if more and encoding is not None and pending_size + len(body) < self.min_size:
+                # too early to tell whether the whole body reaches the threshold
+                pending.append(body)
+                pending_size += len(body)
+                return
+            if pending:
+                pending.append(body)
+                body = b"".join(pending)
+                pending.clear()
+
+            headers = list(start.get("headers", []))
+            if encoding is None or (not more and len(body) < self.min_size):
+                # identity; still tell caches the representation varies
+                start["headers"] = _rewrite_headers(headers, None, None)
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body, "more_body": more})
+                return
+
+            if not more:
+                if self.cache is not None and b"public" in _header(headers, b"cache-control"):
+                    data = self.cache.get_or_compress(body, encoding)
+                else:
+                    data = compress(body, encoding)
+                start["headers"] = _rewrite_headers(headers, encoding, len(data))
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": data, "more_body": False})
+                return
+
+            compressor = _CODECS[encoding](default_level(encoding))
+            start["headers"] = _rewrite_headers(headers, encoding, None)
+            await send(start)
+            start = None
+            data = compressor.compress(body)
+            if data:
+                await send({"type": "http.response.body", "body": data, "more_body": True})
+
+        await self.app(scope, receive, send_wrapper)
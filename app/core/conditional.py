@@ -0,0 +1,36 @@
+"""
+Conditional GET helpers for per-user versioned resources.
+
+A resource's ETag is derived from the user's data_version (already loaded
+with the current user), so an unchanged resource is answered with 304
+before any habit / plant row is read.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match comparison (weak, as RFC 9110 requires for this header).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def version_headers(etag: str, version: int) -> dict[str, str]:
+    # no-cache: the client may keep the body but must revalidate every time
+    return {"ETag": etag, "X-Data-Version": str(version), "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str, version: int) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version_headers(etag, version))
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from datetime import time
 from functools import lru_cache
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +23,13 @@ class Settings(BaseSettings):
     APP_PORT: int = 8000
     LOG_LEVEL: str = "INFO"
 
+    # --- Production server (python -m app.server) ---
+    WEB_CONCURRENCY: Optional[int] = None  # workers; defaults to usable CPU cores
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    # Precomputed hourly moon phase table (python -m app.core.moon_phases <path>)
+    MOON_PHASE_TABLE_PATH: Optional[str] = None
+    ARTIFACT_CATALOG_TTL_SECONDS: int = 300
+
     DEFAULT_TIMEZONE: str = "Asia/Phnom_Penh"
 
     TELEGRAM_WEBAPP_URL: Optional[AnyHttpUrl] = None
@@ -43,6 +51,22 @@ class Settings(BaseSettings):
             return self.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql+psycopg2://", 1)
         return self.DATABASE_URL
 
+    # Default guards for `alembic upgrade`, e.g. "5s"; empty disables
+    MIGRATION_LOCK_TIMEOUT: str = "5s"
+    MIGRATION_STATEMENT_TIMEOUT: str = ""
+
+    # Monthly partitions of event tables (see app.core.partitioning)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_RETENTION_MONTHS: dict[str, int] = Field(default_factory=dict)  # table -> months kept
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"  # empty = drop detached partitions
+    # otherwise schedule `python -m app.core.partitioning` monthly; until it runs,
+    # new months land in the <table>_default partition
+    PARTITION_MAINTENANCE_ON_STARTUP: bool = False
+
+    # --- Observability ---
+    METRICS_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+
     # --- Security / JWT ---
     JWT_SECRET_KEY: str = "CHANGE_ME_SUPER_SECRET_KEY"
     JWT_ALGORITHM: str = "HS256"
@@ -52,6 +76,99 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str = "8492306440:AAEn5kOgqMCBbGwnUAvXe88odg0uBDY4bwY"
     TELEGRAM_ADMIN_CHAT_ID: Optional[int] = None
 
+    # Override Bot API server, e.g. a local fake server for load tests
+    TELEGRAM_API_BASE_URL: Optional[str] = None
+
+    # "polling" runs app.bot.bot_main standalone; "webhook" serves updates over HTTP
+    TELEGRAM_BOT_MODE: Literal["polling", "webhook"] = "polling"
+    TELEGRAM_WEBHOOK_URL: Optional[str] = None  # public base URL, e.g. https://api.example.com
+    TELEGRAM_WEBHOOK_PATH: str = "/telegram/webhook"
+    TELEGRAM_WEBHOOK_SECRET: Optional[str] = None  # required in webhook mode
+    TELEGRAM_WEBHOOK_MAX_CONCURRENCY: int = 64
+    # "redis" shares update_id de-duplication between replicas
+    TELEGRAM_WEBHOOK_DEDUP_BACKEND: Literal["memory", "redis"] = "memory"
+    TELEGRAM_WEBHOOK_DEDUP_TTL_SECONDS: int = 600
+
+    # --- Broadcasts ---
+    BROADCAST_GLOBAL_RATE: float = 25.0  # messages/sec, Telegram allows ~30
+    BROADCAST_PER_CHAT_INTERVAL: float = 1.0  # seconds between messages to one chat
+    BROADCAST_BATCH_SIZE: int = 500
+    BROADCAST_MAX_RETRIES: int = 3
+    BROADCAST_CHECKPOINT_DIR: str = ".broadcasts"
+
+    # --- Game balance ---
+    # JSON file with per-species growth curves and gains (see app.core.growth_rules)
+    GROWTH_RULES_PATH: Optional[str] = None
+
+    # Artifact discoveries allowed per window, by current moon phase
+    DISCOVERY_RATE_LIMIT_ENABLED: bool = True
+    DISCOVERY_RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    DISCOVERY_WINDOW_SECONDS: int = 3600
+    DISCOVERY_QUOTAS: dict[str, int] = Field(
+        default_factory=lambda: {
+            "new": 3,
+            "waxing": 5,
+            "full": 8,
+            "waning": 5,
+        }
+    )
+
+    # --- Idempotency-Key support for mutating endpoints ---
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_BACKEND: Literal["memory", "redis"] = "memory"
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600
+    IDEMPOTENCY_LOCK_SECONDS: int = 30  # how long duplicates wait for the first request
+    IDEMPOTENCY_MAX_ENTRIES: int = 100_000  # memory backend only
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 64 * 1024  # larger responses are not stored
+    IDEMPOTENCY_PATHS: list[str] = Field(
+        default_factory=lambda: [
+            r"^/api/habits/\d+/checkin$",
+            r"^/api/lunar/energy/use$",
+            r"^/api/lunar/energy/daily_bonus$",
+            r"^/api/artifacts/discover$",
+        ]
+    )
+
+    # --- Background jobs (post-commit side effects, see app.core.jobs) ---
+    JOB_BACKEND: Literal["memory", "redis", "sync"] = "memory"
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX_SIZE: int = 10_000
+    JOB_ENQUEUE_TIMEOUT_SECONDS: float = 1.0  # then the job runs inline
+    JOB_MAX_RETRIES: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: float = 0.5
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+    # --- Live updates (SSE / WebSocket push, see app.core.live) ---
+    LIVE_BACKEND: Literal["memory", "redis"] = "memory"  # redis when running several workers
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+    LIVE_QUEUE_SIZE: int = 100  # per connection; overflow turns into one "resync"
+    LIVE_MAX_CONNECTIONS_PER_USER: int = 5
+
+    # --- Response compression (see app.core.compression) ---
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies fit in a packet or two anyway
+    COMPRESSION_ENCODINGS: list[str] = ["br", "zstd", "gzip"]  # preference; br/zstd need their packages
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # per-request; cached public bodies use 11
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_SIZE: int = 256  # compressed Cache-Control: public bodies; 0 disables
+
+    # --- Habit reminders ---
+    REMINDERS_ENABLED: bool = False
+    REMINDER_LOCAL_TIME: time = time(20, 0)  # in the user's timezone
+    REMINDER_BATCH_SIZE: int = 200
+    REMINDER_SYNC_INTERVAL_SECONDS: int = 60
+    # re-read this far below the newest updated_at seen: it is stamped at flush,
+    # not commit, and by each worker's own clock
+    REMINDER_SYNC_OVERLAP_SECONDS: int = 300
+    REMINDER_STARTUP_GRACE_MINUTES: int = 60
+
+    # --- Leaderboards ---
+    # "memory" keeps a per-process skiplist; use "redis" with several workers
+    LEADERBOARD_BACKEND: Literal["memory", "redis"] = "memory"
+    # unset: rebuild only the "memory" backend, which starts empty in every process
+    LEADERBOARD_REBUILD_ON_STARTUP: Optional[bool] = None
+
     # --- Redis (optional) ---
     REDIS_URL: str = "redis://localhost:6379/0"
 
@@ -80,4 +197,15 @@ def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings()
+class _SettingsProxy:
+    """
+    Reads .env / environment on first attribute access instead of at import.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+settings: Settings = _SettingsProxy()  # type: ignore[assignment]
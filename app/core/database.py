@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -14,21 +14,70 @@ from .config import settings
 
 Base = declarative_base()
 
+_engine: Optional[AsyncEngine] = None
+
+
+def create_engine_from_settings() -> AsyncEngine:
+    if not settings.METRICS_ENABLED:
+        return create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+
+    from .metrics import TimedAsyncQueuePool, install_engine_hooks
+
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        future=True,
+        poolclass=TimedAsyncQueuePool,
+    )
+    install_engine_hooks(engine, settings.SLOW_QUERY_THRESHOLD_MS)
+    return engine
+
 
 def get_engine() -> AsyncEngine:
-    return create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+    """
+    Process-wide engine, created on first use (normally in the app lifespan).
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine_from_settings()
+        AsyncSessionLocal.configure(bind=_engine)
+    return _engine
+
 
+async def dispose_engine() -> None:
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        AsyncSessionLocal.configure(bind=None)
 
-engine: AsyncEngine = get_engine()
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+class _LazyAsyncSessionMaker(async_sessionmaker[AsyncSession]):
+    """
+    Session factory that creates the engine on the first session, so importing
+    this module never builds a pool (CLI tasks, alembic, cold starts).
+    """
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+AsyncSessionLocal = _LazyAsyncSessionMaker(
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
 )
 
 
+def __getattr__(name: str) -> Any:
+    # backwards compatible `from app.core.database import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(name)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency: provide an async DB session.
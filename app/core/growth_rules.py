@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Sequence
+
+from .config import settings
+
+# Curves whose last threshold is below this get a points -> stage array.
+DIRECT_INDEX_LIMIT = 4096
+
+DEFAULT_THRESHOLDS: tuple[int, ...] = (0, 20, 50, 100, 200)
+
+
+class GrowthRulesError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class GrowthCurve:
+    """
+    Stage thresholds compiled for O(1) (direct index) or O(log n) (bisect) lookup.
+    """
+
+    thresholds: tuple[int, ...]
+    _direct: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def compile(cls, thresholds: Sequence[int]) -> "GrowthCurve":
+        values = tuple(int(t) for t in thresholds)
+        if not values or values[0] != 0:
+            raise GrowthRulesError("Growth curve must start at 0 points")
+        if any(b <= a for a, b in zip(values, values[1:])):
+            raise GrowthRulesError(f"Thresholds must be strictly increasing: {values}")
+        if len(values) > 255:
+            raise GrowthRulesError("At most 255 stages per curve")
+
+        direct = None
+        if values[-1] < DIRECT_INDEX_LIMIT:
+            table = bytearray(values[-1] + 1)
+            for stage, (start, end) in enumerate(zip(values, values[1:] + (values[-1] + 1,))):
+                table[start:end] = bytes([stage]) * (end - start)
+            direct = bytes(table)
+        return cls(values, direct)
+
+    @property
+    def max_stage(self) -> int:
+        return len(self.thresholds) - 1
+
+    def stage_for(self, points: int) -> int:
+        if points <= 0:
+            return 0
+        direct = self._direct
+        if direct is not None:
+            return direct[points] if points < len(direct) else self.max_stage
+        return bisect_right(self.thresholds, points) - 1
+
+
+@dataclass(frozen=True)
+class GrowthGains:
+    base: int = 10
+    mushroom_bonus: int = 5
+    custom_frequency_bonus: int = 3
+
+
+@dataclass(frozen=True)
+class GrowthRules:
+    default: GrowthCurve
+    species: Mapping[str, GrowthCurve]
+    gains: GrowthGains
+
+    def curve_for(self, species: Optional[str]) -> GrowthCurve:
+        if species is None:
+            return self.default
+        return self.species.get(species, self.default)
+
+    def stage_for(self, species: Optional[str], points: int) -> int:
+        return self.curve_for(species).stage_for(points)
+
+
+def compile_growth_rules(config: Mapping[str, Any]) -> GrowthRules:
+    """
+    Config shape::
+
+        {
+          "default": {"thresholds": [0, 20, 50, 100, 200]},
+          "species": {"mushroom_seed": {"thresholds": [0, 15, 40, ...]}},
+          "gains": {"base": 10, "mushroom_bonus": 5, "custom_frequency_bonus": 3}
+        }
+    """
+    default = GrowthCurve.compile(config.get("default", {}).get("thresholds", DEFAULT_THRESHOLDS))
+    species = {
+        name: GrowthCurve.compile(curve["thresholds"]) for name, curve in config.get("species", {}).items()
+    }
+    gains = GrowthGains(**config.get("gains", {}))
+    return GrowthRules(default=default, species=species, gains=gains)
+
+
+@lru_cache
+def get_growth_rules() -> GrowthRules:
+    if settings.GROWTH_RULES_PATH:
+        with open(settings.GROWTH_RULES_PATH, encoding="utf-8") as f:
+            return compile_growth_rules(json.load(f))
+    return compile_growth_rules({})
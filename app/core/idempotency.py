@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import orjson
+
+from .config import settings
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+
+@dataclass(slots=True)
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    fingerprint: str
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            {
+                "s": self.status,
+                "h": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in self.headers],
+                "b": base64.b64encode(self.body).decode("ascii"),
+                "f": self.fingerprint,
+            }
+        )
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "StoredResponse":
+        data = orjson.loads(raw)
+        return cls(
+            status=data["s"],
+            headers=[(k.encode("latin-1"), v.encode("latin-1")) for k, v in data["h"]],
+            body=base64.b64decode(data["b"]),
+            fingerprint=data["f"],
+        )
+
+
+class MemoryIdempotencyStore:
+    """
+    Bounded TTL store for a single process.
+
+    In-flight keys hold a future, so concurrent duplicates wait on the first
+    request instead of polling. Each worker has its own store; use Redis
+    when running several workers.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 100_000) -> None:
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._done: OrderedDict[str, tuple[float, StoredResponse]] = OrderedDict()
+        self._pending: dict[str, asyncio.Future[Optional[StoredResponse]]] = {}
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        item = self._done.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.monotonic():
+            del self._done[key]
+            return None
+        return item[1]
+
+    async def acquire(self, key: str) -> bool:
+        if key in self._pending:
+            return False
+        self._pending[key] = asyncio.get_running_loop().create_future()
+        return True
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        fut = self._pending.get(key)
+        if fut is None:
+            return await self.get(key)
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        now = time.monotonic()
+        self._done[key] = (now + self.ttl, response)
+        self._done.move_to_end(key)
+        while self._done:
+            oldest, (expires, _) = next(iter(self._done.items()))
+            if expires > now and len(self._done) <= self.max_entries:
+                break
+            del self._done[oldest]
+        self._resolve(key, response)
+
+    async def release(self, key: str) -> None:
+        self._resolve(key, None)
+
+    def _resolve(self, key: str, response: Optional[StoredResponse]) -> None:
+        fut = self._pending.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(response)
+
+
+class RedisIdempotencyStore:
+    """
+    Responses and in-flight locks in Redis, shared by every worker.
+
+    Waiters poll with backoff until the response appears or the lock goes away.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int, lock_seconds: int, prefix: str = "idem:") -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(redis_url)
+        self.ttl = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        raw = await self._redis.get(self._prefix + key)
+        return None if raw is None else StoredResponse.loads(raw)
+
+    async def acquire(self, key: str) -> bool:
+        return bool(await self._redis.set(f"{self._prefix}{key}:lock", 1, nx=True, ex=self.lock_seconds))
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            stored = await self.get(key)
+            if stored is not None:
+                return stored
+            if not await self._redis.exists(f"{self._prefix}{key}:lock"):
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._prefix + key, response.dumps(), ex=self.ttl)
+            pipe.delete(f"{self._prefix}{key}:lock")
+            await pipe.execute()
+
+    async def release(self, key: str) -> None:
+        await self._redis.delete(f"{self._prefix}{key}:lock")
+
+
+def create_idempotency_store() -> MemoryIdempotencyStore | RedisIdempotencyStore:
+    if settings.IDEMPOTENCY_BACKEND == "redis":
+        return RedisIdempotencyStore(
+            settings.REDIS_URL,
+            settings.IDEMPOTENCY_TTL_SECONDS,
+            settings.IDEMPOTENCY_LOCK_SECONDS,
+        )
+    return MemoryIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_ENTRIES)
+
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+async def _json_error(send, status: int, detail: str) -> None:
+    body = orjson.dumps({"detail": detail})
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the stored response for a repeated `Idempotency-Key`.
+
+    Only POST requests whose path matches one of `paths` and that carry the
+    header are handled. Keys are scoped by the Authorization header and path,
+    and bound to a hash of the request body: reusing a key with a different
+    body is a 422. 5xx and 429 responses are not stored, so those retries run
+    the handler again.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: Iterable[str],
+        store: MemoryIdempotencyStore | RedisIdempotencyStore | None = None,
+    ) -> None:
+        self.app = app
+        self.paths = [re.compile(p) for p in paths]
+        self.store = store or create_idempotency_store()
+        self.lock_seconds = settings.IDEMPOTENCY_LOCK_SECONDS
+        self.max_body = settings.IDEMPOTENCY_MAX_BODY_BYTES
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not any(p.match(scope["path"]) for p in self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idem_key = _header(scope, IDEMPOTENCY_HEADER)
+        if idem_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idem_key or len(idem_key) > MAX_KEY_LENGTH:
+            await _json_error(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        # request bodies here are tiny; buffer them to fingerprint and replay
+        chunks = []
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        body = b"".join(chunks)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        scope_id = hashlib.sha256(
+            b"\0".join((_header(scope, b"authorization") or b"", scope["path"].encode(), idem_key))
+        ).hexdigest()
+
+        deadline = time.monotonic() + self.lock_seconds
+        while True:
+            stored = await self.store.get(scope_id)
+            if stored is None and await self.store.acquire(scope_id):
+                # re-check: the owner may have finished between get and acquire
+                stored = await self.store.get(scope_id)
+                if stored is None:
+                    break
+                await self.store.release(scope_id)
+            if stored is None:
+                stored = await self.store.wait(scope_id, max(deadline - time.monotonic(), 0))
+            if stored is not None:
+                await self._replay(stored, fingerprint, send)
+                return
+            if time.monotonic() >= deadline:
+                await _json_error(send, 409, "A request with this Idempotency-Key is still in progress")
+                return
+
+        await self._run(scope, receive, body, scope_id, fingerprint, send)
+
+    async def _replay(self, stored: StoredResponse, fingerprint: str, send) -> None:
+        if stored.fingerprint != fingerprint:
+            await _json_error(send, 422, "Idempotency-Key was already used with a different request body")
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status,
+                "headers": [*stored.headers, (REPLAYED_HEADER, b"true")],
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _run(self, scope, receive, body: bytes, scope_id: str, fingerprint: str, send) -> None:
+        sent_body = False
+
+        async def receive_replay():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = 500
+        headers: list[tuple[bytes, bytes]] = []
+        parts: list[bytes] = []
+        size = 0
+
+        async def send_capture(message) -> None:
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= self.max_body:
+                    parts.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, receive_replay, send_capture)
+        except BaseException:
+            await self.store.release(scope_id)
+            raise
+
+        if status >= 500 or status == 429 or size > self.max_body:
+            await self.store.release(scope_id)
+            return
+        await self.store.complete(scope_id, StoredResponse(status, headers, b"".join(parts), fingerprint))
@@ -0,0 +1,451 @@
+"""
+Background jobs for post-commit side effects (leaderboards, notifications,
+cache invalidation, ...).
+
+    @job("leaderboard.record_streak")
+    async def record_streak(user_id: int, longest_streak: int) -> None: ...
+
+    await db.commit()
+    await enqueue(record_streak, user.id, habit.longest_streak)
+
+Backends (JOB_BACKEND):
+- memory: bounded asyncio.Queue drained by JOB_WORKERS tasks per process.
+- redis: durable list queue shared by every process. Jobs survive restarts,
+  and a crashed consumer's in-flight jobs are put back by the others.
+- sync: run the job inline when it is enqueued and let errors propagate (tests).
+
+Failed attempts are retried with exponential backoff. After JOB_MAX_RETRIES
+the job is dead-lettered. Job arguments must be JSON-serializable.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import orjson
+
+from .config import settings
+from .metrics import JOB_QUEUE_DEPTH, JOB_QUEUE_WAIT, JOB_RESULTS, JOB_RUN_TIME
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+_registry: dict[str, JobFunc] = {}
+
+
+def job(name: Optional[str] = None) -> Callable[[JobFunc], JobFunc]:
+    """
+    Register a coroutine function as a job under a stable name.
+    """
+
+    def decorator(fn: JobFunc) -> JobFunc:
+        job_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        _registry[job_name] = fn
+        fn.job_name = job_name  # type: ignore[attr-defined]
+        return fn
+
+    return decorator
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True)
+class Job:
+    name: str
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    ready_at: float = field(default_factory=time.time)  # wall clock: shared across processes
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            {"id": self.id, "name": self.name, "args": self.args, "kwargs": self.kwargs,
+             "attempts": self.attempts, "ready_at": self.ready_at}
+        )
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "Job":
+        return cls(**orjson.loads(raw))
+
+
+class _BaseJobQueue(ABC):
+    """
+    Worker-side execution with retries; subclasses decide where a retried
+    or dead job goes.
+    """
+
+    backend = "base"
+
+    def __init__(self, max_retries: int, retry_backoff: float) -> None:
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    async def _run(self, job: Job) -> None:
+        fn = _registry.get(job.name)
+        if fn is None:
+            logger.error("Unknown job %s (%s), dead-lettering", job.name, job.id)
+            JOB_RESULTS.inc((job.name, "dead"))
+            await self._dead_letter(job, f"unknown job {job.name}")
+            return
+
+        JOB_QUEUE_WAIT.observe((job.name,), max(0.0, time.time() - job.ready_at))
+        start = time.perf_counter()
+        try:
+            await fn(*job.args, **job.kwargs)
+        except Exception as exc:
+            JOB_RUN_TIME.observe((job.name,), time.perf_counter() - start)
+            job.attempts += 1
+            if job.attempts > self.max_retries:
+                logger.exception("Job %s (%s) failed %s times, dead-lettering", job.name, job.id, job.attempts)
+                JOB_RESULTS.inc((job.name, "dead"))
+                await self._dead_letter(job, repr(exc))
+            else:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                logger.warning("Job %s (%s) failed (%r), retry in %.1fs", job.name, job.id, exc, delay)
+                JOB_RESULTS.inc((job.name, "retry"))
+                job.ready_at = time.time() + delay
+                await self._retry_later(job, delay)
+        else:
+            JOB_RESULTS.inc((job.name, "ok"))
+            JOB_RUN_TIME.observe((job.name,), time.perf_counter() - start)
+
+    @abstractmethod
+    async def _retry_later(self, job: Job, delay: float) -> None:
+        """
+        Make `job` runnable again after `delay` seconds.
+        """
+
+    @abstractmethod
+    async def _dead_letter(self, job: Job, error: str) -> None:
+        """
+        Park a job that will not be retried, with the last error.
+        """
+
+
+class SyncJobQueue:
+    """
+    Runs jobs inline in `enqueue`, without retries; errors propagate.
+    """
+
+    backend = "sync"
+
+    def __init__(self, max_retries: int = 0, retry_backoff: float = 0.0) -> None:
+        # same signature as the real queues; nothing is retried here
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    async def enqueue(self, job: Job) -> None:
+        fn = _registry[job.name]
+        await fn(*job.args, **job.kwargs)
+
+    async def stop(self, timeout: float) -> None:
+        return None
+
+
+class MemoryJobQueue(_BaseJobQueue):
+    """
+    Per-process queue. `enqueue` waits up to `enqueue_timeout` for a free
+    slot (backpressure on the caller), then raises QueueFullError.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        workers: int,
+        max_size: int,
+        enqueue_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        dead_letter_size: int = 1000,
+    ) -> None:
+        super().__init__(max_retries, retry_backoff)
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.dead_letters: deque[tuple[Job, str]] = deque(maxlen=dead_letter_size)
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_size)
+        self._tasks: list[asyncio.Task] = []
+        self._retry_handles: set[asyncio.TimerHandle] = set()
+
+    def _ensure_started(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+
+    async def enqueue(self, job: Job) -> None:
+        self._ensure_started()
+        try:
+            await asyncio.wait_for(self._queue.put(job), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            raise QueueFullError(f"job queue full ({self._queue.maxsize})") from None
+        JOB_QUEUE_DEPTH.set((self.backend,), self._queue.qsize())
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            JOB_QUEUE_DEPTH.set((self.backend,), self._queue.qsize())
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _retry_later(self, job: Job, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+
+        def requeue() -> None:
+            self._retry_handles.discard(handle)
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                logger.error("Job queue full, dropping retry of %s (%s)", job.name, job.id)
+                self.dead_letters.append((job, "queue full on retry"))
+
+        handle = loop.call_later(delay, requeue)
+        self._retry_handles.add(handle)
+
+    async def _dead_letter(self, job: Job, error: str) -> None:
+        self.dead_letters.append((job, error))
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Drain queued jobs for up to `timeout` seconds, then stop the workers.
+        Pending retries are dropped (logged).
+        """
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Job queue stopped with %s jobs left", self._queue.qsize())
+        for handle in self._retry_handles:
+            handle.cancel()
+        if self._retry_handles:
+            logger.warning("Dropped %s scheduled job retries on shutdown", len(self._retry_handles))
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+class RedisJobQueue(_BaseJobQueue):
+    """
+    Reliable list queue: workers BLMOVE jobs into a per-consumer processing
+    list and remove them once finished. Consumers refresh a heartbeat key;
+    processing lists whose owner stopped heartbeating are pushed back onto
+    the queue. Retries wait in a sorted set scored by their due time.
+    """
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        redis_url: str,
+        workers: int,
+        max_size: int,
+        enqueue_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        prefix: str = "jobs:",
+        dead_letter_size: int = 10_000,
+    ) -> None:
+        from redis.asyncio import Redis
+
+        super().__init__(max_retries, retry_backoff)
+        self._redis = Redis.from_url(redis_url)
+        self.workers = workers
+        self.max_size = max_size
+        self.enqueue_timeout = enqueue_timeout
+        self.dead_letter_size = dead_letter_size
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}"
+        self._queue_key = f"{prefix}queue"
+        self._delayed_key = f"{prefix}delayed"
+        self._dead_key = f"{prefix}dead"
+        self._processing_prefix = f"{prefix}processing:"
+        self._alive_prefix = f"{prefix}alive:"
+        self._processing_key = self._processing_prefix + self.consumer
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    def _ensure_started(self) -> None:
+        """
+        Start the workers and housekeeping, restarting any task that ended.
+        """
+        if self._stopping:
+            return
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._housekeeping(), name="job-housekeeping"))
+            return
+        for i, task in enumerate(self._tasks):
+            if task.done():
+                if not task.cancelled() and task.exception() is not None:
+                    logger.error("Restarting %s", task.get_name(), exc_info=task.exception())
+                factory = self._housekeeping if task.get_name() == "job-housekeeping" else self._worker
+                self._tasks[i] = asyncio.create_task(factory(), name=task.get_name())
+
+    async def enqueue(self, job: Job) -> None:
+        self._ensure_started()
+        deadline = time.monotonic() + self.enqueue_timeout
+        while await self._redis.llen(self._queue_key) >= self.max_size:
+            if time.monotonic() >= deadline:
+                raise QueueFullError(f"job queue full ({self.max_size})")
+            await asyncio.sleep(0.05)
+        await self._redis.lpush(self._queue_key, job.dumps())
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            try:
+                raw = await self._redis.blmove(self._queue_key, self._processing_key, 1, "RIGHT", "LEFT")
+                if raw is None:
+                    continue
+                try:
+                    await self._run(Job.loads(raw))
+                finally:
+                    await self._redis.lrem(self._processing_key, 1, raw)
+            except Exception:
+                # e.g. a Redis connection blip; a job left in the processing
+                # list is requeued by orphan recovery if this consumer dies
+                logger.exception("Job worker failed")
+                await asyncio.sleep(1.0)
+
+    async def _retry_later(self, job: Job, delay: float) -> None:
+        await self._redis.zadd(self._delayed_key, {job.dumps(): job.ready_at})
+
+    async def _dead_letter(self, job: Job, error: str) -> None:
+        payload = orjson.dumps({"job": orjson.loads(job.dumps()), "error": error, "at": time.time()})
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lpush(self._dead_key, payload)
+            pipe.ltrim(self._dead_key, 0, self.dead_letter_size - 1)
+            await pipe.execute()
+
+    async def _housekeeping(self) -> None:
+        """
+        Heartbeat, move due retries onto the queue, recover orphaned jobs.
+        """
+        last_recovery = 0.0
+        while not self._stopping:
+            try:
+                await self._redis.set(self._alive_prefix + self.consumer, 1, ex=30)
+                due = await self._redis.zrangebyscore(self._delayed_key, "-inf", time.time(), start=0, num=100)
+                for raw in due:
+                    # only the process that wins the ZREM requeues the job
+                    if await self._redis.zrem(self._delayed_key, raw):
+                        await self._redis.lpush(self._queue_key, raw)
+                if time.monotonic() - last_recovery > 30:
+                    last_recovery = time.monotonic()
+                    await self._recover_orphans()
+                JOB_QUEUE_DEPTH.set((self.backend,), await self._redis.llen(self._queue_key))
+            except Exception:
+                logger.exception("Job queue housekeeping failed")
+            await asyncio.sleep(0.5)
+
+    async def _recover_orphans(self) -> None:
+        async for key in self._redis.scan_iter(match=f"{self._processing_prefix}*"):
+            key = key.decode() if isinstance(key, bytes) else key
+            owner = key[len(self._processing_prefix):]
+            if owner == self.consumer or await self._redis.exists(self._alive_prefix + owner):
+                continue
+            moved = 0
+            while await self._redis.lmove(key, self._queue_key, "RIGHT", "LEFT") is not None:
+                moved += 1
+            if moved:
+                logger.warning("Recovered %s jobs from dead consumer %s", moved, owner)
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop taking new jobs; in-flight ones get `timeout` seconds to finish.
+        Queued jobs stay in Redis for the next consumer.
+        """
+        self._stopping = True
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._redis.delete(self._alive_prefix + self.consumer)
+
+
+JobQueue = Union[MemoryJobQueue, RedisJobQueue, SyncJobQueue]
+
+_queue: Optional[JobQueue] = None
+
+
+def create_job_queue() -> JobQueue:
+    if settings.JOB_BACKEND == "sync":
+        return SyncJobQueue(0, 0.0)
+    if settings.JOB_BACKEND == "redis":
+        return RedisJobQueue(
+            settings.REDIS_URL,
+            workers=settings.JOB_WORKERS,
+            max_size=settings.JOB_QUEUE_MAX_SIZE,
+            enqueue_timeout=settings.JOB_ENQUEUE_TIMEOUT_SECONDS,
+            max_retries=settings.JOB_MAX_RETRIES,
+            retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+        )
+    return MemoryJobQueue(
+        workers=settings.JOB_WORKERS,
+        max_size=settings.JOB_QUEUE_MAX_SIZE,
+        enqueue_timeout=settings.JOB_ENQUEUE_TIMEOUT_SECONDS,
+        max_retries=settings.JOB_MAX_RETRIES,
+        retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+    )
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Process-wide queue; workers start on the first enqueue.
+    """
+    global _queue
+    if _queue is None:
+        _queue = create_job_queue()
+    return _queue
+
+
+def set_job_queue(queue: Optional[JobQueue]) -> None:
+    """
+    Swap the process queue, e.g. `set_job_queue(SyncJobQueue(0, 0.0))` in tests.
+    """
+    global _queue
+    _queue = queue
+
+
+async def enqueue(fn: Union[JobFunc, str], *args: Any, **kwargs: Any) -> None:
+    """
+    Queue a registered job. Call after the commit it depends on.
+
+    When the queue stays full for JOB_ENQUEUE_TIMEOUT_SECONDS the job runs
+    inline instead: the caller absorbs the backpressure and no work is lost.
+    """
+    name = fn if isinstance(fn, str) else getattr(fn, "job_name", None)
+    if name is None or name not in _registry:
+        raise ValueError(f"{fn!r} is not a registered job")
+    queue = get_job_queue()
+    job = Job(name, list(args), kwargs)
+    try:
+        await queue.enqueue(job)
+    except QueueFullError:
+        logger.warning("Job queue full, running %s inline", name)
+        JOB_RESULTS.inc((name, "inline"))
+        try:
+            await _registry[name](*args, **kwargs)
+        except Exception:
+            logger.exception("Inline job %s failed", name)
+
+
+async def shutdown_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop(settings.JOB_SHUTDOWN_TIMEOUT_SECONDS)
+        _queue = None
@@ -0,0 +1,209 @@
+"""
+Per-user push channel for the WebApp (SSE / WebSocket, see app.api.live).
+
+Services publish small deltas after their commit:
+
+    await enqueue(push_user_event, user.id, "plant", plant_out.model_dump(mode="json"))
+
+Each message is serialized once and fanned out to every local connection
+of that user. With LIVE_BACKEND=redis, messages go through a Redis
+channel per user. Each worker subscribes only to users that have a
+connection open on it.
+
+A connection has a bounded queue. A client that falls behind loses its
+queued deltas and gets a single `resync` event, which tells it to refetch
+the full state.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional, Union
+
+import orjson
+
+from .config import settings
+from .jobs import job
+from .moon_phases import get_moon_phase_info
+
+logger = logging.getLogger(__name__)
+
+RESYNC = orjson.dumps({"type": "resync", "data": None})
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+class Subscription:
+    __slots__ = ("user_id", "queue", "dropped")
+
+    def __init__(self, user_id: int, max_queue: int) -> None:
+        self.user_id = user_id
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def deliver(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # slow consumer: replace the backlog with one resync marker
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float) -> Optional[bytes]:
+        """
+        Next message, or None after `timeout` seconds (time for a heartbeat).
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class _LocalHub:
+    """
+    Connections held by this process, plus the moon phase ticker.
+    """
+
+    def __init__(self) -> None:
+        self.max_queue = settings.LIVE_QUEUE_SIZE
+        self.max_per_user = settings.LIVE_MAX_CONNECTIONS_PER_USER
+        self._subs: dict[int, set[Subscription]] = {}
+        self._moon_task: Optional[asyncio.Task] = None
+
+    def dispatch(self, user_id: int, message: bytes) -> None:
+        for sub in tuple(self._subs.get(user_id, ())):
+            sub.deliver(message)
+
+    def _add(self, user_id: int) -> tuple[Subscription, bool]:
+        subs = self._subs.setdefault(user_id, set())
+        if len(subs) >= self.max_per_user:
+            raise TooManyConnections(user_id)
+        sub = Subscription(user_id, self.max_queue)
+        subs.add(sub)
+        if self._moon_task is None or self._moon_task.done():
+            self._moon_task = asyncio.create_task(self._moon_ticker(), name="live-moon-ticker")
+        return sub, len(subs) == 1
+
+    def _remove(self, sub: Subscription) -> bool:
+        subs = self._subs.get(sub.user_id)
+        if subs is None:
+            return False
+        subs.discard(sub)
+        if subs:
+            return False
+        del self._subs[sub.user_id]
+        return True
+
+    async def _moon_ticker(self) -> None:
+        """
+        Every worker notices the phase change itself; no cross-worker traffic.
+        """
+        phase = get_moon_phase_info(datetime.utcnow()).phase
+        while self._subs:
+            await asyncio.sleep(60)
+            info = get_moon_phase_info(datetime.utcnow())
+            if info.phase == phase:
+                continue
+            phase = info.phase
+            message = encode_event(
+                "moon",
+                {"phase": info.phase, "themeId": info.theme_id, "energyMultiplier": info.energy_multiplier},
+            )
+            for subs in tuple(self._subs.values()):
+                for sub in tuple(subs):
+                    sub.deliver(message)
+
+    @property
+    def connections(self) -> int:
+        return sum(len(s) for s in self._subs.values())
+
+
+class MemoryLiveHub(_LocalHub):
+    """
+    Single-process hub (one worker, tests).
+    """
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        return self._add(user_id)[0]
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        self._remove(sub)
+
+    async def publish(self, user_id: int, message: bytes) -> None:
+        self.dispatch(user_id, message)
+
+
+class RedisLiveHub(_LocalHub):
+    """
+    One pub/sub connection per worker; channels are (un)subscribed as the
+    first / last local connection of a user comes and goes.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "live:user:") -> None:
+        from redis.asyncio import Redis
+
+        super().__init__()
+        self._redis = Redis.from_url(redis_url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._prefix = prefix
+        self._reader: Optional[asyncio.Task] = None
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        sub, first = self._add(user_id)
+        if first:
+            await self._pubsub.subscribe(f"{self._prefix}{user_id}")
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read(), name="live-redis-reader")
+        return sub
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        if self._remove(sub):
+            await self._pubsub.unsubscribe(f"{self._prefix}{sub.user_id}")
+
+    async def publish(self, user_id: int, message: bytes) -> None:
+        await self._redis.publish(f"{self._prefix}{user_id}", message)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception:
+                logger.exception("Live pub/sub reader failed, retrying")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self.dispatch(int(channel[len(self._prefix):]), message["data"])
+
+
+LiveHub = Union[MemoryLiveHub, RedisLiveHub]
+
+_hub: Optional[LiveHub] = None
+
+
+def get_live_hub() -> LiveHub:
+    global _hub
+    if _hub is None:
+        _hub = RedisLiveHub(settings.REDIS_URL) if settings.LIVE_BACKEND == "redis" else MemoryLiveHub()
+    return _hub
+
+
+def encode_event(event_type: str, data: Any) -> bytes:
+    return orjson.dumps({"type": event_type, "data": data, "ts": time.time()})
+
+
+@job("live.push_user_event")
+async def push_user_event(user_id: int, event_type: str, data: Any) -> None:
+    """
+    Publish a delta to the user's open connections (enqueue after commit).
+    """
+    await get_live_hub().publish(user_id, encode_event(event_type, data))
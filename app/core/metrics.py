@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger("app.metrics")
+
+# Upper bounds (seconds) shared by all latency histograms.
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS: tuple[float, ...] = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+class RequestStats:
+    """
+    Mutable per-request counters filled by the engine hooks.
+    """
+
+    __slots__ = ("statements", "db_time", "pool_wait")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """
+    Minimal Prometheus-style histogram with one series per label tuple.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...], labels: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple[str, ...], value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [bucket counts..., +Inf count, sum]
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[label_values] = series
+            series[idx] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in items:
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter (or, with `set`, a gauge) with one value per label tuple.
+    """
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], kind: str = "counter"):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.kind = kind
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: tuple[str, ...], amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def set(self, label_values: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{base}}} {value}")
+        return lines
+
+
+_ROUTE_LABELS = ("method", "route")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Total request latency.", LATENCY_BUCKETS, _ROUTE_LABELS
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.", STATEMENT_BUCKETS, _ROUTE_LABELS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", LATENCY_BUCKETS, _ROUTE_LABELS
+)
+REQUEST_POOL_WAIT = Histogram(
+    "http_request_pool_wait_seconds", "Time spent waiting for a pooled connection.", LATENCY_BUCKETS, _ROUTE_LABELS
+)
+
+JOB_QUEUE_WAIT = Histogram(
+    "job_queue_wait_seconds", "Time from enqueue to the start of a job attempt.", LATENCY_BUCKETS, ("job",)
+)
+JOB_RUN_TIME = Histogram("job_run_seconds", "Job execution time per attempt.", LATENCY_BUCKETS, ("job",))
+JOB_RESULTS = Counter("job_results_total", "Finished job attempts by outcome.", ("job", "outcome"))
+JOB_QUEUE_DEPTH = Counter("job_queue_depth", "Jobs waiting to run.", ("backend",), kind="gauge")
+
+REGISTRY: list[Histogram | Counter] = [
+    REQUEST_LATENCY,
+    REQUEST_DB_STATEMENTS,
+    REQUEST_DB_TIME,
+    REQUEST_POOL_WAIT,
+    JOB_QUEUE_WAIT,
+    JOB_RUN_TIME,
+    JOB_RESULTS,
+    JOB_QUEUE_DEPTH,
+]
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- SQLAlchemy hooks ---
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that reports how long a checkout waited for a free connection.
+    """
+
+    def _do_get(self):  # type: ignore[override]
+        stats = _current_stats.get()
+        if stats is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats.pool_wait += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context) -> None:
+    # a failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def _redact_parameters(parameters: Any) -> Any:
+    """
+    Keep the shape of bound parameters but never their values.
+    """
+    if isinstance(parameters, dict):
+        return {k: "?" for k in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} rows>"
+        return ["?"] * len(parameters)
+    return "?"
+
+
+def install_engine_hooks(engine: AsyncEngine, slow_query_threshold_ms: float) -> None:
+    """
+    Attach statement timing listeners to the engine.
+    """
+    threshold = slow_query_threshold_ms / 1000
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+
+        if elapsed >= threshold:
+            logger.warning(
+                "Slow query (%.1f ms): %s | params=%s",
+                elapsed * 1000,
+                " ".join(statement.split()),
+                _redact_parameters(parameters),
+            )
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# --- ASGI middleware ---
+
+
+class MetricsMiddleware:
+    """
+    Record latency and DB counters per request.
+
+    Results are exposed as a `Server-Timing` header and as histograms
+    labelled by route template, rendered by `render_metrics`.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f"app;dur={total_ms:.2f}, "
+                    f"db;dur={stats.db_time * 1000:.2f};desc=\"{stats.statements} queries\", "
+                    f"pool;dur={stats.pool_wait * 1000:.2f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_stats.reset(token)
+            route = scope.get("route")
+            labels = (scope.get("method", ""), getattr(route, "path", "<unmatched>"))
+            REQUEST_LATENCY.observe(labels, elapsed)
+            REQUEST_DB_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_TIME.observe(labels, stats.db_time)
+            REQUEST_POOL_WAIT.observe(labels, stats.pool_wait)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import mmap
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Literal, Optional
 
 from .config import settings
 
@@ -49,11 +50,14 @@ def _moon_phase_fraction(dt: datetime) -> float:
     return (days_since_new / synodic_month) % 1.0
 
 
-def get_moon_phase(dt: datetime) -> MoonPhase:
-    """
-    Map fraction to one of the 4 phases.
-    """
-    frac = _moon_phase_fraction(dt)
+PHASES: tuple[MoonPhase, ...] = ("new", "waxing", "full", "waning")
+
+# Precomputed table: one byte (index into PHASES) per UTC hour since TABLE_EPOCH.
+TABLE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_phase_table: Optional[mmap.mmap] = None
+
+
+def _phase_from_fraction(frac: float) -> MoonPhase:
     if frac < 0.125 or frac >= 0.875:
         return "new"
     elif 0.125 <= frac < 0.375:
@@ -64,8 +68,57 @@ def get_moon_phase(dt: datetime) -> MoonPhase:
         return "waning"
 
 
+def build_phase_table(path: str, end_year: int = 2100) -> int:
+    """
+    Write the hourly phase table to `path`; returns number of entries.
+    """
+    hours = int((datetime(end_year, 1, 1, tzinfo=timezone.utc) - TABLE_EPOCH).total_seconds() // 3600)
+    base = TABLE_EPOCH.timestamp()
+    table = bytearray(hours)
+    for h in range(hours):
+        dt = datetime.fromtimestamp(base + h * 3600, tz=timezone.utc)
+        table[h] = PHASES.index(_phase_from_fraction(_moon_phase_fraction(dt)))
+    with open(path, "wb") as f:
+        f.write(table)
+    return hours
+
+
+def load_phase_table(path: str) -> None:
+    """
+    Map the table read-only; workers share the same page-cache pages.
+    """
+    global _phase_table
+    with open(path, "rb") as f:
+        _phase_table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def get_moon_phase(dt: datetime) -> MoonPhase:
+    """
+    Map fraction to one of the 4 phases.
+
+    With a loaded table the phase is resolved to the UTC hour, which is
+    well within the precision of the approximation itself.
+    """
+    if _phase_table is not None:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        idx = int((dt.timestamp() - TABLE_EPOCH.timestamp()) // 3600)
+        if 0 <= idx < len(_phase_table):
+            return PHASES[_phase_table[idx]]
+
+    frac = _moon_phase_fraction(dt)
+    return _phase_from_fraction(frac)
+
+
 def get_moon_phase_info(dt: datetime) -> MoonPhaseInfo:
     phase = get_moon_phase(dt)
     multiplier = settings.MOON_PHASE_MULTIPLIERS.get(phase, 1.0)
     theme_id = settings.MOON_PHASE_THEME_IDS.get(phase, "night_dim")
     return MoonPhaseInfo(phase=phase, energy_multiplier=multiplier, theme_id=theme_id)
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "moon_phases.bin"
+    print(f"Wrote {build_phase_table(target)} hourly entries to {target}")
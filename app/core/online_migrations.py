@@ -0,0 +1,302 @@
+"""
+Helpers for Alembic migrations that touch large tables without long locks.
+
+    from app.core.online_migrations import (
+        add_check_constraint,
+        batched_update,
+        create_index_concurrently,
+        lock_guard,
+    )
+
+    def upgrade() -> None:
+        with lock_guard("2s"):
+            op.add_column("habit", sa.Column("archived", sa.Boolean(), nullable=True))
+        batched_update("habit", "archived = false", "archived IS NULL")
+        create_index_concurrently("ix_habit_archived", "habit", ["archived"])
+
+Dry run (rolls everything back, logs row estimates instead of backfilling):
+
+    alembic -x dry_run=true upgrade head
+
+`batched_update` and the concurrent index helpers commit as they go. Write
+them so they can be re-run: backfills should filter on rows not yet
+updated, and the index helpers use IF [NOT] EXISTS.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+from alembic import context, op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# child of the "alembic" logger configured in alembic.ini
+logger = logging.getLogger("alembic.online")
+
+_TIMEOUT_RE = re.compile(r"^\d+\s*(ms|s|min)?$")
+
+
+def is_dry_run() -> bool:
+    value = context.get_x_argument(as_dictionary=True).get("dry_run", "")
+    return value.lower() in ("1", "true", "yes")
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _quote(dialect, name: str) -> str:
+    return dialect.identifier_preparer.quote(name)
+
+
+def validate_timeout(value: str) -> str:
+    """
+    Postgres SET does not take bind parameters, so only allow plain durations.
+    """
+    if not _TIMEOUT_RE.match(value.strip()):
+        raise ValueError(f"Invalid timeout: {value!r} (expected e.g. '500ms', '5s', '1min')")
+    return value.strip()
+
+
+@contextmanager
+def lock_guard(lock_timeout: str = "3s", statement_timeout: Optional[str] = None) -> Iterator[None]:
+    """
+    Fail fast instead of queueing behind long transactions.
+
+    An ALTER TABLE waiting for its ACCESS EXCLUSIVE lock blocks every query
+    behind it, so it is better to fail and retry the migration later.
+    Uses SET LOCAL: the values stay in effect until the current migration's
+    transaction ends.
+    """
+    op.execute(f"SET LOCAL lock_timeout = '{validate_timeout(lock_timeout)}'")
+    if statement_timeout:
+        op.execute(f"SET LOCAL statement_timeout = '{validate_timeout(statement_timeout)}'")
+    yield
+
+
+@contextmanager
+def _without_session_timeouts(bind: Connection) -> Iterator[None]:
+    """
+    CONCURRENTLY builds wait for every older transaction to finish; a session
+    lock_timeout from env.py would abort them and leave an invalid index.
+    """
+    saved = {
+        name: bind.exec_driver_sql(f"SHOW {name}").scalar() for name in ("lock_timeout", "statement_timeout")
+    }
+    for name in saved:
+        bind.exec_driver_sql(f"SET {name} = 0")
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            bind.exec_driver_sql(f"SET {name} = '{value}'")
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str],
+    *,
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """
+    CREATE INDEX CONCURRENTLY outside the migration transaction.
+
+    An invalid leftover from an interrupted build is dropped first, so
+    re-running the migration builds the index again.
+    """
+    if is_dry_run():
+        logger.info("dry run: would create index %s on %s (%s)", index_name, table_name, ", ".join(columns))
+        return
+
+    def create() -> None:
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            unique=unique,
+            postgresql_where=text(where) if where else None,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    with op.get_context().autocommit_block():
+        if _is_offline():
+            create()
+            return
+        bind = op.get_bind()
+        invalid = bind.execute(
+            text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": index_name},
+        ).scalar()
+        with _without_session_timeouts(bind):
+            if invalid:
+                logger.warning("dropping invalid index %s left by an earlier run", index_name)
+                op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+            started = time.monotonic()
+            create()
+        logger.info("created index %s in %.1fs", index_name, time.monotonic() - started)
+
+
+def drop_index_concurrently(index_name: str, table_name: Optional[str] = None) -> None:
+    if is_dry_run():
+        logger.info("dry run: would drop index %s", index_name)
+        return
+    with op.get_context().autocommit_block():
+        if _is_offline():
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+            return
+        with _without_session_timeouts(op.get_bind()):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def add_check_constraint(table_name: str, constraint_name: str, condition: str) -> None:
+    """
+    Add a CHECK constraint without blocking writes for the validation scan.
+
+    The constraint is added NOT VALID (short ACCESS EXCLUSIVE lock, no scan)
+    and committed; VALIDATE then runs in its own transaction under SHARE
+    UPDATE EXCLUSIVE, which lets reads and writes through. Must run before
+    any step that locks the table for the rest of the migration.
+    """
+    if is_dry_run():
+        logger.info("dry run: would add and validate %s on %s (%s)", constraint_name, table_name, condition)
+        return
+    with op.get_context().autocommit_block():
+        dialect = op.get_context().dialect
+        table, name = _quote(dialect, table_name), _quote(dialect, constraint_name)
+        add = f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID"
+        validate = f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}"
+        if _is_offline():
+            op.execute(add)
+            op.execute(validate)
+            return
+        bind = op.get_bind()
+        exists = bind.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :name AND conrelid = to_regclass(:table)"),
+            {"name": constraint_name, "table": table},
+        ).scalar()
+        if not exists:
+            # the session lock_timeout from env.py still applies here
+            op.execute(add)
+        started = time.monotonic()
+        with _without_session_timeouts(bind):
+            op.execute(validate)
+        logger.info("validated %s in %.1fs", constraint_name, time.monotonic() - started)
+
+
+def estimate_rows(
+    table_name: str,
+    where: str = "TRUE",
+    bind: Optional[Connection] = None,
+    params: Optional[Mapping[str, Any]] = None,
+) -> int:
+    """
+    Planner estimate of matching rows (EXPLAIN, nothing is scanned).
+    """
+    bind = bind or op.get_bind()
+    plan = bind.execute(
+        text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {_quote(bind.dialect, table_name)} WHERE {where}"),
+        dict(params or {}),
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def batched_update(
+    table_name: str,
+    set_clause: str,
+    where: str = "TRUE",
+    *,
+    key: str = "id",
+    batch_size: int = 5000,
+    pause: float = 0.05,
+    params: Optional[Mapping[str, Any]] = None,
+    bind: Optional[Connection] = None,
+) -> int:
+    """
+    Backfill `UPDATE table SET <set_clause> WHERE <where>` in keyset chunks.
+
+    Each chunk covers `batch_size` consecutive `key` values and commits on
+    its own. Row locks are short-lived and autovacuum can keep up.
+    `pause` seconds between chunks leave room for production traffic.
+    Returns the number of rows updated.
+
+    Pass `bind` to run outside Alembic (e.g. against a local database).
+    """
+    if bind is not None:
+        return _run_batches(bind, table_name, set_clause, where, key, batch_size, pause, params, commit=True)
+
+    if _is_offline():
+        # no connection to page through: emit the single-statement form
+        table = _quote(op.get_context().dialect, table_name)
+        op.execute(f"-- batched_update({table_name}) runs in chunks when applied online")
+        op.execute(text(f"UPDATE {table} SET {set_clause} WHERE {where}").bindparams(**(params or {})))
+        return 0
+
+    if is_dry_run():
+        estimate = estimate_rows(table_name, where, params=params)
+        logger.info(
+            "dry run: ~%d rows in %s would be updated in batches of %d (SET %s)",
+            estimate,
+            table_name,
+            batch_size,
+            set_clause,
+        )
+        return estimate
+
+    # the connection is in AUTOCOMMIT inside the block: every chunk commits by itself
+    with op.get_context().autocommit_block():
+        return _run_batches(op.get_bind(), table_name, set_clause, where, key, batch_size, pause, params)
+
+
+def _run_batches(
+    bind: Connection,
+    table_name: str,
+    set_clause: str,
+    where: str,
+    key: str,
+    batch_size: int,
+    pause: float,
+    params: Optional[Mapping[str, Any]],
+    commit: bool = False,
+) -> int:
+    table = _quote(bind.dialect, table_name)
+    col = _quote(bind.dialect, key)
+    params = dict(params or {})
+    estimate = estimate_rows(table_name, where, bind, params)
+    next_start = text(f"SELECT {col} FROM {table} WHERE {col} >= :lo ORDER BY {col} OFFSET :n LIMIT 1")
+    update = f"UPDATE {table} SET {set_clause} WHERE {col} >= :lo AND ({where})"
+
+    lo = bind.execute(text(f"SELECT min({col}) FROM {table}")).scalar()
+    total = 0
+    started = time.monotonic()
+    while lo is not None:
+        hi = bind.execute(next_start, {"lo": lo, "n": batch_size}).scalar()
+        if hi is None:
+            result = bind.execute(text(update), {**params, "lo": lo})
+        else:
+            result = bind.execute(text(f"{update} AND {col} < :hi"), {**params, "lo": lo, "hi": hi})
+        if commit:
+            bind.commit()
+        total += result.rowcount
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0.0
+        eta = (estimate - total) / rate if rate and estimate > total else 0.0
+        logger.info(
+            "%s: %d/~%d rows updated (%.0f rows/s, eta %.0fs)", table_name, total, estimate, rate, eta
+        )
+        lo = hi
+        if lo is not None and pause:
+            time.sleep(pause)
+    return total
@@ -0,0 +1,301 @@
+"""
+Monthly range partitioning for append-only event tables.
+
+A model opts in through its table args::
+
+    __table_args__ = (
+        ...,
+        monthly_partitioning("check_in_date"),
+    )
+
+Partitions are named <table>_pYYYYMM, plus a <table>_default DEFAULT
+partition that catches rows for months not created yet, so inserts never
+fail when maintenance falls behind. Run maintenance monthly (cron, or
+PARTITION_MAINTENANCE_ON_STARTUP for deployments that restart often).
+When it creates a month, rows already in the default partition for that
+month are moved into it. `maintain_partitions` creates the
+next PARTITION_PREMAKE_MONTHS months and detaches partitions older than
+PARTITION_RETENTION_MONTHS[<table>]. Detached partitions go to
+PARTITION_ARCHIVE_SCHEMA, or are dropped when that setting is empty. It
+works on a plain sync Connection, so the same code runs from Alembic,
+from the CLI and from the app (through `AsyncConnection.run_sync`):
+
+    python -m app.core.partitioning             # create + archive
+    python -m app.core.partitioning --dry-run
+
+Queries that bound the partition column (heatmaps, yearly history) are
+pruned to the matching partitions by the planner.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable, Iterator, Optional
+
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_BOUND_RE = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+# pg advisory lock held while one process runs maintenance (every worker tries at startup)
+MAINTENANCE_LOCK_KEY = 0x6D6F6F6E70617274
+# plain DETACH takes ACCESS EXCLUSIVE on the parent; give up rather than queue
+DETACH_LOCK_TIMEOUT = "3s"
+
+
+@dataclass(frozen=True)
+class MonthlyPartitioning:
+    column: str
+
+
+def monthly_partitioning(column: str) -> dict[str, Any]:
+    """
+    Table kwargs for a RANGE-partitioned table split by calendar month.
+    The column must be part of the primary key and every unique constraint.
+    """
+    return {
+        "postgresql_partition_by": f"RANGE ({column})",
+        "info": {"partitioning": MonthlyPartitioning(column)},
+    }
+
+
+def partitioned_tables(metadata: MetaData) -> list[tuple[Table, MonthlyPartitioning]]:
+    return [
+        (table, table.info["partitioning"])
+        for table in metadata.sorted_tables
+        if isinstance(table.info.get("partitioning"), MonthlyPartitioning)
+    ]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_p{month:%Y%m}"
+
+
+def existing_partitions(conn: Connection, table_name: str) -> dict[str, tuple[Optional[date], Optional[date]]]:
+    """
+    Partition name -> (from, to) bounds; None stands for MINVALUE/MAXVALUE.
+    The DEFAULT partition is not included (see `default_partition`).
+    """
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": conn.dialect.identifier_preparer.quote(table_name)},
+    ).all()
+    bounds: dict[str, tuple[Optional[date], Optional[date]]] = {}
+    for name, expr in rows:
+        if expr == "DEFAULT":
+            continue
+        match = _BOUND_RE.search(expr or "")
+        if match:
+            bounds[name] = (date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2)))
+        else:
+            # MINVALUE/MAXVALUE bounds, e.g. the pre-partitioning legacy table
+            upper = re.search(r"TO \('([\d-]+)'\)", expr or "")
+            bounds[name] = (None, date.fromisoformat(upper.group(1)) if upper else None)
+    return bounds
+
+
+def default_partition(conn: Connection, table_name: str) -> Optional[str]:
+    return conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent) AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'"
+        ),
+        {"parent": conn.dialect.identifier_preparer.quote(table_name)},
+    ).scalar()
+
+
+def create_partitions(
+    conn: Connection,
+    table_name: str,
+    start: date,
+    months: int,
+    dry_run: bool = False,
+    column: Optional[str] = None,
+) -> list[str]:
+    """
+    Create monthly partitions [start, start + months), skipping covered months.
+
+    With a DEFAULT partition, its rows for the new month are moved into the
+    new partition in the same statement (`column` is the partition key).
+    """
+    covered = existing_partitions(conn, table_name).values()
+    quote = conn.dialect.identifier_preparer.quote
+    default = default_partition(conn, table_name)
+    if default and column is None:
+        raise ValueError(f"{table_name} has a DEFAULT partition; pass the partition column")
+    created = []
+    month = month_start(start)
+    for _ in range(months):
+        upper = add_months(month, 1)
+        overlaps = any(
+            (lo is None or lo < upper) and (hi is None or hi > month) for lo, hi in covered
+        )
+        if not overlaps:
+            name = partition_name(table_name, month)
+            bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            if dry_run:
+                pass
+            elif default:
+                # one DO block = one transaction, so no row is lost or duplicated
+                in_month = f"{quote(column)} >= '{month.isoformat()}' AND {quote(column)} < '{upper.isoformat()}'"
+                conn.execute(
+                    text(
+                        "DO $$ BEGIN "
+                        f"CREATE TABLE {quote(name)} (LIKE {quote(table_name)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS); "
+                        f"INSERT INTO {quote(name)} SELECT * FROM {quote(default)} WHERE {in_month}; "
+                        f"DELETE FROM {quote(default)} WHERE {in_month}; "
+                        f"ALTER TABLE {quote(table_name)} ATTACH PARTITION {quote(name)} {bounds}; "
+                        "END $$"
+                    )
+                )
+            else:
+                conn.execute(
+                    text(f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(table_name)} {bounds}")
+                )
+            created.append(name)
+        month = upper
+    return created
+
+
+def detach_old_partitions(
+    conn: Connection,
+    table_name: str,
+    keep_months: int,
+    today: date,
+    archive_schema: Optional[str],
+    dry_run: bool = False,
+) -> list[str]:
+    """
+    Detach partitions entirely older than `keep_months` full months.
+
+    Uses DETACH ... CONCURRENTLY when the connection is in autocommit mode
+    (no ACCESS EXCLUSIVE lock on the parent), a plain DETACH otherwise.
+    Postgres refuses CONCURRENTLY on a table with a DEFAULT partition; there
+    an autocommit connection runs the plain DETACH with DETACH_LOCK_TIMEOUT.
+    """
+    cutoff = add_months(month_start(today), -keep_months)
+    quote = conn.dialect.identifier_preparer.quote
+    autocommit = conn.get_isolation_level() == "AUTOCOMMIT"
+    has_default = default_partition(conn, table_name) is not None
+    detached = []
+    for name, (_, upper) in sorted(existing_partitions(conn, table_name).items()):
+        if upper is None or upper > cutoff:
+            continue
+        detached.append(name)
+        if dry_run:
+            continue
+        detach = f"ALTER TABLE {quote(table_name)} DETACH PARTITION {quote(name)}"
+        if autocommit and has_default:
+            # SET LOCAL only lasts for the DO block's own transaction
+            conn.execute(text(f"DO $$ BEGIN SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'; {detach}; END $$"))
+        elif autocommit:
+            conn.execute(text(f"{detach} CONCURRENTLY"))
+        else:
+            conn.execute(text(detach))
+        if archive_schema:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {quote(archive_schema)}"))
+            conn.execute(text(f"ALTER TABLE {quote(name)} SET SCHEMA {quote(archive_schema)}"))
+        else:
+            conn.execute(text(f"DROP TABLE {quote(name)}"))
+    return detached
+
+
+def maintain_partitions(
+    conn: Connection,
+    tables: Optional[Iterable[tuple[Table, MonthlyPartitioning]]] = None,
+    today: Optional[date] = None,
+    dry_run: bool = False,
+) -> None:
+    if tables is None:
+        from app.core.database import Base
+        import app.models  # noqa: F401  (registers the tables)
+
+        tables = partitioned_tables(Base.metadata)
+    today = today or date.today()
+    verb = "would " if dry_run else ""
+    for table, spec in tables:
+        # include the current month in case maintenance fell behind
+        created = create_partitions(
+            conn, table.name, month_start(today), settings.PARTITION_PREMAKE_MONTHS + 1, dry_run, spec.column
+        )
+        if created:
+            logger.info("%s: %screate %s", table.name, verb, ", ".join(created))
+        keep = settings.PARTITION_RETENTION_MONTHS.get(table.name)
+        if keep:
+            archive = settings.PARTITION_ARCHIVE_SCHEMA or None
+            detached = detach_old_partitions(conn, table.name, keep, today, archive, dry_run)
+            if detached:
+                target = f"archive to {archive}" if archive else "drop"
+                logger.info("%s: %s%s %s", table.name, verb, target, ", ".join(detached))
+
+
+@contextmanager
+def maintenance_lock(conn: Connection) -> Iterator[bool]:
+    """
+    Session advisory lock on an autocommit connection. Yields False when
+    another process (e.g. a sibling worker at startup) already holds it.
+    """
+    acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar()
+    try:
+        yield bool(acquired)
+    finally:
+        if acquired:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+
+
+def _maintain_locked(conn: Connection, dry_run: bool = False) -> None:
+    with maintenance_lock(conn) as acquired:
+        if not acquired:
+            logger.info("partition maintenance is running in another process; skipped")
+            return
+        maintain_partitions(conn, dry_run=dry_run)
+
+
+async def maintain_partitions_async() -> None:
+    """
+    Startup hook: same maintenance over the app's async engine. Only one
+    worker runs it; the others skip while it holds the lock.
+    """
+    from app.core.database import get_engine
+
+    async with get_engine().connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.run_sync(_maintain_locked)
+
+
+def main() -> None:
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Create upcoming and archive old monthly partitions")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(settings.SYNC_DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        _maintain_locked(conn, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
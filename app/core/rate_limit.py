@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket shared by coroutines: `acquire()` sleeps until a token is free.
+
+    `pause(seconds)` blocks every caller, e.g. after a 429 with `retry_after`.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._blocked_until
+
+
+class PerKeyInterval:
+    """
+    Enforce a minimum interval between events for the same key (e.g. chat id).
+    """
+
+    def __init__(self, interval: float, max_keys: int = 100_000) -> None:
+        self.interval = interval
+        self.max_keys = max_keys
+        self._last: dict[int | str, float] = {}
+
+    async def wait(self, key: int | str) -> None:
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < self.interval:
+            await asyncio.sleep(self.interval - (now - last))
+            now = time.monotonic()
+        if len(self._last) >= self.max_keys:
+            # dicts keep insertion order; drop the oldest half
+            for stale in list(self._last)[: self.max_keys // 2]:
+                del self._last[stale]
+        self._last.pop(key, None)
+        self._last[key] = now
+
+
+class MemoryGCRALimiter:
+    """
+    Generic cell rate algorithm (token bucket with one timestamp of state per key).
+
+    `hit` admits up to `limit` events per `period` seconds with bursts of up
+    to `burst` and returns (allowed, retry_after_seconds).
+    """
+
+    def __init__(self, max_keys: int = 200_000) -> None:
+        self.max_keys = max_keys
+        self._tat: dict[str, float] = {}  # theoretical arrival time per key
+
+    async def hit(self, key: str, limit: int, period: float, burst: int | None = None) -> tuple[bool, float]:
+        now = time.monotonic()
+        interval = period / limit
+        burst = burst or limit
+        tat = max(self._tat.get(key, now), now)
+        allow_at = tat + interval - burst * interval
+        if now < allow_at:
+            return False, allow_at - now
+        if len(self._tat) >= self.max_keys:
+            self._evict(now)
+        self._tat[key] = tat + interval
+        return True, 0.0
+
+    def _evict(self, now: float) -> None:
+        # keys whose TAT is in the past are back to a full bucket
+        for key in [k for k, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+        if len(self._tat) >= self.max_keys:
+            for key in list(self._tat)[: self.max_keys // 2]:
+                del self._tat[key]
+
+
+_GCRA_LUA = """
+local key = KEYS[1]
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', key) or now)
+if tat < now then tat = now end
+local allow_at = tat + interval - burst * interval
+if now < allow_at then
+  return {0, tostring(allow_at - now)}
+end
+local new_tat = tat + interval
+redis.call('SET', key, tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1)
+return {1, '0'}
+"""
+
+
+class RedisGCRALimiter:
+    """
+    Same algorithm evaluated atomically in Redis, shared by all workers.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "rl:") -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(redis_url)
+        self._script = self._redis.register_script(_GCRA_LUA)
+        self._prefix = prefix
+
+    async def hit(self, key: str, limit: int, period: float, burst: int | None = None) -> tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[self._prefix + key],
+            args=[period / limit, burst or limit],
+        )
+        return bool(allowed), float(retry_after)
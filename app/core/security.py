@@ -84,12 +84,10 @@ def create_access_token(
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str,
-    db: AsyncSession = Depends(get_db),
-) -> User:
+def decode_access_token(token: str) -> int:
     """
-    Dependency: get current user from JWT token (Authorization: Bearer <token>).
+    Return the user id from a valid access token, or raise 401.
+    Does not touch the database.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -104,12 +102,25 @@ async def get_current_user(
         sub: str | None = payload.get("sub")
         if sub is None:
             raise credentials_exception
-        user_id = int(sub)
+        return int(sub)
     except (JWTError, ValueError):
         raise credentials_exception
 
+
+async def get_current_user(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Dependency: get current user from JWT token (Authorization: Bearer <token>).
+    """
+    user_id = decode_access_token(token)
+
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
     return user
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def adapter_response(
+    adapter: TypeAdapter[Any],
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    Serialize already validated `content` with a precompiled adapter.
+
+    Returning a ready `Response` skips FastAPI's `response_model` re-validation
+    and the `jsonable_encoder` pass; the route's `response_model` is still used
+    for the OpenAPI schema.
+    """
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Iterator
+
+MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, level: int) -> None:
+        self.key = key
+        self.next: list[_Node | None] = [None] * level
+        self.width: list[int] = [1] * level
+
+
+class IndexableSkipList:
+    """
+    Sorted set of unique, comparable keys with O(log n) insert, remove and rank.
+
+    Each forward link stores how many elements it skips, so positions can be
+    computed while searching (Hettinger's indexable skiplist).
+    """
+
+    def __init__(self) -> None:
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key: Any) -> None:
+        chain: list[_Node] = [self._head] * MAX_LEVEL
+        steps_at_level = [0] * MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                steps_at_level[level] += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            chain[level] = node
+
+        d = self._random_level()
+        if d > self._level:
+            for level in range(self._level, d):
+                # head links on new levels span the whole list so far
+                self._head.width[level] = self._size + 1
+            self._level = d
+
+        new = _Node(key, d)
+        steps = 0
+        for level in range(d):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(d, self._level):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        chain: list[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                node = nxt
+                nxt = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        d = len(target.next)
+        for level in range(d):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(d, self._level):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def index(self, key: Any) -> int:
+        """
+        0-based position of `key`.
+        """
+        node = self._head
+        pos = 0
+        for level in range(self._level - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        return pos
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        node = self._head
+        remaining = i + 1
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]  # type: ignore[assignment]
+        return node.key
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    def islice(self, start: int, stop: int) -> list[Any]:
+        if start >= min(stop, self._size):
+            return []
+        out = []
+        node: _Node | None = self._head
+        # walk to the node just before `start`, then follow level 0
+        remaining = start
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= remaining:  # type: ignore[union-attr]
+                remaining -= node.width[level]  # type: ignore[union-attr]
+                node = node.next[level]  # type: ignore[union-attr]
+        node = node.next[0]  # type: ignore[union-attr]
+        for _ in range(start, min(stop, self._size)):
+            out.append(node.key)  # type: ignore[union-attr]
+            node = node.next[0]  # type: ignore[union-attr]
+        return out
@@ -1,5 +1,7 @@
 from .user import User  # noqa: F401
 from .habit import Habit, HabitFrequencyType, HabitKind  # noqa: F401
+from .habit_checkin import HabitCheckIn  # noqa: F401
 from .plant import Plant  # noqa: F401
 from .artifact import ArtifactDefinition, ArtifactRarity, UserArtifact  # noqa: F401
 from .lunar_energy import LunarEnergyAccount  # noqa: F401
+from .user_summary import UserSummary  # noqa: F401
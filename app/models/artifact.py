@@ -32,7 +32,7 @@ class ArtifactDefinition(Base):
 
     __tablename__ = "artifactdefinition"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     code = Column(String(64), unique=True, index=True, nullable=False)
     name = Column(String(128), nullable=False)
     description = Column(Text, nullable=True)
@@ -53,7 +53,7 @@ class UserArtifact(Base):
     __tablename__ = "userartifact"
     __table_args__ = (UniqueConstraint("user_id", "artifact_definition_id", name="uq_user_artifact_single"),)
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), index=True, nullable=False)
     artifact_definition_id = Column(
         Integer,
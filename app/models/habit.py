@@ -4,6 +4,7 @@ from datetime import date, datetime
 from enum import Enum
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     Date,
@@ -34,7 +35,7 @@ class HabitKind(str, Enum):
 class Habit(Base):
     __tablename__ = "habit"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), index=True, nullable=False)
 
     name = Column(String(128), nullable=False)
@@ -53,9 +54,12 @@ class Habit(Base):
         nullable=False,
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
+        index=True,
     )
 
     is_active = Column(Boolean, nullable=False, default=True)
+    # user's data_version at the last change of this row
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # frequency logic
     frequency_type = Column(SAEnum(HabitFrequencyType, name="habit_frequency_type_enum"), nullable=False)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer
+
+from app.core.database import Base
+from app.core.partitioning import monthly_partitioning
+
+
+class HabitCheckIn(Base):
+    """
+    One row per habit and day it was checked in (history for heatmaps / streak repair).
+    """
+
+    __tablename__ = "habitcheckin"
+    __table_args__ = (
+        Index("ix_habitcheckin_user_date", "user_id", "check_in_date"),
+        monthly_partitioning("check_in_date"),
+    )
+
+    habit_id = Column(Integer, ForeignKey("habit.id", ondelete="CASCADE"), primary_key=True)
+    check_in_date = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -11,7 +11,7 @@ from app.core.database import Base
 class LunarEnergyAccount(Base):
     __tablename__ = "lunarenergyaccount"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), unique=True, nullable=False)
 
     balance = Column(Integer, nullable=False, default=0)
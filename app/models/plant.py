@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -15,7 +15,7 @@ class Plant(Base):
 
     __tablename__ = "plant"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), index=True, nullable=False)
     habit_id = Column(Integer, ForeignKey("habit.id", ondelete="CASCADE"), unique=True, nullable=False)
 
@@ -28,6 +28,9 @@ class Plant(Base):
     growth_points = Column(Integer, nullable=False, default=0)
     is_wilted = Column(Boolean, nullable=False, default=False)
 
+    # user's data_version at the last change of this row
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     last_grown_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
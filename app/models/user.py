@@ -11,12 +11,14 @@ from app.core.database import Base
 class User(Base):
     __tablename__ = "user"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     telegram_id = Column(BigInteger, unique=True, index=True, nullable=False)
     username = Column(String(64), nullable=True)
     first_name = Column(String(128), nullable=True)
     last_name = Column(String(128), nullable=True)  
     timezone = Column(String(64), nullable=False, default="UTC")
+    # bumped by every habit / plant / artifact change (ETags, ?since= deltas)
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import Base
+
+
+class UserSummary(Base):
+    """
+    Denormalized per-user counters for profile / garden headers.
+
+    Kept in step by the services in the same transaction as the change
+    (see app.services.summary_service); `reconcile_summaries` repairs drift.
+    """
+
+    __tablename__ = "user_summary"
+
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+
+    active_habits = Column(Integer, nullable=False, default=0)
+    plant_stages = Column(JSONB, nullable=False, default=dict)  # {"<stage>": count}
+    artifact_count = Column(Integer, nullable=False, default=0)
+    energy_balance = Column(Integer, nullable=False, default=0)
+    best_streak = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -0,0 +1,95 @@
+"""
+Column-only read views of habit / plant / artifact rows for the pure game
+logic (growth gain, growth stage, check-in expectation, drop weights).
+
+A view is a NamedTuple built straight from a result row. It has no
+instance state, no identity-map entry and no per-attribute
+instrumentation, and it only holds the columns the rules read.
+`stream_views` yields them in fixed-size partitions from a server-side
+cursor, so a caller that handles one partition at a time holds at most
+`batch_size` rows:
+
+    async for habits in stream_views(db, HabitView, Habit.is_active == True):
+        for habit in habits:
+            ...
+
+The game-logic functions accept either the ORM instance or its view. The
+request paths keep ORM instances (they mutate and commit them); the
+existing batch jobs work in SQL (growth stages, summaries, leaderboards)
+or need joined columns (reminders), so for now only
+benchmarks/bench_domain_views.py streams views.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import AsyncIterator, NamedTuple, Optional, TypeVar, Union
+
+from sqlalchemy import ColumnElement, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .artifact import ArtifactDefinition, ArtifactRarity
+from .habit import Habit, HabitFrequencyType, HabitKind
+from .plant import Plant
+
+
+class HabitView(NamedTuple):
+    id: int
+    user_id: int
+    kind: HabitKind
+    frequency_type: HabitFrequencyType
+    frequency_value: Optional[int]
+    last_check_in_date: Optional[date]
+    current_streak: int
+    longest_streak: int
+
+
+class PlantView(NamedTuple):
+    id: int
+    user_id: int
+    habit_id: int
+    species: str
+    growth_points: int
+    growth_stage: int
+    is_wilted: bool
+
+
+class ArtifactDefinitionView(NamedTuple):
+    id: int
+    rarity: ArtifactRarity
+    preferred_phase: Optional[str]
+
+
+View = Union[HabitView, PlantView, ArtifactDefinitionView]
+V = TypeVar("V", HabitView, PlantView, ArtifactDefinitionView)
+
+_SOURCES = {
+    HabitView: Habit,
+    PlantView: Plant,
+    ArtifactDefinitionView: ArtifactDefinition,
+}
+
+
+def view_select(view: type[View]) -> Select:
+    """
+    SELECT of exactly the view's columns, in field order.
+    """
+    model = _SOURCES[view]
+    return select(*(getattr(model, name) for name in view._fields))
+
+
+async def stream_views(
+    db: AsyncSession,
+    view: type[V],
+    *where: ColumnElement[bool],
+    batch_size: int = 10_000,
+) -> AsyncIterator[list[V]]:
+    """
+    Server-side cursor over the view's columns, yielding lists of at most
+    `batch_size` views ordered by primary key.
+    """
+    model = _SOURCES[view]
+    stmt = view_select(view).where(*where).order_by(model.id).execution_options(yield_per=batch_size)
+    result = await db.stream(stmt)
+    make = view._make
+    async for rows in result.partitions():
+        yield [make(row) for row in rows]
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
 
 from app.models.artifact import ArtifactRarity
 
@@ -20,6 +21,18 @@ class ArtifactDefinitionOut(BaseModel):
         from_attributes = True
 
 
+ArtifactDefinitionList = TypeAdapter(list[ArtifactDefinitionOut])
+
+
+class ArtifactCatalogOut(BaseModel):
+    """
+    Shape of the `/artifacts/catalog` bundle (served pre-serialized).
+    """
+
+    hash: str
+    definitions: list[ArtifactDefinitionOut]
+
+
 class UserArtifactOut(BaseModel):
     id: int
     artifact_definition: ArtifactDefinitionOut
@@ -30,6 +43,32 @@ class UserArtifactOut(BaseModel):
         from_attributes = True
 
 
+UserArtifactOutList = TypeAdapter(list[UserArtifactOut])
+
+
+class UserArtifactRefOut(BaseModel):
+    id: int
+    artifact_definition_id: int
+    acquired_at: datetime
+    is_equipped: bool
+
+    class Config:
+        from_attributes = True
+
+
+class UserArtifactCompactOut(TypedDict):
+    """
+    Inventory with definition ids only; `catalog` is the hash of the
+    catalog bundle that resolves them.
+    """
+
+    catalog: str
+    items: list[UserArtifactRefOut]
+
+
+UserArtifactCompactAdapter = TypeAdapter(UserArtifactCompactOut)
+
+
 class ArtifactDiscoverResponse(BaseModel):
     acquired: bool
     artifact: Optional[ArtifactDefinitionOut]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.schemas.plant import PlantOut
+
+
+class MoonStateOut(TypedDict):
+    phase: str
+    themeId: str
+    energyMultiplier: float
+
+
+class GardenStateOut(TypedDict):
+    version: int
+    plants: list[PlantOut]
+    activeHabits: int
+    moon: MoonStateOut
+
+
+class GardenDeltaOut(GardenStateOut):
+    """
+    `?since=` answer: `plants` holds only the plants changed after `since`;
+    `plantIds` lists every current plant, so clients can drop removed ones.
+    """
+
+    plantIds: list[int]
+
+
+GardenStateAdapter = TypeAdapter(GardenStateOut)
+GardenDeltaAdapter = TypeAdapter(GardenDeltaOut)
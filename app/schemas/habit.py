@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 from app.models.habit import HabitFrequencyType, HabitKind
 
@@ -56,6 +57,24 @@ class HabitOut(HabitBase):
         from_attributes = True
 
 
+# Compiled once; validates ORM rows and serializes straight to JSON bytes.
+HabitOutList = TypeAdapter(list[HabitOut])
+
+
+class HabitDeltaOut(TypedDict):
+    """
+    `?since=` answer: habits changed after `since` plus the ids of all
+    current habits (anything else was deleted).
+    """
+
+    version: int
+    habits: list[HabitOut]
+    ids: list[int]
+
+
+HabitDeltaAdapter = TypeAdapter(HabitDeltaOut)
+
+
 class HabitCheckInResponse(BaseModel):
     habit_id: int
     current_streak: int
@@ -63,3 +82,14 @@ class HabitCheckInResponse(BaseModel):
     plant_growth_stage: int
     plant_growth_points: int
     is_wilted: bool
+
+
+class HeatmapOut(BaseModel):
+    year: int
+    days: dict[date, int]
+
+
+class HabitHistoryOut(BaseModel):
+    habit_id: int
+    year: int
+    dates: list[date]
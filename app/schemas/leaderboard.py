@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    score: float
+
+
+class LeaderboardOut(BaseModel):
+    board: Literal["longest_streak", "artifacts"]
+    top: list[LeaderboardEntryOut]
+    me: Optional[LeaderboardEntryOut] = None
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class PlantOut(BaseModel):
@@ -19,3 +19,6 @@ class PlantOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+PlantOutList = TypeAdapter(list[PlantOut])
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class UserSummaryOut(BaseModel):
+    active_habits: int
+    plant_stages: dict[int, int]  # growth stage -> number of plants
+    artifact_count: int
+    energy_balance: int
+    best_streak: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
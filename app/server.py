@@ -0,0 +1,51 @@
+"""
+Production launcher: N uvicorn worker processes on uvloop + httptools.
+
+    python -m app.server                # workers = usable CPU cores
+    python -m app.server --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+    try:
+        # respects CPU affinity / container cpusets
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API with multiple workers.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--host", default=settings.APP_HOST)
+    parser.add_argument("--port", type=int, default=settings.APP_PORT)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers or default_workers(),
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=False,
+        proxy_headers=True,
+        # SIGTERM: stop accepting, let in-flight requests finish, then run lifespan shutdown
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
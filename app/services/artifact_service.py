@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+import hashlib
 import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Sequence
+from functools import cached_property
+from itertools import accumulate
+from typing import Optional, Sequence
 
+import orjson
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.core.moon_phases import get_moon_phase
+from app.core.config import settings
+from app.core.jobs import enqueue
+from app.core.live import push_user_event
+from app.core.moon_phases import PHASES, get_moon_phase
+from app.core.rate_limit import MemoryGCRALimiter, RedisGCRALimiter
 from app.models.artifact import ArtifactDefinition, ArtifactRarity, UserArtifact
-from app.schemas.artifact import ArtifactDefinitionOut, ArtifactDiscoverResponse
+from app.models.views import ArtifactDefinitionView
+from app.schemas.artifact import ArtifactDefinitionList, ArtifactDefinitionOut, ArtifactDiscoverResponse
+from app.services.leaderboard_service import record_artifact_acquired
+from app.services.summary_service import apply_summary_delta
+from app.services.version_service import bump_user_version
 
 
 RARITY_BASE_WEIGHTS = {
@@ -20,7 +35,10 @@ RARITY_BASE_WEIGHTS = {
 }
 
 
-def _get_phase_weight_multiplier(phase: str, artifact: ArtifactDefinition) -> float:
+def _get_phase_weight_multiplier(
+    phase: str,
+    artifact: ArtifactDefinition | ArtifactDefinitionOut | ArtifactDefinitionView,
+) -> float:
     mul = 1.0
     if artifact.preferred_phase and artifact.preferred_phase == phase:
         mul *= 2.0
@@ -31,10 +49,125 @@ def _get_phase_weight_multiplier(phase: str, artifact: ArtifactDefinition) -> fl
     return mul
 
 
-async def get_user_artifacts(db: AsyncSession, user_id: int) -> Sequence[UserArtifact]:
-    result = await db.execute(
-        select(UserArtifact).where(UserArtifact.user_id == user_id).order_by(UserArtifact.acquired_at)
+@dataclass(frozen=True)
+class CatalogBundle:
+    """
+    The catalog as served to clients: JSON bytes and their content hash.
+    """
+
+    hash: str
+    body: bytes
+
+
+@dataclass(frozen=True)
+class ArtifactCatalog:
+    """
+    Immutable snapshot of all artifact definitions with draw weights
+    precomputed per moon phase.
+    """
+
+    definitions: tuple[ArtifactDefinitionOut, ...]
+    cum_weights: dict[str, tuple[float, ...]]
+    loaded_at: float
+
+    def draw(self, phase: str) -> ArtifactDefinitionOut:
+        return random.choices(self.definitions, cum_weights=self.cum_weights[phase], k=1)[0]
+
+    @cached_property
+    def bundle(self) -> CatalogBundle:
+        """
+        Serialized once per snapshot; the hash only changes with the content,
+        so a TTL reload of unchanged definitions keeps every client cache.
+        """
+        definitions = ArtifactDefinitionList.dump_json(list(self.definitions))
+        content_hash = hashlib.blake2b(definitions, digest_size=8).hexdigest()
+        body = orjson.dumps({"hash": content_hash, "definitions": orjson.Fragment(definitions)})
+        return CatalogBundle(content_hash, body)
+
+
+_catalog: Optional[ArtifactCatalog] = None
+
+
+def build_artifact_catalog(definitions: Sequence[ArtifactDefinitionOut]) -> ArtifactCatalog:
+    cum_weights = {
+        phase: tuple(
+            accumulate(
+                RARITY_BASE_WEIGHTS.get(d.rarity, 1) * _get_phase_weight_multiplier(phase, d)
+                for d in definitions
+            )
+        )
+        for phase in PHASES
+    }
+    return ArtifactCatalog(tuple(definitions), cum_weights, time.monotonic())
+
+
+async def load_artifact_catalog(db: AsyncSession) -> ArtifactCatalog:
+    global _catalog
+    result = await db.execute(select(ArtifactDefinition).order_by(ArtifactDefinition.id))
+    _catalog = build_artifact_catalog(
+        [ArtifactDefinitionOut.model_validate(d) for d in result.scalars().all()]
     )
+    return _catalog
+
+
+async def get_artifact_catalog(db: AsyncSession) -> ArtifactCatalog:
+    """
+    Per-process catalog cache, warmed in the app lifespan and refreshed after
+    ARTIFACT_CATALOG_TTL_SECONDS so new definitions show up without a restart.
+    """
+    if _catalog is None or time.monotonic() - _catalog.loaded_at > settings.ARTIFACT_CATALOG_TTL_SECONDS:
+        return await load_artifact_catalog(db)
+    return _catalog
+
+
+def invalidate_artifact_catalog() -> None:
+    global _catalog
+    _catalog = None
+
+
+_discovery_limiter: MemoryGCRALimiter | RedisGCRALimiter | None = None
+
+
+def get_discovery_limiter() -> MemoryGCRALimiter | RedisGCRALimiter:
+    global _discovery_limiter
+    if _discovery_limiter is None:
+        if settings.DISCOVERY_RATE_LIMIT_BACKEND == "redis":
+            _discovery_limiter = RedisGCRALimiter(settings.REDIS_URL, prefix="rl:discover:")
+        else:
+            _discovery_limiter = MemoryGCRALimiter()
+    return _discovery_limiter
+
+
+async def check_discovery_quota(user_id: int, now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Spend one discovery from the user's quota for the current moon phase.
+
+    Returns None when allowed, otherwise seconds until the next attempt.
+    Pure in-memory / Redis work, so rejected calls never reach the database.
+    """
+    phase = get_moon_phase(now or datetime.utcnow())
+    quota = settings.DISCOVERY_QUOTAS.get(phase, 0)
+    if quota <= 0:
+        return float(settings.DISCOVERY_WINDOW_SECONDS)
+    allowed, retry_after = await get_discovery_limiter().hit(
+        str(user_id), quota, settings.DISCOVERY_WINDOW_SECONDS
+    )
+    return None if allowed else retry_after
+
+
+async def get_user_artifacts(
+    db: AsyncSession,
+    user_id: int,
+    with_definitions: bool = True,
+) -> Sequence[UserArtifact]:
+    """
+    Inventory rows; without definitions no artifactdefinition row is read
+    (compact responses resolve ids through the catalog bundle).
+    """
+    stmt = select(UserArtifact).where(UserArtifact.user_id == user_id).order_by(UserArtifact.acquired_at)
+    if with_definitions:
+        stmt = stmt.options(selectinload(UserArtifact.artifact_definition))
+    result = await db.execute(stmt)
     return result.scalars().all()
 
 
@@ -42,9 +175,8 @@ async def discover_artifact(
     db: AsyncSession,
     user_id: int,
 ) -> ArtifactDiscoverResponse:
-    result = await db.execute(select(ArtifactDefinition))
-    all_defs = result.scalars().all()
-    if not all_defs:
+    catalog = await get_artifact_catalog(db)
+    if not catalog.definitions:
         return ArtifactDiscoverResponse(
             acquired=False,
             artifact=None,
@@ -54,13 +186,7 @@ async def discover_artifact(
     now = datetime.utcnow()
     phase = get_moon_phase(now)
 
-    weights = []
-    for d in all_defs:
-        base = RARITY_BASE_WEIGHTS.get(d.rarity, 1)
-        w = base * _get_phase_weight_multiplier(phase, d)
-        weights.append(w)
-
-    chosen = random.choices(all_defs, weights=weights, k=1)[0]
+    chosen = catalog.draw(phase)
 
     result = await db.execute(
         select(UserArtifact).where(
@@ -72,18 +198,21 @@ async def discover_artifact(
     if existing:
         return ArtifactDiscoverResponse(
             acquired=False,
-            artifact=ArtifactDefinitionOut.model_validate(chosen),
+            artifact=chosen,
             reason="Already owned.",
         )
 
     ua = UserArtifact(user_id=user_id, artifact_definition_id=chosen.id)
     db.add(ua)
+    await apply_summary_delta(db, user_id, artifacts=1)
+    await bump_user_version(db, user_id)
     await db.commit()
     await db.refresh(ua)
-    await db.refresh(chosen)
+    await enqueue(record_artifact_acquired, user_id)
+    await enqueue(push_user_event, user_id, "artifact", chosen.model_dump(mode="json"))
 
     return ArtifactDiscoverResponse(
         acquired=True,
-        artifact=ArtifactDefinitionOut.model_validate(chosen),
+        artifact=chosen,
         reason="New artifact discovered!",
     )
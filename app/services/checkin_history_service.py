@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import case, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import enqueue
+from app.models.habit import Habit, HabitFrequencyType
+from app.models.habit_checkin import HabitCheckIn
+from app.services.leaderboard_service import record_streak
+from app.services.summary_service import apply_summary_delta
+from app.services.version_service import bump_user_version
+
+
+def allowed_gap_days(frequency_type: HabitFrequencyType, frequency_value: Optional[int]) -> int:
+    """
+    Largest gap between two check-ins that keeps a streak alive
+    (mirrors the reset rules in `check_in_habit`).
+    """
+    if frequency_type == HabitFrequencyType.WEEKLY:
+        return 7
+    if frequency_type == HabitFrequencyType.CUSTOM_DAYS and frequency_value:
+        return frequency_value
+    if frequency_type == HabitFrequencyType.CUSTOM_WEEKS and frequency_value:
+        return frequency_value * 7
+    return 1
+
+
+async def record_check_in(db: AsyncSession, habit: Habit, day: date) -> None:
+    """
+    Add the day to the history; repeated check-ins on one day are ignored.
+    Runs inside the caller's transaction.
+    """
+    await db.execute(
+        insert(HabitCheckIn)
+        .values(habit_id=habit.id, user_id=habit.user_id, check_in_date=day)
+        .on_conflict_do_nothing(index_elements=["habit_id", "check_in_date"])
+    )
+
+
+async def get_user_heatmap(db: AsyncSession, user_id: int, year: int) -> dict[date, int]:
+    """
+    Number of habits checked in per day of `year`, for the calendar heatmap.
+    """
+    result = await db.execute(
+        select(HabitCheckIn.check_in_date, func.count())
+        .where(
+            HabitCheckIn.user_id == user_id,
+            HabitCheckIn.check_in_date >= date(year, 1, 1),
+            HabitCheckIn.check_in_date <= date(year, 12, 31),
+        )
+        .group_by(HabitCheckIn.check_in_date)
+        .order_by(HabitCheckIn.check_in_date)
+    )
+    return {day: count for day, count in result.all()}
+
+
+async def get_habit_history(db: AsyncSession, habit_id: int, year: int) -> list[date]:
+    result = await db.execute(
+        select(HabitCheckIn.check_in_date)
+        .where(
+            HabitCheckIn.habit_id == habit_id,
+            HabitCheckIn.check_in_date >= date(year, 1, 1),
+            HabitCheckIn.check_in_date <= date(year, 12, 31),
+        )
+        .order_by(HabitCheckIn.check_in_date)
+    )
+    return list(result.scalars().all())
+
+
+async def compute_streaks(db: AsyncSession, habit: Habit, today: date) -> tuple[int, int, int]:
+    """
+    (current_streak, longest_streak, current island number) from the
+    history in one query.
+
+    Gaps-and-islands: a new island starts whenever the gap to the previous
+    check-in exceeds the habit's allowed interval; island sizes are streaks.
+    The creation-time `initial_days_offset` extends the first island.
+    """
+    gap = allowed_gap_days(habit.frequency_type, habit.frequency_value)
+    prev_day = func.lag(HabitCheckIn.check_in_date).over(order_by=HabitCheckIn.check_in_date)
+    breaks = (
+        select(
+            HabitCheckIn.check_in_date.label("day"),
+            case((HabitCheckIn.check_in_date - prev_day <= gap, 0), else_=1).label("brk"),
+        )
+        .where(HabitCheckIn.habit_id == habit.id)
+        .subquery()
+    )
+    islands = select(
+        breaks.c.day,
+        func.sum(breaks.c.brk).over(order_by=breaks.c.day).label("island"),
+    ).subquery()
+    result = await db.execute(
+        select(islands.c.island, func.count(), func.max(islands.c.day))
+        .group_by(islands.c.island)
+        .order_by(islands.c.island)
+    )
+
+    current = longest = current_island = 0
+    last_day: Optional[date] = None
+    for island, length, island_end in result.all():
+        if island == 1:
+            length += habit.initial_days_offset or 0
+        longest = max(longest, length)
+        current, current_island, last_day = length, island, island_end
+
+    if last_day is None or (today - last_day) > timedelta(days=gap):
+        current = 0
+    return current, longest, current_island
+
+
+async def _log_covers_habit(db: AsyncSession, habit: Habit) -> bool:
+    """
+    Whether the log already had rows when the habit was created. Pruned to
+    the partitions up to that day and stops at the first row found.
+    """
+    created = habit.created_at.date()
+    return bool(await db.scalar(select(exists().where(HabitCheckIn.check_in_date <= created))))
+
+
+async def recompute_streaks(db: AsyncSession, habit: Habit, today: date) -> Habit:
+    """
+    Repair drifted streak counters from the check-in history.
+
+    The log only has check-ins since it was introduced, so the stored
+    longest streak is never lowered. A current run is trusted when it
+    started after a break recorded in the log, or when the log predates the
+    habit; otherwise it may have begun before the log and the stored value
+    is kept.
+    """
+    current, longest, island = await compute_streaks(db, habit, today)
+    if current and island == 1 and not await _log_covers_habit(db, habit):
+        current = habit.current_streak
+    habit.current_streak = current
+    habit.longest_streak = max(habit.longest_streak, longest, current)
+    habit.version = await bump_user_version(db, habit.user_id)
+    await apply_summary_delta(db, habit.user_id, best_streak=habit.longest_streak)
+    await db.commit()
+    await db.refresh(habit)
+    await enqueue(record_streak, habit.user_id, habit.longest_streak)
+    return habit
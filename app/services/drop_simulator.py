@@ -0,0 +1,265 @@
+"""
+Offline Monte Carlo simulation of artifact drops.
+
+Uses the same catalog weights as `discover_artifact` (RARITY_BASE_WEIGHTS x
+_get_phase_weight_multiplier) and reports, per moon phase and for a full
+lunar cycle: drop rates by rarity, duplicate share (draws rejected by
+uq_user_artifact_single) and draws needed to complete the collection.
+It also times the production sampler (`ArtifactCatalog.draw`).
+
+Requires NumPy (not needed by the API itself): pip install numpy
+
+    python -m app.services.drop_simulator --synthetic 40 --users 20000
+    python -m app.services.drop_simulator --catalog artifacts.json --draws 5000000
+    python -m app.services.drop_simulator --from-db
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Sequence
+
+from app.core.moon_phases import PHASES, _phase_from_fraction
+from app.models.artifact import ArtifactRarity
+from app.schemas.artifact import ArtifactDefinitionOut
+from app.services.artifact_service import ArtifactCatalog, build_artifact_catalog
+
+SYNODIC_MONTH_DAYS = 29.53058867
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise SystemExit("The drop simulator needs NumPy: pip install numpy") from exc
+    return np
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> list[ArtifactDefinitionOut]:
+    import random
+
+    rng = random.Random(seed)
+    rarities = [ArtifactRarity.COMMON] * 60 + [ArtifactRarity.RARE] * 25 + [ArtifactRarity.EPIC] * 10 + [
+        ArtifactRarity.LEGENDARY
+    ] * 5
+    return [
+        ArtifactDefinitionOut(
+            id=i + 1,
+            code=f"artifact_{i + 1}",
+            name=f"Artifact {i + 1}",
+            description=None,
+            rarity=rng.choice(rarities),
+            preferred_phase=rng.choice([None, None, *PHASES]),
+        )
+        for i in range(size)
+    ]
+
+
+def _probabilities(catalog: ArtifactCatalog) -> dict[str, Any]:
+    np = _numpy()
+    probs = {}
+    for phase in PHASES:
+        cum = np.asarray(catalog.cum_weights[phase], dtype=np.float64)
+        weights = np.diff(cum, prepend=0.0)
+        probs[phase] = weights / weights.sum()
+    return probs
+
+
+def _cycle_phase_schedule(days: int, draws_per_day: int) -> list[int]:
+    """
+    Phase index for each draw when discovering `draws_per_day` times a day
+    through consecutive lunar cycles (same quarter split as get_moon_phase).
+    """
+    return [
+        PHASES.index(_phase_from_fraction(((draw // draws_per_day) / SYNODIC_MONTH_DAYS) % 1.0))
+        for draw in range(days * draws_per_day)
+    ]
+
+
+def _completion_worker(
+    prob_matrix: Any,
+    schedule: Optional[Sequence[int]],
+    users: int,
+    max_draws: int,
+    seed: int,
+) -> tuple[list[int], int]:
+    """
+    Simulate `users` collectors in lockstep until each owns every artifact.
+
+    Returns (draws needed per finished user, duplicate draws). `prob_matrix`
+    has one row per phase; `schedule` maps draw number -> phase row (None
+    means row 0 for every draw).
+    """
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    n_items = prob_matrix.shape[1]
+    cdfs = np.cumsum(prob_matrix, axis=1)
+    owned = np.zeros((users, n_items), dtype=bool)
+    owned_count = np.zeros(users, dtype=np.int64)
+    active = np.arange(users)
+    finished: list[int] = []
+    duplicates = 0
+
+    for draw in range(max_draws):
+        if active.size == 0:
+            break
+        row = 0 if schedule is None else schedule[draw % len(schedule)]
+        picks = np.searchsorted(cdfs[row], rng.random(active.size), side="right")
+        picks = np.minimum(picks, n_items - 1)
+        already = owned[active, picks]
+        duplicates += int(already.sum())
+        fresh = active[~already]
+        owned[fresh, picks[~already]] = True
+        owned_count[fresh] += 1
+        done = owned_count[active] == n_items
+        if done.any():
+            finished.extend([draw + 1] * int(done.sum()))
+            active = active[~done]
+    return finished, duplicates
+
+
+def simulate_completion(
+    prob_matrix: Any,
+    schedule: Optional[Sequence[int]],
+    users: int,
+    max_draws: int,
+    workers: int,
+    seed: int,
+) -> dict[str, float]:
+    np = _numpy()
+    per_worker = max(users // workers, 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_completion_worker, prob_matrix, schedule, per_worker, max_draws, seed + i)
+            for i in range(workers)
+        ]
+        results = [f.result() for f in futures]
+
+    finished = [d for done, _ in results for d in done]
+    duplicates = sum(dup for _, dup in results)
+    simulated = per_worker * workers
+    if not finished:
+        return {"completed": 0.0, "duplicates": float(duplicates)}
+    # unfinished users count as max_draws, so the stats are lower bounds
+    # (reported with the unfinished share) rather than biased to the lucky
+    draws = np.full(simulated, max_draws, dtype=np.int64)
+    draws[: len(finished)] = finished
+    total_draws = int(draws.sum())
+    return {
+        "completed": len(finished) / simulated,
+        "mean": float(draws.mean()),
+        "p50": float(np.percentile(draws, 50)),
+        "p90": float(np.percentile(draws, 90)),
+        "p99": float(np.percentile(draws, 99)),
+        "duplicate_share": duplicates / total_draws,
+    }
+
+
+def drop_rate_histogram(catalog: ArtifactCatalog, probs: dict[str, Any], draws: int, seed: int) -> dict[str, Counter]:
+    """
+    Vectorized draws per phase, aggregated by rarity.
+    """
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    rarity_of = [d.rarity.value for d in catalog.definitions]
+    out: dict[str, Counter] = {}
+    for phase in PHASES:
+        picks = rng.choice(len(catalog.definitions), size=draws, p=probs[phase])
+        counts = np.bincount(picks, minlength=len(catalog.definitions))
+        by_rarity: Counter = Counter()
+        for idx, count in enumerate(counts):
+            by_rarity[rarity_of[idx]] += int(count)
+        out[phase] = by_rarity
+    return out
+
+
+def benchmark_sampler(catalog: ArtifactCatalog, draws: int) -> float:
+    """
+    Draws/sec of the production sampler used by `discover_artifact`.
+    """
+    start = time.perf_counter()
+    for i in range(draws):
+        catalog.draw(PHASES[i & 3])
+    return draws / (time.perf_counter() - start)
+
+
+def _load_catalog_file(path: str) -> list[ArtifactDefinitionOut]:
+    with open(path, encoding="utf-8") as f:
+        return [ArtifactDefinitionOut.model_validate(item) for item in json.load(f)]
+
+
+async def _load_catalog_db() -> list[ArtifactDefinitionOut]:
+    from app.core.database import AsyncSessionLocal
+    from app.services.artifact_service import load_artifact_catalog
+
+    async with AsyncSessionLocal() as db:
+        return list((await load_artifact_catalog(db)).definitions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--catalog", help="JSON list of artifact definitions")
+    source.add_argument("--from-db", action="store_true", help="load artifactdefinition from DATABASE_URL")
+    source.add_argument("--synthetic", type=int, default=40, help="generate N random definitions")
+    parser.add_argument("--draws", type=int, default=2_000_000, help="draws per phase for drop rates")
+    parser.add_argument("--users", type=int, default=20_000, help="simulated collectors")
+    parser.add_argument("--max-draws", type=int, default=20_000)
+    parser.add_argument("--draws-per-day", type=int, default=1, help="for the lunar cycle scenario")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sampler-draws", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    np = _numpy()
+    if args.catalog:
+        definitions = _load_catalog_file(args.catalog)
+    elif args.from_db:
+        definitions = asyncio.run(_load_catalog_db())
+    else:
+        definitions = synthetic_catalog(args.synthetic, args.seed)
+    if not definitions:
+        raise SystemExit("Catalog is empty")
+
+    catalog = build_artifact_catalog(definitions)
+    probs = _probabilities(catalog)
+    print(f"Catalog: {len(definitions)} artifacts {dict(Counter(d.rarity.value for d in definitions))}")
+
+    print("\nDrop rates by rarity")
+    for phase, by_rarity in drop_rate_histogram(catalog, probs, args.draws, args.seed).items():
+        total = sum(by_rarity.values())
+        rates = "  ".join(f"{r}={by_rarity[r] / total:6.2%}" for r in sorted(by_rarity))
+        print(f"  {phase:<7} {rates}")
+
+    print("\nDraws to complete the collection")
+    prob_matrix = np.vstack([probs[p] for p in PHASES])
+    scenarios: list[tuple[str, Any, Optional[list[int]]]] = [
+        (phase, prob_matrix[i : i + 1], None) for i, phase in enumerate(PHASES)
+    ]
+    cycle_days = int(round(SYNODIC_MONTH_DAYS * 4))
+    scenarios.append(("cycle", prob_matrix, _cycle_phase_schedule(cycle_days, args.draws_per_day)))
+    for name, matrix, schedule in scenarios:
+        stats = simulate_completion(matrix, schedule, args.users, args.max_draws, args.workers, args.seed)
+        if "mean" not in stats:
+            print(f"  {name:<7} nobody completed within {args.max_draws} draws")
+            continue
+        line = (
+            f"  {name:<7} mean={stats['mean']:8.1f} p50={stats['p50']:7.0f} p90={stats['p90']:7.0f} "
+            f"p99={stats['p99']:7.0f} dup={stats['duplicate_share']:6.2%} done={stats['completed']:6.1%}"
+        )
+        if name == "cycle":
+            line += f"  (~{stats['mean'] / args.draws_per_day:.0f} days)"
+        if stats["completed"] < 1.0:
+            line += f"  [lower bounds: {1 - stats['completed']:.1%} unfinished, counted as {args.max_draws}]"
+        print(line)
+
+    print(f"\nProduction sampler: {benchmark_sampler(catalog, args.sampler_draws):,.0f} draws/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, AsyncIterator, Sequence
+
+import orjson
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import AsyncSessionLocal
+from app.models.artifact import UserArtifact
+from app.models.habit import Habit
+from app.models.lunar_energy import LunarEnergyAccount
+from app.models.plant import Plant
+from app.models.user import User
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_YIELD_PER = 500
+# Users per chunk in the admin export.
+ADMIN_EXPORT_USER_CHUNK = 200
+
+# (record type, table) in export order; every table has a `user_id` column.
+_USER_TABLES: tuple[tuple[str, Table], ...] = (
+    ("habit", Habit.__table__),
+    ("plant", Plant.__table__),
+    ("artifact", UserArtifact.__table__),
+    ("lunar_energy", LunarEnergyAccount.__table__),
+)
+
+
+def _encode_rows(kind: str, rows: Sequence[Any]) -> bytes:
+    return b"".join(orjson.dumps({"type": kind, **row}) + b"\n" for row in rows)
+
+
+async def _stream_table(
+    db: AsyncSession,
+    kind: str,
+    table: Table,
+    user_ids: Sequence[int],
+) -> AsyncIterator[bytes]:
+    """
+    Stream rows of one table through a server-side cursor, one chunk per partition.
+    """
+    stmt = (
+        select(table)
+        .where(table.c.user_id.in_(user_ids))
+        .order_by(table.c.user_id, table.c.id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    result = await db.stream(stmt)
+    async for partition in result.mappings().partitions():
+        yield _encode_rows(kind, partition)
+
+
+async def _stream_users(db: AsyncSession, users: Sequence[Any]) -> AsyncIterator[bytes]:
+    yield _encode_rows("user", users)
+    user_ids = [u["id"] for u in users]
+    for kind, table in _USER_TABLES:
+        async for chunk in _stream_table(db, kind, table, user_ids):
+            yield chunk
+
+
+async def iter_user_export(
+    user_id: int,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON export of everything we store for one user.
+
+    Opens its own session: the request-scoped one is closed before a
+    StreamingResponse starts iterating.
+    """
+    async with session_factory() as db:
+        result = await db.execute(select(User.__table__).where(User.id == user_id))
+        users = result.mappings().all()
+        if not users:
+            return
+        async for chunk in _stream_users(db, users):
+            yield chunk
+
+
+async def iter_all_users_export(
+    chunk_size: int = ADMIN_EXPORT_USER_CHUNK,
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON export of all users, walked in keyset-ordered chunks of `chunk_size` users.
+    """
+    user_table = User.__table__
+    last_id = 0
+    async with session_factory() as db:
+        while True:
+            result = await db.execute(
+                select(user_table)
+                .where(user_table.c.id > last_id)
+                .order_by(user_table.c.id)
+                .limit(chunk_size)
+            )
+            users = result.mappings().all()
+            if not users:
+                return
+            async for chunk in _stream_users(db, users):
+                yield chunk
+            last_id = users[-1]["id"]
+            # Release the snapshot between chunks so a long export doesn't pin old rows.
+            await db.rollback()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Incrementally gzip an async byte stream.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,36 +1,55 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Optional, Union
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.moon_phases import get_moon_phase_info
+from app.core.moon_phases import MoonPhaseInfo, get_moon_phase_info
 from app.models.habit import Habit
 from app.models.plant import Plant
-from app.schemas.plant import PlantOut
+from app.schemas.garden import GardenDeltaOut, GardenStateOut
+from app.schemas.plant import PlantOutList
 
 
-async def get_garden_state(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+def current_moon() -> MoonPhaseInfo:
+    return get_moon_phase_info(datetime.utcnow())
+
+
+async def get_garden_state(
+    db: AsyncSession,
+    user_id: int,
+    version: int,
+    since: Optional[int] = None,
+    moon: Optional[MoonPhaseInfo] = None,
+) -> Union[GardenStateOut, GardenDeltaOut]:
     """
     Return full garden state for user:
-    - plants
+    - plants (only those changed after `since` in delta mode)
     - phases
     - aggregated stats
+
+    `version` is the user's data_version read before the rows; a write
+    committing in between only makes the next delta repeat a few plants.
     """
-    result = await db.execute(select(Plant).where(Plant.user_id == user_id))
+    stmt = select(Plant).where(Plant.user_id == user_id)
+    if since is not None:
+        stmt = stmt.where(Plant.version > since)
+    result = await db.execute(stmt)
     plants = result.scalars().all()
 
-    plant_out: List[PlantOut] = [PlantOut.model_validate(p) for p in plants]
+    plant_out = PlantOutList.validate_python(plants, from_attributes=True)
 
     # active habits count
     result = await db.execute(select(Habit).where(Habit.user_id == user_id, Habit.is_active == True))  # noqa: E712
     active_habits_count = len(result.scalars().all())
 
-    phase_info = get_moon_phase_info(None)
+    phase_info = moon or current_moon()
 
-    return {
-        "plants": [p.model_dump() for p in plant_out],
+    state = {
+        "version": version,
+        "plants": plant_out,
         "activeHabits": active_habits_count,
         "moon": {
             "phase": phase_info.phase,
@@ -38,3 +57,7 @@ async def get_garden_state(db: AsyncSession, user_id: int) -> Dict[str, Any]:
             "energyMultiplier": phase_info.energy_multiplier,
         },
     }
+    if since is not None:
+        result = await db.execute(select(Plant.id).where(Plant.user_id == user_id).order_by(Plant.id))
+        state["plantIds"] = result.scalars().all()
+    return state
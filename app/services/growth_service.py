@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.growth_rules import GrowthCurve, GrowthRules, get_growth_rules
+from app.models.plant import Plant
+from app.services.version_service import bump_plant_owners, plant_owner_version
+
+logger = logging.getLogger(__name__)
+
+
+def _curve_case(curve: GrowthCurve) -> ColumnElement[int]:
+    # highest threshold first: the first matching WHEN wins
+    whens = [
+        (Plant.growth_points >= threshold, stage)
+        for stage, threshold in reversed(list(enumerate(curve.thresholds)))
+        if stage > 0
+    ]
+    return case(*whens, else_=0)
+
+
+def growth_stage_expression(rules: GrowthRules) -> ColumnElement[int]:
+    """
+    SQL equivalent of `rules.stage_for(species, growth_points)`.
+    """
+    default = _curve_case(rules.default)
+    if not rules.species:
+        return default
+    return case(
+        *[(Plant.species == name, _curve_case(curve)) for name, curve in rules.species.items()],
+        else_=default,
+    )
+
+
+async def recompute_growth_stages(
+    db: AsyncSession,
+    rules: Optional[GrowthRules] = None,
+    species: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Re-derive `growth_stage` for every plant (or only `species`) in one UPDATE.
+
+    Rows already at the right stage are skipped by the WHERE clause, so a
+    curve tweak only rewrites the plants it actually moves.
+    """
+    rules = rules or get_growth_rules()
+    stage = growth_stage_expression(rules)
+    where = Plant.growth_stage != stage
+    if species is not None:
+        where = and_(where, Plant.species.in_(list(species)))
+    await bump_plant_owners(db, where)
+    stmt = update(Plant).where(where).values(growth_stage=stage, version=plant_owner_version())
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    await db.commit()
+    return result.rowcount
+
+
+async def main() -> None:
+    from app.core.database import AsyncSessionLocal
+    from app.services.summary_service import reconcile_summaries
+
+    logging.basicConfig(level=logging.INFO)
+    async with AsyncSessionLocal() as db:
+        changed = await recompute_growth_stages(db)
+        logger.info("Recomputed growth stages: %s plants changed", changed)
+        if changed:
+            # stage counts in user_summary are now stale
+            repaired = await reconcile_summaries(db)
+            logger.info("Reconciled user summaries: %s rows repaired", repaired)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,34 +6,45 @@ from typing import Sequence
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.growth_rules import get_growth_rules
+from app.core.jobs import enqueue
+from app.core.live import push_user_event
 from app.models.habit import Habit, HabitFrequencyType, HabitKind
 from app.models.plant import Plant
-from app.schemas.habit import HabitCreate, HabitUpdate, HabitCheckInResponse
-
-
-def _calculate_growth_gain(habit: Habit) -> int:
+from app.models.user import User
+from app.models.views import HabitView, PlantView
+from app.schemas.habit import HabitCheckInResponse, HabitCreate, HabitOut, HabitUpdate
+from app.schemas.plant import PlantOut
+from app.services.checkin_history_service import record_check_in
+from app.services.leaderboard_service import record_streak
+from app.services.reminder_service import notify_habits_changed
+from app.services.summary_service import apply_summary_delta, refresh_user_summary
+from app.services.version_service import bump_user_version
+
+
+def _calculate_growth_gain(habit: Habit | HabitView) -> int:
     """
     How many growth points plant gets per successful check-in.
-    Could depend on frequency or kind.
+    Depends on frequency and kind; amounts come from the growth rules config.
     """
-    base = 10
+    gains = get_growth_rules().gains
+    base = gains.base
     if habit.kind == HabitKind.MUSHROOM:
-        base += 5
+        base += gains.mushroom_bonus
     if habit.frequency_type in (HabitFrequencyType.CUSTOM_DAYS, HabitFrequencyType.CUSTOM_WEEKS):
-        base += 3
+        base += gains.custom_frequency_bonus
     return base
 
 
-def _update_growth_stage(plant: Plant) -> None:
+def _growth_stage_for(plant: Plant | PlantView) -> int:
     """
-    Simple thresholds for growth stages.
+    Stage from the plant species' compiled growth curve.
     """
-    thresholds = [0, 20, 50, 100, 200]
-    stage = 0
-    for i, t in enumerate(thresholds):
-        if plant.growth_points >= t:
-            stage = i
-    plant.growth_stage = stage
+    return get_growth_rules().stage_for(plant.species, plant.growth_points)
+
+
+def _update_growth_stage(plant: Plant) -> None:
+    plant.growth_stage = _growth_stage_for(plant)
 
 
 async def create_habit_for_user(
@@ -67,15 +78,43 @@ async def create_habit_for_user(
         is_wilted=False,
     )
     _update_growth_stage(plant)
+    habit.version = plant.version = await bump_user_version(db, user_id)
     db.add(plant)
+    await apply_summary_delta(
+        db,
+        user_id,
+        active_habits=1,
+        stage_moves=[(None, plant.growth_stage)],
+        best_streak=habit.longest_streak,
+    )
+    await notify_habits_changed(db, [habit.id])
 
     await db.commit()
     await db.refresh(habit)
+    await db.refresh(plant)
+    await _push_habit(habit, plant)
     return habit
 
 
-async def get_user_habits(db: AsyncSession, user_id: int) -> Sequence[Habit]:
-    result = await db.execute(select(Habit).where(Habit.user_id == user_id).order_by(Habit.id))
+async def _push_habit(habit: Habit, plant: Plant | None = None) -> None:
+    await enqueue(push_user_event, habit.user_id, "habit", HabitOut.model_validate(habit).model_dump(mode="json"))
+    if plant is not None:
+        await enqueue(push_user_event, habit.user_id, "plant", PlantOut.model_validate(plant).model_dump(mode="json"))
+
+
+async def get_user_habits(db: AsyncSession, user_id: int, since: int | None = None) -> Sequence[Habit]:
+    """
+    All habits of the user, or only those changed after version `since`.
+    """
+    stmt = select(Habit).where(Habit.user_id == user_id).order_by(Habit.id)
+    if since is not None:
+        stmt = stmt.where(Habit.version > since)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+async def get_user_habit_ids(db: AsyncSession, user_id: int) -> Sequence[int]:
+    result = await db.execute(select(Habit.id).where(Habit.user_id == user_id).order_by(Habit.id))
     return result.scalars().all()
 
 
@@ -86,6 +125,28 @@ async def get_habit_by_id(db: AsyncSession, user_id: int, habit_id: int) -> Habi
     return result.scalar_one_or_none()
 
 
+async def get_habit_for_telegram_user(db: AsyncSession, telegram_id: int, habit_id: int) -> Habit | None:
+    """
+    Resolve a habit by the owner's Telegram id in one query (bot callbacks).
+    """
+    result = await db.execute(
+        select(Habit)
+        .join(User, User.id == Habit.user_id)
+        .where(User.telegram_id == telegram_id, Habit.id == habit_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_active_habits_for_telegram_user(db: AsyncSession, telegram_id: int) -> Sequence[Habit]:
+    result = await db.execute(
+        select(Habit)
+        .join(User, User.id == Habit.user_id)
+        .where(User.telegram_id == telegram_id, Habit.is_active == True)  # noqa: E712
+        .order_by(Habit.id)
+    )
+    return result.scalars().all()
+
+
 async def update_habit(
     db: AsyncSession,
     habit: Habit,
@@ -93,17 +154,26 @@ async def update_habit(
 ) -> Habit:
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(habit, field, value)
+    habit.version = await bump_user_version(db, habit.user_id)
+    await refresh_user_summary(db, habit.user_id)
+    await notify_habits_changed(db, [habit.id])
     await db.commit()
     await db.refresh(habit)
+    await _push_habit(habit)
     return habit
 
 
 async def delete_habit(db: AsyncSession, habit: Habit) -> None:
+    habit_id, user_id = habit.id, habit.user_id
     await db.delete(habit)
+    await bump_user_version(db, user_id)
+    await refresh_user_summary(db, user_id)
+    await notify_habits_changed(db, [habit_id])
     await db.commit()
+    await enqueue(push_user_event, user_id, "habit_deleted", {"id": habit_id})
 
 
-def _is_expected_checkin_today(habit: Habit, today: date) -> bool:
+def _is_expected_checkin_today(habit: Habit | HabitView, today: date) -> bool:
     """
     Rough check if today is one of allowed days.
     For DAILY: always.
@@ -140,6 +210,7 @@ async def check_in_habit(
         select(Plant).where(Plant.habit_id == habit.id).limit(1)
     )
     plant = result.scalar_one_or_none()
+    old_stage = plant.growth_stage if plant else None
     if not plant:
         plant = Plant(
             user_id=habit.user_id,
@@ -173,7 +244,8 @@ async def check_in_habit(
 
     # apply successful check-in
     habit.current_streak += 1
-    if habit.current_streak > habit.longest_streak:
+    new_record = habit.current_streak > habit.longest_streak
+    if new_record:
         habit.longest_streak = habit.current_streak
 
     habit.last_check_in_date = today
@@ -183,9 +255,21 @@ async def check_in_habit(
     plant.growth_points += gain
     _update_growth_stage(plant)
 
+    habit.version = plant.version = await bump_user_version(db, habit.user_id)
+    await record_check_in(db, habit, today)
+    await apply_summary_delta(
+        db,
+        habit.user_id,
+        stage_moves=[(old_stage, plant.growth_stage)],
+        best_streak=habit.longest_streak,
+    )
+    await notify_habits_changed(db, [habit.id])
     await db.commit()
     await db.refresh(habit)
     await db.refresh(plant)
+    await _push_habit(habit, plant)
+    if new_record:
+        await enqueue(record_streak, habit.user_id, habit.longest_streak)
 
     return HabitCheckInResponse(
         habit_id=habit.id,
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, Literal, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.jobs import job
+from app.core.skiplist import IndexableSkipList
+from app.models.artifact import UserArtifact
+from app.models.habit import Habit
+
+logger = logging.getLogger(__name__)
+
+Board = Literal["longest_streak", "artifacts"]
+BOARDS: tuple[Board, ...] = ("longest_streak", "artifacts")
+
+
+class _MemoryBoard:
+    __slots__ = ("scores", "index")
+
+    def __init__(self) -> None:
+        self.scores: dict[int, float] = {}
+        # keys are (-score, member) so position 0 is the best score
+        self.index = IndexableSkipList()
+
+    def set(self, member: int, score: float) -> None:
+        old = self.scores.get(member)
+        if old == score:
+            return
+        if old is not None:
+            self.index.remove((-old, member))
+        self.index.insert((-score, member))
+        self.scores[member] = score
+
+
+class MemoryLeaderboard:
+    """
+    Per-process fallback backed by indexable skiplists.
+
+    Every worker holds its own copy; use the Redis backend when running
+    several workers.
+    """
+
+    def __init__(self) -> None:
+        self._boards: dict[str, _MemoryBoard] = {b: _MemoryBoard() for b in BOARDS}
+
+    async def set_max(self, board: Board, member: int, score: float) -> None:
+        b = self._boards[board]
+        if score > b.scores.get(member, float("-inf")):
+            b.set(member, score)
+
+    async def incr(self, board: Board, member: int, amount: float = 1) -> None:
+        b = self._boards[board]
+        b.set(member, b.scores.get(member, 0) + amount)
+
+    async def score(self, board: Board, member: int) -> Optional[float]:
+        return self._boards[board].scores.get(member)
+
+    async def rank(self, board: Board, member: int) -> Optional[int]:
+        """
+        1-based rank, or None if the member has no score.
+        """
+        b = self._boards[board]
+        score = b.scores.get(member)
+        if score is None:
+            return None
+        return b.index.index((-score, member)) + 1
+
+    async def top(self, board: Board, n: int) -> list[tuple[int, float]]:
+        return [(member, -neg) for neg, member in self._boards[board].index.islice(0, n)]
+
+    async def replace(self, board: Board, items: AsyncIterator[Sequence[tuple[int, float]]]) -> None:
+        fresh = _MemoryBoard()
+        async for chunk in items:
+            for member, score in chunk:
+                fresh.set(member, score)
+        self._boards[board] = fresh
+
+
+class RedisLeaderboard:
+    """
+    Redis ZSET backend shared by all workers.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "lb:") -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(redis_url)
+        self._prefix = prefix
+
+    def _key(self, board: Board) -> str:
+        return f"{self._prefix}{board}"
+
+    async def set_max(self, board: Board, member: int, score: float) -> None:
+        await self._redis.zadd(self._key(board), {str(member): score}, gt=True)
+
+    async def incr(self, board: Board, member: int, amount: float = 1) -> None:
+        await self._redis.zincrby(self._key(board), amount, str(member))
+
+    async def score(self, board: Board, member: int) -> Optional[float]:
+        return await self._redis.zscore(self._key(board), str(member))
+
+    async def rank(self, board: Board, member: int) -> Optional[int]:
+        rank = await self._redis.zrevrank(self._key(board), str(member))
+        return None if rank is None else rank + 1
+
+    async def top(self, board: Board, n: int) -> list[tuple[int, float]]:
+        rows = await self._redis.zrevrange(self._key(board), 0, n - 1, withscores=True)
+        return [(int(member), score) for member, score in rows]
+
+    async def replace(self, board: Board, items: AsyncIterator[Sequence[tuple[int, float]]]) -> None:
+        """
+        Fill a temporary key and RENAME it over the live one atomically.
+        """
+        tmp = f"{self._key(board)}:rebuild"
+        await self._redis.delete(tmp)
+        written = False
+        async for chunk in items:
+            if chunk:
+                await self._redis.zadd(tmp, {str(m): s for m, s in chunk})
+                written = True
+        if written:
+            await self._redis.rename(tmp, self._key(board))
+        else:
+            await self._redis.delete(self._key(board))
+
+
+_leaderboard: MemoryLeaderboard | RedisLeaderboard | None = None
+
+
+def get_leaderboard() -> MemoryLeaderboard | RedisLeaderboard:
+    global _leaderboard
+    if _leaderboard is None:
+        if settings.LEADERBOARD_BACKEND == "redis":
+            _leaderboard = RedisLeaderboard(settings.REDIS_URL)
+        else:
+            _leaderboard = MemoryLeaderboard()
+    return _leaderboard
+
+
+# --- incremental updates from services ---
+# Enqueued after the commit (app.core.jobs): failures are retried off the
+# request path and can never fail the check-in / discovery itself.
+
+
+@job("leaderboard.record_streak")
+async def record_streak(user_id: int, longest_streak: int) -> None:
+    await get_leaderboard().set_max("longest_streak", user_id, longest_streak)
+
+
+@job("leaderboard.record_artifact_acquired")
+async def record_artifact_acquired(user_id: int) -> None:
+    await get_leaderboard().incr("artifacts", user_id, 1)
+
+
+# --- rebuild from the database ---
+
+
+async def _stream_scores(db: AsyncSession, stmt, chunk_size: int) -> AsyncIterator[Sequence[tuple[int, float]]]:
+    result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions():
+        yield [(row[0], float(row[1])) for row in partition]
+
+
+async def rebuild_leaderboards(
+    db: AsyncSession,
+    boards: Iterable[Board] = BOARDS,
+    chunk_size: int = 5000,
+) -> None:
+    """
+    Recompute boards from `habit` / `userartifact` with one GROUP BY each.
+    """
+    queries = {
+        "longest_streak": select(Habit.user_id, func.max(Habit.longest_streak)).group_by(Habit.user_id),
+        "artifacts": select(UserArtifact.user_id, func.count(UserArtifact.id)).group_by(UserArtifact.user_id),
+    }
+    backend = get_leaderboard()
+    for board in boards:
+        await backend.replace(board, _stream_scores(db, queries[board], chunk_size))
+        logger.info("Rebuilt leaderboard %s", board)
+
+
+async def main() -> None:
+    from app.core.database import AsyncSessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    async with AsyncSessionLocal() as db:
+        await rebuild_leaderboards(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
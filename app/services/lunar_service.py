@@ -7,9 +7,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.jobs import enqueue
+from app.core.live import push_user_event
 from app.core.moon_phases import MoonPhaseInfo, get_moon_phase_info
 from app.models.lunar_energy import LunarEnergyAccount
 from app.schemas.lunar import LunarEnergyOut
+from app.services.summary_service import apply_summary_delta
 
 
 async def get_or_create_lunar_account(db: AsyncSession, user_id: int) -> LunarEnergyAccount:
@@ -39,6 +42,11 @@ async def get_lunar_energy(db: AsyncSession, user_id: int) -> LunarEnergyOut:
     )
 
 
+async def _push_energy(acc: LunarEnergyAccount) -> None:
+    data = LunarEnergyOut(balance=acc.balance, last_daily_bonus_date=acc.last_daily_bonus_date)
+    await enqueue(push_user_event, acc.user_id, "energy", data.model_dump(mode="json"))
+
+
 async def apply_lunar_energy_change(
     db: AsyncSession,
     user_id: int,
@@ -48,8 +56,10 @@ async def apply_lunar_energy_change(
     acc.balance += delta
     if acc.balance < 0:
         acc.balance = 0
+    await apply_summary_delta(db, user_id, energy_balance=acc.balance)
     await db.commit()
     await db.refresh(acc)
+    await _push_energy(acc)
     return acc
 
 
@@ -71,8 +81,10 @@ async def apply_daily_bonus(
 
     acc.balance += amount
     acc.last_daily_bonus_date = today
+    await apply_summary_delta(db, user_id, energy_balance=acc.balance)
 
     await db.commit()
     await db.refresh(acc)
+    await _push_energy(acc)
 
     return True, acc, amount
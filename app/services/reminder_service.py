@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.habit import Habit, HabitFrequencyType
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# pg NOTIFY channel the reminder leader listens on (payload: comma-separated habit ids)
+HABITS_CHANGED_CHANNEL = "habits_changed"
+
+
+@lru_cache(maxsize=512)
+def _zone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or settings.DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.DEFAULT_TIMEZONE)
+
+
+def next_due_date(
+    frequency_type: HabitFrequencyType,
+    frequency_value: Optional[int],
+    last_check_in_date: Optional[date],
+) -> Optional[date]:
+    """
+    First local date on which the habit is expected again (None = right away).
+    """
+    if last_check_in_date is None:
+        return None
+    if frequency_type == HabitFrequencyType.WEEKLY:
+        days = 7
+    elif frequency_type == HabitFrequencyType.CUSTOM_DAYS:
+        days = frequency_value or 1
+    elif frequency_type == HabitFrequencyType.CUSTOM_WEEKS:
+        days = (frequency_value or 1) * 7
+    else:
+        days = 1
+    return last_check_in_date + timedelta(days=days)
+
+
+def next_reminder_at(
+    frequency_type: HabitFrequencyType,
+    frequency_value: Optional[int],
+    last_check_in_date: Optional[date],
+    tz_name: str | None,
+    after: datetime,
+) -> datetime:
+    """
+    Earliest reminder instant (UTC) strictly after `after`.
+
+    Reminders go out at REMINDER_LOCAL_TIME in the user's timezone on the due
+    date, and again every following day while the habit stays overdue.
+    """
+    tz = _zone(tz_name)
+    local_after = after.astimezone(tz)
+    due = next_due_date(frequency_type, frequency_value, last_check_in_date)
+    day = local_after.date() if due is None else max(due, local_after.date())
+    instant = datetime.combine(day, settings.REMINDER_LOCAL_TIME, tzinfo=tz)
+    if instant <= local_after:
+        instant = datetime.combine(day + timedelta(days=1), settings.REMINDER_LOCAL_TIME, tzinfo=tz)
+    return instant.astimezone(timezone.utc)
+
+
+@dataclass(slots=True)
+class DueReminder:
+    habit_id: int
+    habit_name: str
+    chat_id: int
+    current_streak: int
+
+
+_REMINDER_COLUMNS = (
+    Habit.id,
+    Habit.name,
+    Habit.frequency_type,
+    Habit.frequency_value,
+    Habit.last_check_in_date,
+    Habit.current_streak,
+    Habit.updated_at,
+    User.telegram_id,
+    User.timezone,
+)
+
+
+def _reminder_select():
+    return (
+        select(*_REMINDER_COLUMNS)
+        .join(User, User.id == Habit.user_id)
+        .where(Habit.is_active == True)  # noqa: E712
+    )
+
+
+class ReminderScheduler:
+    """
+    Min-heap of the next reminder instant per active habit.
+
+    Entries are never removed from the heap in place; rescheduling bumps a
+    sequence number and stale heap items are skipped when popped.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, int]] = []
+        self._current: dict[int, int] = {}  # habit_id -> live sequence number
+        self._seq = itertools.count()
+        self._dirty: set[int] = set()
+        self._watermark: Optional[datetime] = None
+        self._recent: dict[int, datetime] = {}  # habit_id -> updated_at applied within the overlap
+        self.wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def schedule(self, habit_id: int, at: datetime) -> None:
+        seq = next(self._seq)
+        self._current[habit_id] = seq
+        heapq.heappush(self._heap, (at, seq, habit_id))
+
+    def unschedule(self, habit_id: int) -> None:
+        self._current.pop(habit_id, None)
+
+    def mark_dirty(self, habit_id: int) -> None:
+        self._dirty.add(habit_id)
+        self.wakeup.set()
+
+    @property
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def next_at(self) -> Optional[datetime]:
+        while self._heap:
+            at, seq, habit_id = self._heap[0]
+            if self._current.get(habit_id) == seq:
+                return at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime, limit: int) -> list[int]:
+        due: list[int] = []
+        while self._heap and len(due) < limit:
+            at, seq, habit_id = self._heap[0]
+            if self._current.get(habit_id) != seq:
+                heapq.heappop(self._heap)
+                continue
+            if at > now:
+                break
+            heapq.heappop(self._heap)
+            del self._current[habit_id]
+            due.append(habit_id)
+        return due
+
+    def _apply_rows(self, rows: Iterable, after: datetime) -> None:
+        for row in rows:
+            self.schedule(
+                row.id,
+                next_reminder_at(
+                    row.frequency_type,
+                    row.frequency_value,
+                    row.last_check_in_date,
+                    row.timezone,
+                    after,
+                ),
+            )
+            if row.updated_at is not None:
+                self._recent[row.id] = row.updated_at
+            if self._watermark is None or (row.updated_at and row.updated_at > self._watermark):
+                self._watermark = row.updated_at
+
+    def _sync_since(self) -> Optional[datetime]:
+        if self._watermark is None:
+            return None
+        return self._watermark - timedelta(seconds=settings.REMINDER_SYNC_OVERLAP_SECONDS)
+
+    def _prune_recent(self) -> None:
+        since = self._sync_since()
+        if since is not None:
+            self._recent = {h: at for h, at in self._recent.items() if at > since}
+
+    async def load_all(self, db: AsyncSession, now: datetime) -> None:
+        """
+        Initial fill. Reminders missed within the startup grace window still fire.
+        """
+        after = now - timedelta(minutes=settings.REMINDER_STARTUP_GRACE_MINUTES)
+        result = await db.stream(_reminder_select().execution_options(yield_per=1000))
+        async for partition in result.partitions():
+            self._apply_rows(partition, after)
+            self._prune_recent()
+        self._watermark = self._watermark or now
+
+    async def sync(self, db: AsyncSession, now: datetime) -> None:
+        """
+        Pick up habits changed since the last sync, plus ids marked dirty.
+
+        `updated_at` is stamped by the writer's clock at flush, so a row can
+        commit with a value below the newest one already seen. Each sync
+        therefore re-reads REMINDER_SYNC_OVERLAP_SECONDS below that watermark
+        (an index range scan on ix_habit_updated_at) and skips rows already
+        applied with the same `updated_at`.
+        """
+        dirty, self._dirty = self._dirty, set()
+        for habit_id in dirty:
+            self.unschedule(habit_id)
+
+        stmt = _reminder_select()
+        since = self._sync_since()
+        if since is not None:
+            stmt = stmt.where(Habit.updated_at > since)
+        result = await db.execute(stmt)
+        self._apply_rows(
+            [row for row in result.all() if row.id in dirty or self._recent.get(row.id) != row.updated_at],
+            now,
+        )
+        self._prune_recent()
+
+        # dirty habits not returned above were deleted/deactivated or unchanged
+        missing = [h for h in dirty if h not in self._current]
+        if missing:
+            result = await db.execute(_reminder_select().where(Habit.id.in_(missing)))
+            self._apply_rows(result.all(), now)
+
+    async def collect_due(self, db: AsyncSession, now: datetime, limit: int) -> list[DueReminder]:
+        """
+        Pop due habits, re-check them against fresh rows and reschedule.
+        """
+        habit_ids = self.pop_due(now, limit)
+        if not habit_ids:
+            return []
+
+        result = await db.execute(_reminder_select().where(Habit.id.in_(habit_ids)))
+        reminders: list[DueReminder] = []
+        for row in result.all():
+            local_today = now.astimezone(_zone(row.timezone)).date()
+            due = next_due_date(row.frequency_type, row.frequency_value, row.last_check_in_date)
+            if due is None or due <= local_today:
+                reminders.append(DueReminder(row.id, row.name, row.telegram_id, row.current_streak))
+            self._apply_rows([row], now)
+        return reminders
+
+
+async def notify_habits_changed(db: AsyncSession, habit_ids: Sequence[int]) -> None:
+    """
+    Called by habit mutations before their commit. Postgres delivers the
+    NOTIFY on commit (and drops it on rollback) to the reminder leader in
+    whichever process it runs, which refreshes those habits on its next tick
+    instead of waiting for the periodic sync.
+    """
+    if habit_ids:
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": HABITS_CHANGED_CHANNEL, "payload": ",".join(map(str, habit_ids))},
+        )
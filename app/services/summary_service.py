@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, Text, cast, func, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.user_summary import UserSummary
+
+logger = logging.getLogger(__name__)
+
+# Recompute summary rows from the source tables; rows that already match are
+# left alone, so the returned rowcount is the number of rows inserted/repaired.
+_REFRESH_SQL = """
+INSERT INTO user_summary AS s
+    (user_id, active_habits, plant_stages, artifact_count, energy_balance, best_streak, updated_at)
+SELECT
+    u.id,
+    (SELECT count(*) FROM habit h WHERE h.user_id = u.id AND h.is_active),
+    (SELECT coalesce(jsonb_object_agg(p.stage, p.n), '{{}}'::jsonb)
+       FROM (SELECT growth_stage AS stage, count(*) AS n
+               FROM plant WHERE plant.user_id = u.id GROUP BY growth_stage) p),
+    (SELECT count(*) FROM userartifact a WHERE a.user_id = u.id),
+    coalesce((SELECT e.balance FROM lunarenergyaccount e WHERE e.user_id = u.id), 0),
+    coalesce((SELECT max(h.longest_streak) FROM habit h WHERE h.user_id = u.id), 0),
+    now()
+FROM "user" u
+WHERE {where}
+ON CONFLICT (user_id) DO UPDATE SET
+    active_habits = excluded.active_habits,
+    plant_stages = excluded.plant_stages,
+    artifact_count = excluded.artifact_count,
+    energy_balance = excluded.energy_balance,
+    best_streak = excluded.best_streak,
+    updated_at = excluded.updated_at
+WHERE (s.active_habits, s.plant_stages, s.artifact_count, s.energy_balance, s.best_streak)
+    IS DISTINCT FROM
+    (excluded.active_habits, excluded.plant_stages, excluded.artifact_count,
+     excluded.energy_balance, excluded.best_streak)
+"""
+
+_REFRESH_ONE = text(_REFRESH_SQL.format(where="u.id = :user_id"))
+_REFRESH_RANGE = text(_REFRESH_SQL.format(where="u.id BETWEEN :lo AND :hi"))
+
+
+async def refresh_user_summary(db: AsyncSession, user_id: int) -> None:
+    """
+    Recompute one user's row inside the caller's transaction. Pending
+    changes are flushed first (the session does not autoflush), so they
+    are included.
+    """
+    await db.flush()
+    await db.execute(_REFRESH_ONE, {"user_id": user_id})
+
+
+async def apply_summary_delta(
+    db: AsyncSession,
+    user_id: int,
+    *,
+    active_habits: int = 0,
+    artifacts: int = 0,
+    stage_moves: Iterable[tuple[Optional[int], Optional[int]]] = (),
+    best_streak: Optional[int] = None,
+    energy_balance: Optional[int] = None,
+) -> None:
+    """
+    Apply an incremental change inside the caller's transaction.
+
+    `stage_moves` holds (old_stage, new_stage) pairs, None meaning the plant
+    did not exist / no longer exists. Counters are updated in place, so
+    concurrent transactions don't lose increments. Users without a row yet
+    get a full refresh instead.
+    """
+    stages: Counter[int] = Counter()
+    for old, new in stage_moves:
+        if old == new:
+            continue
+        if old is not None:
+            stages[old] -= 1
+        if new is not None:
+            stages[new] += 1
+
+    values: dict = {}
+    if active_habits:
+        values["active_habits"] = UserSummary.active_habits + active_habits
+    if artifacts:
+        values["artifact_count"] = UserSummary.artifact_count + artifacts
+    if best_streak is not None:
+        values["best_streak"] = func.greatest(UserSummary.best_streak, best_streak)
+    if energy_balance is not None:
+        values["energy_balance"] = energy_balance
+    stage_expr = UserSummary.plant_stages
+    for stage, delta in stages.items():
+        if not delta:
+            continue
+        key = str(stage)
+        current = func.coalesce(cast(UserSummary.plant_stages[key].astext, Integer), 0)
+        stage_expr = func.jsonb_set(stage_expr, cast(array([key]), ARRAY(Text)), func.to_jsonb(current + delta))
+    if stage_expr is not UserSummary.plant_stages:
+        values["plant_stages"] = stage_expr
+    if not values:
+        return
+    values["updated_at"] = func.now()
+
+    result = await db.execute(update(UserSummary).where(UserSummary.user_id == user_id).values(**values))
+    if result.rowcount == 0:
+        # no row yet: build it from the source tables, which (once flushed)
+        # already include the change this delta describes
+        await refresh_user_summary(db, user_id)
+
+
+async def get_user_summary(db: AsyncSession, user_id: int) -> UserSummary:
+    """
+    Single primary-key read; the row is materialized on first access.
+    """
+    summary = await db.get(UserSummary, user_id)
+    if summary is None:
+        await refresh_user_summary(db, user_id)
+        await db.commit()
+        summary = await db.get(UserSummary, user_id)
+    return summary
+
+
+async def reconcile_summaries(db: AsyncSession, batch_size: int = 5000) -> int:
+    """
+    Recompute every user's row in keyset batches (one commit per batch).
+    Returns how many rows were missing or had drifted.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        ids = (
+            await db.execute(select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size))
+        ).scalars().all()
+        if not ids:
+            break
+        result = await db.execute(_REFRESH_RANGE, {"lo": ids[0], "hi": ids[-1]})
+        await db.commit()
+        repaired += result.rowcount
+        last_id = ids[-1]
+    return repaired
+
+
+async def main() -> None:
+    from app.core.database import AsyncSessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    async with AsyncSessionLocal() as db:
+        repaired = await reconcile_summaries(db)
+    logger.info("Reconciled user summaries: %s rows inserted or repaired", repaired)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from sqlalchemy import ColumnElement, ScalarSelect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.plant import Plant
+from app.models.user import User
+
+
+async def bump_user_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Increment the user's data_version inside the caller's transaction and
+    return the new value; changed habit / plant rows are stamped with it.
+
+    The row lock taken here orders concurrent writers of the same user, so
+    a version is never visible before the rows stamped with it.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+    )
+    return result.scalar_one()
+
+
+async def bump_plant_owners(db: AsyncSession, where: ColumnElement[bool]) -> None:
+    """
+    Bulk variant for jobs that rewrite many plants in one UPDATE: bump every
+    owner of a plant matching `where`. Stamp the plants afterwards with
+    `plant_owner_version()`, in the same transaction.
+    """
+    await db.execute(
+        update(User)
+        .where(User.id.in_(select(Plant.user_id).where(where)))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def plant_owner_version() -> ScalarSelect[int]:
+    return select(User.data_version).where(User.id == Plant.user_id).scalar_subquery()
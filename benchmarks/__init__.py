@@ -0,0 +1,3 @@
+"""
+Standalone micro-benchmarks. Run with `python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,62 @@
+"""
+Broadcast throughput against the in-process fake Bot API server.
+
+    python -m benchmarks.bench_broadcast --recipients 2000 --rate 25 --server-rate 30
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+from typing import AsyncIterator, Sequence
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+from app.bot.broadcast import Broadcaster, FileCheckpointStore, Recipient
+from benchmarks.fake_bot_api import FakeBotApi
+
+
+async def _batches(total: int, batch_size: int) -> AsyncIterator[Sequence[Recipient]]:
+    for start in range(1, total + 1, batch_size):
+        yield [(uid, 10_000 + uid) for uid in range(start, min(start + batch_size, total + 1))]
+
+
+async def run(recipients: int, rate: float, server_rate: float, port: int) -> None:
+    fake = FakeBotApi(server_rate)
+    runner = web.AppRunner(fake.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{port}"))
+    bot = Bot(token="42:BENCHMARK", session=session)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = await Broadcaster(bot, global_rate=rate, per_chat_interval=0).run(
+                "bench",
+                "Full moon tonight 🌕",
+                checkpoints=FileCheckpointStore(tmp),
+                batches=_batches(recipients, 500),
+            )
+    finally:
+        await bot.session.close()
+        await runner.cleanup()
+
+    print(f"sent={stats.sent} failed={stats.failed} retried={stats.retried}")
+    print(f"elapsed={stats.elapsed:.2f}s rate={stats.rate:.1f} msg/s (server saw {fake.received}, 429s={fake.rejected})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=25.0)
+    parser.add_argument("--server-rate", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+    asyncio.run(run(args.recipients, args.rate, args.server_rate, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Heatmap and streak recomputation for users with years of check-in history.
+
+Seeds one throwaway user into DATABASE_URL (removed afterwards), then times
+the yearly heatmap query and the single-query streak recompute.
+
+    python -m benchmarks.bench_checkin_history --habits 20 --years 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import delete, insert
+
+from app.core.database import AsyncSessionLocal
+from app.models.habit import Habit, HabitFrequencyType
+from app.models.habit_checkin import HabitCheckIn
+from app.models.user import User
+from app.services.checkin_history_service import compute_streaks, get_user_heatmap
+
+
+async def run(habits: int, years: int, hit_rate: float, repeat: int) -> None:
+    rng = random.Random(0)
+    today = date.today()
+    start_day = today - timedelta(days=365 * years)
+
+    async with AsyncSessionLocal() as db:
+        user = User(telegram_id=-rng.randint(10**9, 10**10), timezone="UTC")
+        db.add(user)
+        await db.flush()
+        habit_rows = [
+            Habit(user_id=user.id, name=f"bench {i}", frequency_type=HabitFrequencyType.DAILY)
+            for i in range(habits)
+        ]
+        db.add_all(habit_rows)
+        await db.flush()
+
+        rows = []
+        for h in habit_rows:
+            day = start_day
+            while day <= today:
+                if rng.random() < hit_rate:
+                    rows.append({"habit_id": h.id, "user_id": user.id, "check_in_date": day})
+                day += timedelta(days=1)
+        for i in range(0, len(rows), 10_000):
+            await db.execute(insert(HabitCheckIn), rows[i : i + 10_000])
+        await db.commit()
+        print(f"seeded {len(rows):,} check-ins ({habits} habits x {years} years)")
+
+        try:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await get_user_heatmap(db, user.id, today.year)
+            print(f"heatmap: {(time.perf_counter() - start) / repeat * 1000:.2f} ms/query")
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await compute_streaks(db, habit_rows[0], today)
+            print(f"streak recompute: {(time.perf_counter() - start) / repeat * 1000:.2f} ms/habit")
+        finally:
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--habits", type=int, default=20)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--hit-rate", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.habits, args.years, args.hit_rate, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
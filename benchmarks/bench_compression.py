@@ -0,0 +1,152 @@
+"""
+CPU cost vs bytes on the wire for response compression, per codec and level.
+
+Payloads mimic /garden/state, /habits/ and an artifact inventory; the
+"wire ms" column is the transfer time of the body on a slow mobile link.
+
+    python -m benchmarks.bench_compression --plants 60 --kbps 400
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+from datetime import date, datetime, timezone
+from typing import Callable
+
+import orjson
+
+from app.core.compression import CompressedCache, _CODECS, compress
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 11), "zstd": (1, 3, 19)}
+
+
+def _garden(n: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    return orjson.dumps(
+        {
+            "version": 1234,
+            "plants": [
+                {
+                    "id": i,
+                    "user_id": 1,
+                    "habit_id": i,
+                    "species": "mushroom_seed" if i % 4 == 0 else "forest_seed",
+                    "is_mushroom": i % 4 == 0,
+                    "growth_stage": i % 5,
+                    "growth_points": i * 7,
+                    "is_wilted": i % 9 == 0,
+                    "last_grown_at": now,
+                    "created_at": now,
+                }
+                for i in range(n)
+            ],
+            "activeHabits": n,
+            "moon": {"phase": "full", "themeId": "full_moon_festival", "energyMultiplier": 1.3},
+        }
+    )
+
+
+def _habits(n: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    return orjson.dumps(
+        [
+            {
+                "id": i,
+                "user_id": 1,
+                "name": f"Habit {i}",
+                "description": "Drink water and look at the moon",
+                "initial_days_offset": 0,
+                "frequency_type": "daily",
+                "frequency_value": None,
+                "kind": "plant",
+                "current_streak": i % 30,
+                "longest_streak": i % 60,
+                "last_check_in_date": date.today(),
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(n)
+        ]
+    )
+
+
+def _inventory(n: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    return orjson.dumps(
+        [
+            {
+                "id": i,
+                "acquired_at": now,
+                "artifact": {
+                    "id": i,
+                    "code": f"moonstone_{i}",
+                    "name": f"Moonstone shard #{i}",
+                    "description": "A sliver of moonlight that hums softly during the full moon.",
+                    "rarity": ("common", "rare", "epic", "legendary")[i % 4],
+                    "phase_bias": ("new", "waxing", "full", "waning")[i % 4],
+                    "icon_url": f"https://cdn.example.org/artifacts/moonstone_{i}.png",
+                },
+            }
+            for i in range(n)
+        ]
+    )
+
+
+def _time(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plants", type=int, default=60)
+    parser.add_argument("--artifacts", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--kbps", type=float, default=400.0, help="link speed for the wire-time column")
+    args = parser.parse_args()
+
+    payloads = [
+        ("/garden/state", _garden(args.plants)),
+        ("/habits/", _habits(args.plants)),
+        ("/artifacts/list", _inventory(args.artifacts)),
+    ]
+    codecs = []
+    for name in ("gzip", "br", "zstd"):
+        try:
+            _CODECS[name](1)
+        except ImportError:
+            print(f"({name} not installed, skipped)")
+            continue
+        codecs.append(name)
+
+    def wire_ms(size: int) -> float:
+        return size * 8 / (args.kbps * 1000) * 1000
+
+    print(f"{'payload':<16}{'codec':<9}{'bytes':>9}{'ratio':>8}{'cpu ms':>10}{'wire ms':>10}{'total ms':>10}")
+    for label, body in payloads:
+        print(f"{label:<16}{'identity':<9}{len(body):>9}{1.0:>8.2f}{0.0:>10.3f}"
+              f"{wire_ms(len(body)):>10.1f}{wire_ms(len(body)):>10.1f}")
+        for name in codecs:
+            for level in LEVELS[name]:
+                data = compress(body, name, level)
+                cpu = _time(lambda: compress(body, name, level), args.repeat) * 1000
+                print(
+                    f"{'':<16}{f'{name}:{level}':<9}{len(data):>9}{len(body) / len(data):>8.2f}"
+                    f"{cpu:>10.3f}{wire_ms(len(data)):>10.1f}{cpu + wire_ms(len(data)):>10.1f}"
+                )
+
+    # what a cached public body costs per request: digest + LRU lookup
+    body = payloads[-1][1]
+    cache = CompressedCache(16)
+    digest = _time(lambda: hashlib.blake2b(body, digest_size=16).digest(), args.repeat) * 1000
+    hit = _time(lambda: cache.get_or_compress(body, codecs[-1]), args.repeat) * 1000
+    print(f"\ncached body ({len(body)} bytes): digest {digest:.4f} ms, cache hit {hit:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
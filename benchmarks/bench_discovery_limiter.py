@@ -0,0 +1,87 @@
+"""
+Discovery limiter under abusive load: a handful of clients hammering
+/artifacts/discover concurrently while regular users discover occasionally.
+
+Reports limiter decisions/s, per-decision latency and how many attempts got
+through for each group (abusers should be capped at their phase quota).
+
+    python -m benchmarks.bench_discovery_limiter --attempts 500000
+    python -m benchmarks.bench_discovery_limiter --backend redis --attempts 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryGCRALimiter, RedisGCRALimiter
+
+
+async def run(attempts: int, abusers: int, users: int, concurrency: int, backend_name: str) -> None:
+    limiter = (
+        RedisGCRALimiter(settings.REDIS_URL, prefix="bench:rl:")
+        if backend_name == "redis"
+        else MemoryGCRALimiter()
+    )
+    quota = max(settings.DISCOVERY_QUOTAS.values())
+    window = settings.DISCOVERY_WINDOW_SECONDS
+    run_id = f"{time.time_ns()}:"
+    rng = random.Random(0)
+
+    allowed = {"abuser": 0, "user": 0}
+    sent = {"abuser": 0, "user": 0}
+    latencies: list[float] = []
+    queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(maxsize=concurrency * 4)
+
+    async def worker() -> None:
+        while (item := await queue.get()) is not None:
+            group, key = item
+            t0 = time.perf_counter()
+            ok, _ = await limiter.hit(run_id + key, quota, window)
+            latencies.append(time.perf_counter() - t0)
+            sent[group] += 1
+            allowed[group] += ok
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for _ in range(attempts):
+        # 95% of the traffic comes from the abusive clients
+        if rng.random() < 0.95:
+            await queue.put(("abuser", f"a{rng.randrange(abusers)}"))
+        else:
+            await queue.put(("user", f"u{rng.randrange(users)}"))
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"backend={backend_name} quota={quota}/{window}s concurrency={concurrency}")
+    print(f"{attempts:,} decisions in {elapsed:.2f}s ({attempts / elapsed:,.0f}/s)")
+    print(
+        f"latency p50={statistics.median(latencies) * 1e6:.1f}us "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us"
+    )
+    for group, n in (("abuser", abusers), ("user", users)):
+        print(
+            f"{group:<7} sent={sent[group]:>9,} allowed={allowed[group]:>7,} "
+            f"(cap {n * quota:,}) rejected={1 - allowed[group] / max(sent[group], 1):6.2%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=500_000)
+    parser.add_argument("--abusers", type=int, default=20)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory")
+    args = parser.parse_args()
+    asyncio.run(run(args.attempts, args.abusers, args.users, args.concurrency, args.backend))
+
+
+if __name__ == "__main__":
+    main()
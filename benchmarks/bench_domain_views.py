@@ -0,0 +1,174 @@
+"""
+ORM instances vs column-only NamedTuple views for the pure game logic.
+
+In-process: bytes per object (tracemalloc) and throughput of the growth,
+check-in and drop-weight rules over N objects of each kind. Transient ORM
+objects are used, which understates the cost of loaded ones (no identity
+map entry or committed-state snapshot). With --sql, loads habits from
+DATABASE_URL both ways and reports peak memory and rows/s for holding the
+whole table vs streaming partitions.
+
+    python -m benchmarks.bench_domain_views --rows 1000000
+    python -m benchmarks.bench_domain_views --rows 0 --sql
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Sequence
+
+from app.models.artifact import ArtifactDefinition, ArtifactRarity
+from app.models.habit import Habit, HabitFrequencyType, HabitKind
+from app.models.plant import Plant
+from app.models.views import ArtifactDefinitionView, HabitView, PlantView, stream_views, view_select
+from app.services.artifact_service import _get_phase_weight_multiplier
+from app.services.habit_service import _calculate_growth_gain, _growth_stage_for, _is_expected_checkin_today
+
+FREQUENCIES = list(HabitFrequencyType)
+RARITIES = list(ArtifactRarity)
+PHASES = ("new", "waxing", "full", "waning")
+
+
+def _habit_fields(i: int, today: date) -> dict[str, Any]:
+    return {
+        "id": i,
+        "user_id": i // 8,
+        "kind": HabitKind.MUSHROOM if i % 5 == 0 else HabitKind.PLANT,
+        "frequency_type": FREQUENCIES[i % len(FREQUENCIES)],
+        "frequency_value": 2 + i % 3,
+        "last_check_in_date": today - timedelta(days=i % 10),
+        "current_streak": i % 30,
+        "longest_streak": i % 60,
+    }
+
+
+def _plant_fields(i: int) -> dict[str, Any]:
+    return {
+        "id": i,
+        "user_id": i // 8,
+        "habit_id": i,
+        "species": "mushroom_seed" if i % 5 == 0 else "forest_seed",
+        "growth_points": i % 500,
+        "growth_stage": 0,
+        "is_wilted": False,
+    }
+
+
+def _artifact_fields(i: int) -> dict[str, Any]:
+    return {"id": i, "rarity": RARITIES[i % len(RARITIES)], "preferred_phase": PHASES[i % 4] if i % 3 else None}
+
+
+def _build(factory: Callable[[int], Any], n: int) -> tuple[list[Any], float]:
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in range(n)]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size / max(n, 1)
+
+
+def _rate(fn: Callable[[Sequence[Any]], Any], objects: Sequence[Any]) -> float:
+    start = time.perf_counter()
+    fn(objects)
+    return len(objects) / (time.perf_counter() - start)
+
+
+def _habit_rules(habits: Sequence[Any]) -> int:
+    today = date.today()
+    return sum(_calculate_growth_gain(h) for h in habits if _is_expected_checkin_today(h, today))
+
+
+def _plant_rules(plants: Sequence[Any]) -> int:
+    return sum(_growth_stage_for(p) for p in plants)
+
+
+def _artifact_rules(artifacts: Sequence[Any]) -> float:
+    return sum(_get_phase_weight_multiplier(phase, a) for a in artifacts for phase in PHASES)
+
+
+def _in_process(n: int) -> None:
+    today = date.today()
+    cases = [
+        ("habit", lambda i: Habit(**_habit_fields(i, today)), lambda i: HabitView(**_habit_fields(i, today)), _habit_rules),
+        ("plant", lambda i: Plant(**_plant_fields(i)), lambda i: PlantView(**_plant_fields(i)), _plant_rules),
+        (
+            "artifact",
+            lambda i: ArtifactDefinition(**_artifact_fields(i)),
+            lambda i: ArtifactDefinitionView(**_artifact_fields(i)),
+            _artifact_rules,
+        ),
+    ]
+    print(f"{'kind':<10}{'orm B/obj':>11}{'view B/obj':>12}{'orm M/s':>10}{'view M/s':>10}")
+    for name, orm_factory, view_factory, rules in cases:
+        orm_objects, orm_bytes = _build(orm_factory, n)
+        orm_rate = _rate(rules, orm_objects)
+        del orm_objects
+        view_objects, view_bytes = _build(view_factory, n)
+        view_rate = _rate(rules, view_objects)
+        del view_objects
+        print(f"{name:<10}{orm_bytes:>11.0f}{view_bytes:>12.0f}{orm_rate / 1e6:>10.2f}{view_rate / 1e6:>10.2f}")
+
+
+async def _sql(batch_size: int) -> None:
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+
+    async def orm_all(db) -> int:
+        return len((await db.execute(select(Habit))).scalars().all())
+
+    async def views_all(db) -> int:
+        return len([HabitView._make(r) for r in (await db.execute(view_select(HabitView))).all()])
+
+    async def orm_stream(db) -> int:
+        count = 0
+        result = await db.stream(select(Habit).execution_options(yield_per=batch_size))
+        async for partition in result.scalars().partitions():
+            count += len(partition)
+            _habit_rules(partition)
+        return count
+
+    async def views_stream(db) -> int:
+        count = 0
+        async for partition in stream_views(db, HabitView, batch_size=batch_size):
+            count += len(partition)
+            _habit_rules(partition)
+        return count
+
+    print(f"\n{'load habits':<22}{'rows':>10}{'peak MiB':>10}{'rows/s':>12}")
+    for label, fn in [
+        ("ORM, whole table", orm_all),
+        ("views, whole table", views_all),
+        ("ORM, streamed", orm_stream),
+        ("views, streamed", views_stream),
+    ]:
+        async with AsyncSessionLocal() as db:
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = await fn(db)
+            elapsed = time.perf_counter() - start
+            _size, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"{label:<22}{rows:>10}{peak / 2**20:>10.1f}{rows / elapsed:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sql", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.rows:
+        _in_process(args.rows)
+    if args.sql:
+        asyncio.run(_sql(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
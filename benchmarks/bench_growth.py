@@ -0,0 +1,73 @@
+"""
+Growth-stage lookup and bulk recomputation cost.
+
+In-process: legacy threshold loop vs compiled curves (direct index and
+bisect) over millions of growth_points values. With --sql, also times the
+single-statement recompute against DATABASE_URL (seed plants first).
+
+    python -m benchmarks.bench_growth --plants 5000000
+    python -m benchmarks.bench_growth --plants 0 --sql
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable
+
+from app.core.growth_rules import GrowthCurve
+
+
+def _legacy_stage(points: int) -> int:
+    thresholds = [0, 20, 50, 100, 200]
+    stage = 0
+    for i, t in enumerate(thresholds):
+        if points >= t:
+            stage = i
+    return stage
+
+
+def _time(name: str, fn: Callable[[int], int], values: list[int]) -> None:
+    start = time.perf_counter()
+    for v in values:
+        fn(v)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34}{elapsed:>8.2f}s {len(values) / elapsed / 1e6:>8.2f} M lookups/s")
+
+
+async def _sql_recompute() -> None:
+    from app.core.database import AsyncSessionLocal
+    from app.services.growth_service import recompute_growth_stages
+
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        changed = await recompute_growth_stages(db)
+        print(f"SQL recompute: {changed} rows changed in {time.perf_counter() - start:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plants", type=int, default=5_000_000)
+    parser.add_argument("--stages", type=int, default=48, help="stages in the long designer curve")
+    parser.add_argument("--sql", action="store_true")
+    args = parser.parse_args()
+
+    if args.plants:
+        rng = random.Random(0)
+        values = [rng.randint(0, 10_000) for _ in range(args.plants)]
+        short = GrowthCurve.compile([0, 20, 50, 100, 200])
+        long_direct = GrowthCurve.compile([i * i for i in range(args.stages)])
+        long_bisect = GrowthCurve.compile([i * i * 10 for i in range(args.stages)])
+
+        _time("legacy loop (5 stages)", _legacy_stage, values)
+        _time("compiled direct (5 stages)", short.stage_for, values)
+        _time(f"compiled direct ({args.stages} stages)", long_direct.stage_for, values)
+        _time(f"compiled bisect ({args.stages} stages)", long_bisect.stage_for, values)
+
+    if args.sql:
+        asyncio.run(_sql_recompute())
+
+
+if __name__ == "__main__":
+    main()
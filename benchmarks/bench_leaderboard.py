@@ -0,0 +1,61 @@
+"""
+Leaderboard operations at scale: incremental updates, rank and top-N.
+
+    python -m benchmarks.bench_leaderboard --users 1000000
+    python -m benchmarks.bench_leaderboard --users 1000000 --backend redis
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.config import settings
+from app.services.leaderboard_service import MemoryLeaderboard, RedisLeaderboard
+
+
+async def _chunks(users: int, rng: random.Random, size: int = 10_000):
+    for start in range(0, users, size):
+        yield [(uid, rng.randint(0, 365)) for uid in range(start, min(start + size, users))]
+
+
+async def run(users: int, updates: int, queries: int, backend_name: str) -> None:
+    rng = random.Random(0)
+    backend = RedisLeaderboard(settings.REDIS_URL, prefix="bench:lb:") if backend_name == "redis" else MemoryLeaderboard()
+
+    start = time.perf_counter()
+    await backend.replace("longest_streak", _chunks(users, rng))
+    print(f"bulk load {users:,} users: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        await backend.set_max("longest_streak", rng.randrange(users), rng.randint(0, 400))
+    elapsed = time.perf_counter() - start
+    print(f"set_max x{updates:,}: {elapsed:.2f}s ({updates / elapsed:,.0f} ops/s)")
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        await backend.rank("longest_streak", rng.randrange(users))
+    elapsed = time.perf_counter() - start
+    print(f"rank x{queries:,}: {elapsed:.2f}s ({queries / elapsed:,.0f} ops/s)")
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        await backend.top("longest_streak", 10)
+    elapsed = time.perf_counter() - start
+    print(f"top-10 x{queries:,}: {elapsed:.2f}s ({queries / elapsed:,.0f} ops/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.updates, args.queries, args.backend))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Write cost of the redundant ix_<table>_id indexes.
+
+Seeds two copies of a habit-shaped table in a scratch schema, one with the
+primary key only and one with the extra B-tree on `id`, then replays the
+check-in / discovery write path on both: single-row committed INSERTs and
+UPDATEs. Reports throughput, WAL bytes written and index size for each.
+
+    python -m benchmarks.bench_pk_indexes --rows 1000000 --ops 20000
+    python -m benchmarks.bench_pk_indexes --live   # sizes/scans of ix_*_id in the app schema
+
+Runs against SYNC_DATABASE_URL; the scratch schema is dropped afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+SCHEMA = "bench_pk_indexes"
+
+TABLE_DDL = """
+CREATE TABLE {schema}.{name} (
+    id serial PRIMARY KEY,
+    user_id integer NOT NULL,
+    name varchar(128) NOT NULL,
+    current_streak integer NOT NULL DEFAULT 0,
+    longest_streak integer NOT NULL DEFAULT 0,
+    growth_points integer NOT NULL DEFAULT 0,
+    last_check_in_date date,
+    updated_at timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+PK_TABLES = ("artifactdefinition", "user", "habit", "lunarenergyaccount", "userartifact", "plant")
+
+
+def _wal_lsn(conn: Connection) -> int:
+    return conn.execute(text("SELECT pg_current_wal_lsn() - '0/0'::pg_lsn")).scalar()
+
+
+def _setup(conn: Connection, rows: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for name in ("pk_only", "redundant"):
+        conn.execute(text(TABLE_DDL.format(schema=SCHEMA, name=name)))
+        conn.execute(text(f"CREATE INDEX ix_{name}_user_id ON {SCHEMA}.{name} (user_id)"))
+        conn.execute(
+            text(
+                f"INSERT INTO {SCHEMA}.{name} (user_id, name, growth_points) "
+                "SELECT g / 5, 'habit ' || g, g % 300 FROM generate_series(1, :rows) g"
+            ),
+            {"rows": rows},
+        )
+    conn.execute(text(f"CREATE INDEX ix_redundant_id ON {SCHEMA}.redundant (id)"))
+    conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.pk_only"))
+    conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.redundant"))
+
+
+def _run_variant(conn: Connection, name: str, rows: int, ops: int) -> None:
+    table = f"{SCHEMA}.{name}"
+    rng = random.Random(0)
+    insert = text(f"INSERT INTO {table} (user_id, name) VALUES (:user_id, :name)")
+    update = text(
+        f"UPDATE {table} SET current_streak = current_streak + 1, growth_points = growth_points + 10, "
+        "last_check_in_date = current_date, updated_at = now() WHERE id = :id"
+    )
+
+    results = []
+    for label, stmt, make_params in (
+        ("insert", insert, lambda: {"user_id": rng.randrange(rows // 5), "name": "new habit"}),
+        ("update", update, lambda: {"id": rng.randint(1, rows)}),
+    ):
+        wal_before = _wal_lsn(conn)
+        start = time.perf_counter()
+        for _ in range(ops):
+            conn.execute(stmt, make_params())
+            conn.commit()
+        elapsed = time.perf_counter() - start
+        wal = _wal_lsn(conn) - wal_before
+        results.append(f"{label} {ops / elapsed:>8,.0f}/s wal {wal / ops:>6,.0f} B/op")
+
+    index_bytes = conn.execute(text("SELECT pg_indexes_size(:t)"), {"t": table}).scalar()
+    print(f"{name:<10} " + "  ".join(results) + f"  indexes {index_bytes / 2**20:,.1f} MiB")
+
+
+def _live_report(conn: Connection) -> None:
+    rows = conn.execute(
+        text(
+            "SELECT relname, indexrelname, idx_scan, pg_relation_size(indexrelid) "
+            "FROM pg_stat_user_indexes WHERE indexrelname = ANY(:names) ORDER BY relname"
+        ),
+        {"names": [f"ix_{t}_id" for t in PK_TABLES]},
+    ).all()
+    if not rows:
+        print("No redundant ix_*_id indexes left.")
+    for table, index, scans, size in rows:
+        print(f"{table:<20} {index:<28} scans={scans:>10,} size={size / 2**20:>8,.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="seeded rows per table")
+    parser.add_argument("--ops", type=int, default=20_000, help="single-row writes per phase")
+    parser.add_argument("--live", action="store_true", help="only report ix_*_id in the app schema")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.SYNC_DATABASE_URL)
+    with engine.connect() as conn:
+        if args.live:
+            _live_report(conn)
+            return
+        _setup(conn.execution_options(isolation_level="AUTOCOMMIT"), args.rows)
+        try:
+            for name in ("pk_only", "redundant"):
+                _run_variant(conn, name, args.rows, args.ops)
+        finally:
+            if not args.keep:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Per-endpoint serialization cost: legacy FastAPI path vs precompiled adapters.
+
+    python -m benchmarks.bench_serialization --rows 200 --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.habit import HabitFrequencyType, HabitKind
+from app.schemas.garden import GardenStateAdapter
+from app.schemas.habit import HabitOut, HabitOutList
+from app.schemas.plant import PlantOut, PlantOutList
+
+
+def _fake_habits(n: int) -> list[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=1,
+            name=f"Habit {i}",
+            description="Drink water and look at the moon",
+            initial_days_offset=0,
+            frequency_type=HabitFrequencyType.DAILY,
+            frequency_value=None,
+            kind=HabitKind.PLANT,
+            current_streak=i % 30,
+            longest_streak=i % 60,
+            last_check_in_date=date.today(),
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def _fake_plants(n: int) -> list[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=1,
+            habit_id=i,
+            species="forest_seed",
+            is_mushroom=False,
+            growth_stage=i % 5,
+            growth_points=i * 7,
+            is_wilted=False,
+            last_grown_at=now,
+            created_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def _legacy_habits(rows: list[SimpleNamespace]) -> bytes:
+    # model_validate per row -> response_model re-validation -> jsonable_encoder -> json.dumps
+    models = [HabitOut.model_validate(r) for r in rows]
+    revalidated = HabitOutList.validate_python([m.model_dump() for m in models])
+    return json.dumps(jsonable_encoder(revalidated)).encode()
+
+
+def _fast_habits(rows: list[SimpleNamespace]) -> bytes:
+    return HabitOutList.dump_json(HabitOutList.validate_python(rows, from_attributes=True))
+
+
+def _legacy_garden(rows: list[SimpleNamespace]) -> bytes:
+    state = {
+        "plants": [PlantOut.model_validate(p).model_dump() for p in rows],
+        "activeHabits": len(rows),
+        "moon": {"phase": "full", "themeId": "full_moon_festival", "energyMultiplier": 1.3},
+    }
+    return json.dumps(jsonable_encoder(state)).encode()
+
+
+def _fast_garden(rows: list[SimpleNamespace]) -> bytes:
+    state = {
+        "plants": PlantOutList.validate_python(rows, from_attributes=True),
+        "activeHabits": len(rows),
+        "moon": {"phase": "full", "themeId": "full_moon_festival", "energyMultiplier": 1.3},
+    }
+    return GardenStateAdapter.dump_json(state)
+
+
+def _time(fn: Callable[[list[SimpleNamespace]], bytes], rows: list[SimpleNamespace], repeat: int) -> float:
+    fn(rows)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    cases = [
+        ("/habits/", _fake_habits(args.rows), _legacy_habits, _fast_habits),
+        ("/garden/state", _fake_plants(args.rows), _legacy_garden, _fast_garden),
+    ]
+    print(f"{'endpoint':<16}{'legacy ms':>12}{'fast ms':>12}{'speedup':>10}")
+    for name, rows, legacy, fast in cases:
+        t_legacy = _time(legacy, rows, args.repeat) * 1000
+        t_fast = _time(fast, rows, args.repeat) * 1000
+        print(f"{name:<16}{t_legacy:>12.3f}{t_fast:>12.3f}{t_legacy / t_fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
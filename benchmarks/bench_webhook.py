@@ -0,0 +1,130 @@
+"""
+Drive the webhook route with locally generated fake Telegram updates.
+
+The dispatcher only gets a no-op handler, so this measures webhook
+overhead (secret check, de-duplication, scheduling) rather than Bot API
+latency. A share of updates is resent to exercise de-duplication.
+
+    python -m benchmarks.bench_webhook --updates 20000 --duplicates 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Iterator
+
+import orjson
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from fastapi import FastAPI
+
+from app.bot.webhook import mount_webhook
+from app.core.config import settings
+
+
+def fake_updates(count: int, duplicate_ratio: float, seed: int = 0) -> Iterator[dict[str, Any]]:
+    rng = random.Random(seed)
+    sent: list[dict[str, Any]] = []
+    update_id = 100_000
+    for _ in range(count):
+        if sent and rng.random() < duplicate_ratio:
+            yield rng.choice(sent)
+            continue
+        update_id += 1
+        chat_id = rng.randint(1, 50_000)
+        update = {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Moon"},
+                "text": rng.choice(["/start", "/help", "hello"]),
+            },
+        }
+        sent.append(update)
+        yield update
+
+
+async def _post(app: FastAPI, path: str, body: bytes, secret: str | None) -> int:
+    headers = [(b"content-type", b"application/json")]
+    if secret:
+        headers.append((b"x-telegram-bot-api-secret-token", secret.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    status_code = 0
+    delivered = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal delivered
+        if delivered:
+            return {"type": "http.disconnect"}
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def run(count: int, duplicate_ratio: float, clients: int) -> None:
+    handled = 0
+
+    async def noop_handler(message: Message) -> None:
+        nonlocal handled
+        handled += 1
+
+    dp = Dispatcher()
+    dp.message.register(noop_handler)
+    app = FastAPI()
+    secret = settings.TELEGRAM_WEBHOOK_SECRET or "benchmark-secret"
+    processor = mount_webhook(app, bot=Bot(token="42:BENCHMARK"), dp=dp, register=False, secret=secret)
+
+    bodies = [orjson.dumps(u) for u in fake_updates(count, duplicate_ratio)]
+    queue: asyncio.Queue[bytes] = asyncio.Queue()
+    for body in bodies:
+        queue.put_nowait(body)
+
+    async def client() -> None:
+        while not queue.empty():
+            await _post(app, settings.TELEGRAM_WEBHOOK_PATH, queue.get_nowait(), secret)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    await processor.drain()
+    elapsed = time.perf_counter() - start
+
+    print(f"updates sent:      {count}")
+    print(f"handled:           {handled}")
+    print(f"duplicates dropped:{processor.duplicates:>8}")
+    print(f"elapsed:           {elapsed:.3f}s ({count / elapsed:,.0f} updates/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--clients", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.updates, args.duplicates, args.clients))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput scaling of `python -m app.server` from 1 to N workers.
+
+Starts the launcher for each worker count and hammers DB-free hot
+endpoints with an aiohttp client for a fixed duration.
+
+    python -m benchmarks.bench_workers --max-workers 8 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+PATHS = ("/health", "/api/lunar/today")
+
+
+async def _wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(base + "/health") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def _load(base: str, duration: float, concurrency: int) -> int:
+    done = 0
+    stop_at = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def client(i: int) -> None:
+            nonlocal done
+            path = PATHS[i % len(PATHS)]
+            while time.monotonic() < stop_at:
+                async with session.get(base + path) as resp:
+                    await resp.read()
+                done += 1
+
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return done
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    base = f"http://127.0.0.1:{args.port}"
+    baseline = None
+    print(f"{'workers':>8}{'req/s':>12}{'scaling':>10}")
+    for workers in _worker_counts(args.max_workers):
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(args.port)],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(_wait_ready(base))
+            requests = asyncio.run(_load(base, args.duration, args.concurrency))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+        rps = requests / args.duration
+        baseline = baseline or rps
+        print(f"{workers:>8}{rps:>12,.0f}{rps / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
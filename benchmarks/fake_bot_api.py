@@ -0,0 +1,78 @@
+"""
+Local fake Telegram Bot API server for bot load tests.
+
+Answers every method with a minimal successful result and, like the real
+API, returns 429 with `retry_after` once the global rate is exceeded.
+
+    python -m benchmarks.fake_bot_api --port 8081 --rate 30
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081 python -m app.bot.broadcast test "hi"
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections import deque
+
+from aiohttp import web
+
+
+class FakeBotApi:
+    def __init__(self, rate_limit: float, retry_after: int = 1) -> None:
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.received = 0
+        self.rejected = 0
+        self._window: deque[float] = deque()
+
+    def _over_limit(self) -> bool:
+        now = time.monotonic()
+        while self._window and now - self._window[0] > 1.0:
+            self._window.popleft()
+        if len(self._window) >= self.rate_limit:
+            return True
+        self._window.append(now)
+        return False
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.received += 1
+        if self._over_limit():
+            self.rejected += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+
+        data = await request.post()
+        if request.match_info["method"].lower() == "sendmessage":
+            chat_id = int(data.get("chat_id", 0))
+            result = {
+                "message_id": self.received,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": data.get("text", ""),
+            }
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--rate", type=float, default=30.0)
+    args = parser.parse_args()
+    web.run_app(FakeBotApi(args.rate).make_app(), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Enforce an import-time budget for the entry points using `python -X importtime`.
+
+Exits non-zero when an entry point exceeds its budget, so it can gate CI.
+
+    python -m benchmarks.startup_budget
+    python -m benchmarks.startup_budget --budget main=300 --top 15
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# module -> budget in milliseconds (cumulative import time)
+DEFAULT_BUDGETS: dict[str, float] = {
+    "main": 400.0,
+    "app.core.database": 350.0,
+    "app.bot.bot_main": 500.0,
+}
+
+
+def measure(module: str) -> tuple[float, list[tuple[float, str]]]:
+    """
+    Returns (cumulative ms for `module`, [(self ms, name)] of every import).
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    total_ms = 0.0
+    imports: list[tuple[float, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        imports.append((int(self_us) / 1000, name.strip()))
+        if name.strip() == module:
+            total_ms = int(cumulative_us) / 1000
+    return total_ms, imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", action="append", default=[], help="module=ms, may repeat")
+    parser.add_argument("--top", type=int, default=10, help="show N slowest imports per entry point")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        module, ms = item.split("=", 1)
+        budgets[module] = float(ms)
+
+    failed = False
+    for module, budget in budgets.items():
+        total, imports = measure(module)
+        status = "OK " if total <= budget else "OVER"
+        failed |= total > budget
+        print(f"[{status}] {module}: {total:.1f} ms (budget {budget:.0f} ms)")
+        for self_ms, name in sorted(imports, reverse=True)[: args.top]:
+            print(f"        {self_ms:8.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
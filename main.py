@@ -1,19 +1,91 @@
 from __future__ import annotations
 
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-from app.api import api_router
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+async def warm_caches() -> None:
+    """
+    Per-worker warm-up: map the shared moon phase table and load the artifact catalog.
+    """
+    if settings.MOON_PHASE_TABLE_PATH:
+        from app.core.moon_phases import load_phase_table
+
+        load_phase_table(settings.MOON_PHASE_TABLE_PATH)
+
+    from app.core.database import AsyncSessionLocal
+    from app.services.artifact_service import load_artifact_catalog
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await load_artifact_catalog(db)
+    except Exception:
+        # the catalog is loaded lazily on first discovery instead
+        logger.warning("Artifact catalog warm-up failed", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Build the DB engine when the server starts rather than at import time,
+    then run handlers registered with `add_event_handler`.
+    """
+    from app.core.database import dispose_engine, get_engine
+    from app.core.jobs import shutdown_job_queue
+
+    get_engine()
+    await warm_caches()
+    await app.router.startup()
+    try:
+        yield
+    finally:
+        await app.router.shutdown()
+        # drain post-commit jobs while the engine is still usable
+        await shutdown_job_queue()
+        await dispose_engine()
+
 
 def create_app() -> FastAPI:
+    from app.api import api_router
+
     app = FastAPI(
         title=settings.APP_NAME,
         debug=settings.APP_DEBUG,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
-    # CORS
+    if settings.METRICS_ENABLED:
+        from app.core.metrics import MetricsMiddleware, render_metrics
+
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/metrics", tags=["system"], include_in_schema=False)
+        async def metrics() -> PlainTextResponse:
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+    if settings.IDEMPOTENCY_ENABLED:
+        from app.core.idempotency import IdempotencyMiddleware
+
+        app.add_middleware(IdempotencyMiddleware, paths=settings.IDEMPOTENCY_PATHS)
+
+    if settings.COMPRESSION_ENABLED:
+        from app.core.compression import CompressionMiddleware
+
+        # outside idempotency and metrics, so replays and metrics work on plain bodies
+        app.add_middleware(CompressionMiddleware)
+
+    # CORS: added last so it is outermost and also covers responses the
+    # middlewares above write themselves (idempotency 400/409/422)
     cors_origins = [str(o) for o in settings.BACKEND_CORS_ORIGINS]
     if settings.TELEGRAM_WEBAPP_URL:
         cors_origins.append(str(settings.TELEGRAM_WEBAPP_URL))
@@ -25,10 +97,36 @@ def create_app() -> FastAPI:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "X-Data-Version", "Retry-After"],
         )
 
     app.include_router(api_router, prefix="/api")
 
+    rebuild_leaderboards_on_startup = settings.LEADERBOARD_REBUILD_ON_STARTUP
+    if rebuild_leaderboards_on_startup is None:
+        # record_streak only fires on new records, so an empty skiplist would stay wrong
+        rebuild_leaderboards_on_startup = settings.LEADERBOARD_BACKEND == "memory"
+    if rebuild_leaderboards_on_startup:
+
+        async def warm_leaderboards() -> None:
+            from app.core.database import AsyncSessionLocal
+            from app.services.leaderboard_service import rebuild_leaderboards
+
+            async with AsyncSessionLocal() as db:
+                await rebuild_leaderboards(db)
+
+        app.add_event_handler("startup", warm_leaderboards)
+
+    if settings.PARTITION_MAINTENANCE_ON_STARTUP:
+        from app.core.partitioning import maintain_partitions_async
+
+        app.add_event_handler("startup", maintain_partitions_async)
+
+    if settings.TELEGRAM_BOT_MODE == "webhook":
+        from app.bot.webhook import mount_webhook
+
+        mount_webhook(app)
+
     @app.get("/health", tags=["system"])
     async def health():
         return {"status": "ok"}
@@ -36,4 +134,14 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str) -> Any:
+    # `uvicorn main:app` resolves this lazily; plain `import main` stays cheap.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(name)